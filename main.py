@@ -1,6 +1,10 @@
 import argparse
+import os
 import logging
 from src.ai_tester import AIWebTester
+from src.crawler import CrawlEngine
+from src.utils.config import load_config
+from src.utils.reporting import TestReport
 
 def setup_argument_parser():
     parser = argparse.ArgumentParser(
@@ -17,11 +21,29 @@ def setup_argument_parser():
         action='store_true',
         help='Run browser in headless mode'
     )
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='config/config.json',
+        help='Path to the config file'
+    )
     parser.add_argument(
         '--max-depth',
         type=int,
-        default=3,
-        help='Maximum depth for page exploration'
+        default=None,
+        help='Maximum depth for page exploration (overrides config)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of pages crawled concurrently'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=32,
+        help='Number of elements classified per model batch'
     )
     return parser
 
@@ -37,17 +59,44 @@ def main():
     parser = setup_argument_parser()
     args = parser.parse_args()
 
-    # Initialize tester
-    tester = AIWebTester(headless=args.headless)
-    tester.max_depth = args.max_depth
+    config = load_config(args.config)
+    if args.max_depth is not None:
+        config["max_depth"] = args.max_depth
+
+    # The tester only provides the classifier, the crawl engine owns the browser
+    tester = AIWebTester(
+        headless=args.headless,
+        batch_size=args.batch_size,
+        launch_browser=False,
+        config=config
+    )
+    engine = CrawlEngine(
+        config,
+        workers=args.workers,
+        headless=args.headless or config.get("headless", False),
+        classify=tester.analyze_elements
+    )
 
     try:
-        logger.info(f"Starting test exploration of {args.url}")
-        tester.explore_page(args.url)
-        logger.info("Testing completed successfully")
+        logger.info(f"Starting test exploration of {args.url} with {args.workers} workers")
+        visited = engine.run(args.url)
+        logger.info(f"Testing completed successfully, {len(visited)} pages visited")
     except Exception as e:
         logger.error(f"Error during testing: {e}")
     finally:
+        stats = tester.scorer.stats()
+        logger.info(f"Element scoring: {stats}")
+        report = TestReport.for_run(config.get("report_dir", "reports"))
+        report.add_metrics("Element scoring", stats)
+        report.add_metrics("Crawl", {
+            "pages_visited": len(engine.visited_urls),
+            "pages_failed": len(engine.failed_urls)
+        })
+        if engine.blocker.profile:
+            report.add_metrics("Network", engine.blocker.stats())
+        report.add_metrics("Memory", engine.memory.summary())
+        engine.memory.export_json(os.path.join(report.output_dir, "memory.json"))
+        report.generate_report()
         tester.close()
 
 if __name__ == "__main__":
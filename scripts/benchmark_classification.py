@@ -0,0 +1,109 @@
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from transformers import pipeline
+from src.element_scoring import TransformerScorer
+
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+SAMPLE_TEXTS = [
+    "Home", "Sign in", "Log out", "Search", "Submit", "Next page",
+    "Privacy Policy", "Terms of Service", "Contact us", "Add to cart",
+    "New Lead USA", "Save & New", "Cancel", "Learn more", "Careers",
+    "", "Download the app", "Accept all cookies", "Show more results",
+]
+SAMPLE_TAGS = ["button", "a", "input", "select"]
+
+def make_elements(count: int, seed: int = 0):
+    """Build a synthetic page worth of (text, tag) pairs"""
+    rng = random.Random(seed)
+    return [(rng.choice(SAMPLE_TEXTS), rng.choice(SAMPLE_TAGS)) for _ in range(count)]
+
+def load_pipeline(model: str, random_init: bool):
+    """
+    Text classification pipeline for model. random_init builds the same
+    architecture with untrained weights and a word-level vocabulary instead,
+    for machines without Hugging Face Hub access; timings only, not decisions.
+    """
+    if not random_init:
+        return pipeline("text-classification", model=model)
+
+    import tempfile
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, DistilBertTokenizerFast
+    torch.manual_seed(0)
+    config = AutoConfig.from_pretrained(model) if os.path.isdir(model) else AutoConfig.for_model(
+        "distilbert", num_labels=2, id2label={0: "NEGATIVE", 1: "POSITIVE"},
+        label2id={"NEGATIVE": 0, "POSITIVE": 1}
+    )
+    words = {
+        word.lower()
+        for text in SAMPLE_TEXTS + ["This element says"] + SAMPLE_TAGS
+        for word in text.replace("&", " & ").split()
+    }
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as vocab:
+        vocab.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "'", "&"] + sorted(words)))
+    tokenizer = DistilBertTokenizerFast(vocab.name, model_max_length=512)
+    os.remove(vocab.name)
+    return pipeline(
+        "text-classification", model=AutoModelForSequenceClassification.from_config(config),
+        tokenizer=tokenizer
+    )
+
+def bench_per_element(nlp, contexts) -> float:
+    """Time one pipeline call per element, as explore_page used to do"""
+    start = time.perf_counter()
+    for context in contexts:
+        nlp(context)
+    return time.perf_counter() - start
+
+def bench_batched(nlp, contexts, batch_size: int) -> float:
+    """Time a single batched pipeline call, as analyze_elements does"""
+    start = time.perf_counter()
+    nlp(contexts, batch_size=batch_size, truncation=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare per-element and batched element classification'
+    )
+    parser.add_argument('--elements', type=int, default=400, help='Elements per simulated page')
+    parser.add_argument('--batch-sizes', type=str, default='8,32,64,128', help='Comma separated batch sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per configuration (best is reported)')
+    parser.add_argument('--model', default=MODEL_NAME, help='Model name or local directory')
+    parser.add_argument('--random-init', action='store_true',
+                        help='Untrained weights of the same architecture, when the model cannot be downloaded')
+    args = parser.parse_args()
+
+    nlp = load_pipeline(args.model, args.random_init)
+    contexts = [
+        TransformerScorer.element_context(text, tag)
+        for text, tag in make_elements(args.elements)
+    ]
+
+    # Warm up so model loading and first-call overhead is not measured
+    nlp(contexts[:8], batch_size=8)
+
+    print(f"Elements per page: {args.elements} (threads: {os.cpu_count()})")
+    print(f"{'mode':<16}{'total (s)':>12}{'per element (ms)':>20}{'speedup':>10}")
+
+    baseline = min(bench_per_element(nlp, contexts) for _ in range(args.repeat))
+    print(f"{'per-element':<16}{baseline:>12.3f}{baseline / len(contexts) * 1000:>20.3f}{1.0:>10.1f}")
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(',') if b):
+        total = min(bench_batched(nlp, contexts, batch_size) for _ in range(args.repeat))
+        print(
+            f"{'batch=' + str(batch_size):<16}{total:>12.3f}"
+            f"{total / len(contexts) * 1000:>20.3f}{baseline / total:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
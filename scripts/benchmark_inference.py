@@ -0,0 +1,87 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Runs in a fresh interpreter per backend so RSS is not shared between them
+BACKEND_SNIPPET = """
+import json, random, resource, time
+from src.element_scoring import create_scorer
+
+config = {{
+    "scorer_backend": "transformer",
+    "inference_backend": {backend!r},
+    "inference_threads": {threads},
+    "onnx_model_dir": {model_dir!r},
+    "classification_cache": ""
+}}
+scorer = create_scorer(config, batch_size={batch_size})
+rng = random.Random(0)
+texts = ["Home", "Sign in", "Search", "Submit", "Privacy Policy", "Save & New",
+         "Cancel", "Learn more", "New Lead USA", "Accept all cookies", ""]
+tags = ["button", "a", "input", "select"]
+elements = [{{"text": rng.choice(texts), "tag": rng.choice(tags)}} for _ in range({elements})]
+
+start = time.perf_counter()
+scorer.score_batch(elements[:8])
+load = time.perf_counter() - start
+
+timings = []
+for _ in range({repeat}):
+    start = time.perf_counter()
+    decisions = scorer.score_batch(elements)
+    timings.append(time.perf_counter() - start)
+
+print(json.dumps({{
+    "load": load,
+    "best": min(timings),
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "decisions": decisions
+}}))
+"""
+
+def run_backend(backend: str, args) -> dict:
+    code = BACKEND_SNIPPET.format(
+        backend=backend, threads=args.threads, model_dir=args.onnx_model_dir,
+        batch_size=args.batch_size, elements=args.elements, repeat=args.repeat
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare latency and memory of the torch and ONNX element classifiers'
+    )
+    parser.add_argument('--elements', type=int, default=400, help='Elements classified per run')
+    parser.add_argument('--batch-size', type=int, default=32, help='Elements per forward pass')
+    parser.add_argument('--threads', type=int, default=2, help='CPU threads for inference')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per backend (best is reported)')
+    parser.add_argument('--onnx-model-dir', type=str, default='models/element-classifier-onnx',
+                        help='Output of scripts/export_onnx_model.py')
+    args = parser.parse_args()
+
+    results = {backend: run_backend(backend, args) for backend in ("torch", "onnx")}
+
+    print(f"Elements: {args.elements}, batch size: {args.batch_size}, threads: {args.threads}")
+    print(f"{'backend':<10}{'load (s)':>10}{'run (s)':>10}{'per element (ms)':>18}{'peak RSS (MB)':>16}")
+    for backend, result in results.items():
+        print(
+            f"{backend:<10}{result['load']:>10.2f}{result['best']:>10.3f}"
+            f"{result['best'] / args.elements * 1000:>18.3f}{result['rss_mb']:>16.0f}"
+        )
+
+    torch_decisions = results["torch"]["decisions"]
+    onnx_decisions = results["onnx"]["decisions"]
+    agree = sum(a == b for a, b in zip(torch_decisions, onnx_decisions))
+    print(f"Decision agreement: {agree}/{len(torch_decisions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Modules a scripted (replay) run must not import at startup
+HEAVY_MODULES = ["transformers", "torch"]
+
+STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from src.test_runner import TestRunner
+imported = time.perf_counter()
+runner = None
+if {with_browser}:
+    from src.utils.config import load_config
+    config = load_config("config/config.json")
+    config["headless"] = True
+    runner = TestRunner(config=config)
+ready = time.perf_counter()
+if runner:
+    runner.close()
+print(json.dumps({{
+    "import": imported - start,
+    "ready": ready - start,
+    "heavy": [m for m in {heavy} if m in sys.modules]
+}}))
+"""
+
+def measure(with_browser: bool) -> dict:
+    """Run one cold start in a fresh interpreter"""
+    code = STARTUP_SNIPPET.format(with_browser=with_browser, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure cold-start time of a scripted TestRunner'
+    )
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts')
+    parser.add_argument('--with-browser', action='store_true', help='Also construct TestRunner (launches Chromium)')
+    parser.add_argument('--budget', type=float, default=1.0, help='Fail if the best start exceeds this many seconds')
+    args = parser.parse_args()
+
+    results = [measure(args.with_browser) for _ in range(args.runs)]
+    best_import = min(r["import"] for r in results)
+    best_ready = min(r["ready"] for r in results)
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    print(f"Cold starts: {args.runs}")
+    print(f"import src.test_runner: {best_import * 1000:.1f} ms (best)")
+    if args.with_browser:
+        print(f"TestRunner ready:       {best_ready * 1000:.1f} ms (best)")
+    print(f"Heavy modules imported: {', '.join(heavy) or 'none'}")
+
+    if heavy:
+        sys.exit(f"Startup imported {', '.join(heavy)}")
+    if best_ready > args.budget:
+        sys.exit(f"Startup took {best_ready:.2f}s, budget is {args.budget:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.browser_server import DEFAULT_STATE_PATH, BrowserServer
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep a warm Chromium running for test runs to connect to")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="State file of the server")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--max-uses", type=int, default=200, help="Restart after this many connections")
+    parser.add_argument("--max-memory-mb", type=float, default=2048, help="Restart above this resident memory")
+    parser.add_argument("--executable", help="Browser binary, Playwright's Chromium by default")
+    args = parser.parse_args()
+
+    server = BrowserServer(args.state, not args.headed, args.max_uses, args.max_memory_mb, args.executable)
+    if args.command == "start":
+        state = server.start()
+        print(f"Browser server running on {state['endpoint']} (pid {state['pid']})")
+        print(f"Connect test runs with: export E2E_BROWSER_ENDPOINT={state['endpoint']}")
+    elif args.command == "stop":
+        print("Browser server stopped" if server.stop() else "No browser server running")
+    else:
+        state = server.status()
+        if not state:
+            print("No browser server running")
+            sys.exit(1)
+        rss = f"{state['rss_mb']:.0f} MB" if state["rss_mb"] is not None else "unknown"
+        print(f"Browser server on {state['endpoint']} (pid {state['pid']}), "
+              f"up {state['uptime']:.0f}s, {state['uses']} uses, {len(state['leases'])} connected, memory {rss}")
+        if state["recycle"]:
+            print(f"Restarts when the last client disconnects: {state['recycle']}")
+
+if __name__ == "__main__":
+    main()
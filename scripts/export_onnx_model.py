@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from src.element_scoring import DEFAULT_MODEL, DEFAULT_ONNX_DIR
+
+def export_model(model_name: str, output_dir: str, opset: int = 14) -> str:
+    """Export the classifier to ONNX and write an int8 dynamically quantized copy"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    # Tokenizer (tokenizer.json) and config (id2label) are read by OnnxScorer
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+
+    sample = tokenizer(["This button element says 'Submit'"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"}
+        },
+        opset_version=opset
+    )
+
+    quantized_path = os.path.join(output_dir, "model_quantized.onnx")
+    quantize_dynamic(fp32_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export the element classifier to an int8 quantized ONNX model'
+    )
+    parser.add_argument('--model', type=str, default=DEFAULT_MODEL, help='Hugging Face model name')
+    parser.add_argument('--output-dir', type=str, default=DEFAULT_ONNX_DIR, help='Directory for the exported model')
+    args = parser.parse_args()
+
+    path = export_model(args.model, args.output_dir)
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"Quantized model written to {path} ({size_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.reporting import TestReport
+
+def merge_reports(shard_dirs, output_dir, name="results", suite=None) -> TestReport:
+    """
+    Combine report directories, e.g. from parallel workers or CI shards, into one.
+    Logs are copied line by line; counts come from each shard's saved run info
+    when its log is unchanged, so large shards are not parsed. Screenshots are
+    copied along, their links in the log stay relative to the report directory.
+    """
+    output = os.path.realpath(output_dir)
+    for path in shard_dirs:
+        if not os.path.isdir(path):
+            raise ValueError(f"Not a report directory: {path}")
+        if os.path.realpath(path) == output:
+            raise ValueError(f"The output directory must not be one of the shards: {path}")
+
+    shards = [TestReport(str(path), name=name, append=True) for path in shard_dirs]
+    merged = TestReport(str(output_dir), name=name, suite=suite or shards[0].suite)
+    try:
+        merged.merge(shards)
+    finally:
+        for shard in shards:
+            shard.close()
+    for path in shard_dirs:
+        _copy_screenshots(os.path.join(path, "screenshots"), os.path.join(output_dir, "screenshots"))
+    # The merged run spans its shards, not the time of merging
+    merged.generate_report(end_time=merged.end_time)
+    return merged
+
+def _copy_screenshots(source, target):
+    """Hard link (or copy) screenshots and thumbnails, names are content hashes so existing files are kept"""
+    for directory, _, filenames in os.walk(source):
+        destination = os.path.join(target, os.path.relpath(directory, source))
+        os.makedirs(destination, exist_ok=True)
+        for filename in filenames:
+            target_path = os.path.join(destination, filename)
+            if os.path.exists(target_path):
+                continue
+            try:
+                os.link(os.path.join(directory, filename), target_path)
+            except OSError:
+                shutil.copy2(os.path.join(directory, filename), target_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge report directories into one report")
+    parser.add_argument("shards", nargs="+", help="Report directories to merge, in order")
+    parser.add_argument("--output", required=True, help="Directory for the merged report")
+    parser.add_argument("--name", default="results", help="Log name inside each directory")
+    parser.add_argument("--suite", help="Suite name of the merged report")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        merged = merge_reports(args.shards, args.output, args.name, args.suite)
+    except ValueError as e:
+        parser.error(str(e))
+    cases = sum(merged.case_counts.values())
+    print(f"Merged {len(args.shards)} reports into {args.output} in {time.perf_counter() - started:.2f}s")
+    print(f"Test cases: {cases} ({merged.case_counts.get('success', 0)} passed), "
+          f"steps: {sum(merged.counts.values())}")
+    print(f"Wall time: {merged.wall_seconds:.2f}s, summed case time: {merged.case_seconds:.2f}s")
+
+if __name__ == "__main__":
+    main()
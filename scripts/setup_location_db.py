@@ -1,249 +1,359 @@
-import sqlite3
+import argparse
+import csv
+import itertools
 import os
+import sqlite3
+import sys
+import time
 
-def create_location_database():
-    """Create SQLite database and populate it with sample location data."""
-    # Define the database path
-    db_path = os.path.join('config', 'data', 'locations.db')
-    
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    # Connect to database (creates it if it doesn't exist)
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Create the locations table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS locations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                city TEXT NOT NULL,
-                state TEXT NOT NULL,
-                zip_code TEXT NOT NULL,
-                UNIQUE(city, state, zip_code)
-            )
-        """)
-        
-        # Sample data - major US cities with valid ZIP codes
-        sample_data = [
-            # New York
-            ('New York', 'NY', '10001'),
-            ('New York', 'NY', '10002'),
-            ('Brooklyn', 'NY', '11201'),
-            # Los Angeles
-            ('Los Angeles', 'CA', '90001'),
-            ('Los Angeles', 'CA', '90012'),
-            ('Beverly Hills', 'CA', '90210'),
-            # Chicago
-            ('Chicago', 'IL', '60601'),
-            ('Chicago', 'IL', '60602'),
-            ('Evanston', 'IL', '60201'),
-            # Houston
-            ('Houston', 'TX', '77001'),
-            ('Houston', 'TX', '77002'),
-            ('Sugar Land', 'TX', '77478'),
-            # Phoenix
-            ('Phoenix', 'AZ', '85001'),
-            ('Phoenix', 'AZ', '85002'),
-            ('Scottsdale', 'AZ', '85251'),
-            # Alabama
-            ('Birmingham', 'AL', '35201'),
-            ('Montgomery', 'AL', '36104'),
-            ('Mobile', 'AL', '36601'),
-            # Alaska
-            ('Anchorage', 'AK', '99501'),
-            ('Fairbanks', 'AK', '99701'),
-            ('Juneau', 'AK', '99801'),
-            # Arkansas
-            ('Little Rock', 'AR', '72201'),
-            ('Fayetteville', 'AR', '72701'),
-            ('Fort Smith', 'AR', '72901'),
-            # California (add more since it's already started)
-            ('San Francisco', 'CA', '94101'),
-            ('San Diego', 'CA', '92101'),
-            ('Sacramento', 'CA', '95814'),
-            # Colorado
-            ('Denver', 'CO', '80201'),
-            ('Colorado Springs', 'CO', '80901'),
-            ('Boulder', 'CO', '80301'),
-            # Connecticut
-            ('Hartford', 'CT', '06101'),
-            ('New Haven', 'CT', '06510'),
-            ('Stamford', 'CT', '06901'),
-            # Delaware
-            ('Wilmington', 'DE', '19801'),
-            ('Dover', 'DE', '19901'),
-            ('Newark', 'DE', '19711'),
-            # Florida
-            ('Miami', 'FL', '33101'),
-            ('Orlando', 'FL', '32801'),
-            ('Tampa', 'FL', '33601'),
-            # Georgia
-            ('Atlanta', 'GA', '30301'),
-            ('Savannah', 'GA', '31401'),
-            ('Augusta', 'GA', '30901'),
-            # Hawaii
-            ('Honolulu', 'HI', '96801'),
-            ('Hilo', 'HI', '96720'),
-            ('Kailua', 'HI', '96734'),
-            # Idaho
-            ('Boise', 'ID', '83701'),
-            ('Idaho Falls', 'ID', '83401'),
-            ('Pocatello', 'ID', '83201'),
-            # Indiana
-            ('Indianapolis', 'IN', '46201'),
-            ('Fort Wayne', 'IN', '46801'),
-            ('Bloomington', 'IN', '47401'),
-            # Iowa
-            ('Des Moines', 'IA', '50301'),
-            ('Cedar Rapids', 'IA', '52401'),
-            ('Davenport', 'IA', '52801'),
-            # Kansas
-            ('Wichita', 'KS', '67201'),
-            ('Kansas City', 'KS', '66101'),
-            ('Topeka', 'KS', '66601'),
-            # Kentucky
-            ('Louisville', 'KY', '40201'),
-            ('Lexington', 'KY', '40501'),
-            ('Bowling Green', 'KY', '42101'),
-            # Louisiana
-            ('New Orleans', 'LA', '70112'),
-            ('Baton Rouge', 'LA', '70801'),
-            ('Shreveport', 'LA', '71101'),
-            # Maine
-            ('Portland', 'ME', '04101'),
-            ('Augusta', 'ME', '04330'),
-            ('Bangor', 'ME', '04401'),
-            # Maryland
-            ('Baltimore', 'MD', '21201'),
-            ('Annapolis', 'MD', '21401'),
-            ('Frederick', 'MD', '21701'),
-            # Massachusetts
-            ('Boston', 'MA', '02201'),
-            ('Cambridge', 'MA', '02138'),
-            ('Worcester', 'MA', '01601'),
-            # Michigan
-            ('Detroit', 'MI', '48201'),
-            ('Grand Rapids', 'MI', '49501'),
-            ('Ann Arbor', 'MI', '48104'),
-            # Minnesota
-            ('Minneapolis', 'MN', '55401'),
-            ('Saint Paul', 'MN', '55101'),
-            ('Rochester', 'MN', '55901'),
-            # Mississippi
-            ('Jackson', 'MS', '39201'),
-            ('Biloxi', 'MS', '39530'),
-            ('Hattiesburg', 'MS', '39401'),
-            # Missouri
-            ('Kansas City', 'MO', '64101'),
-            ('Saint Louis', 'MO', '63101'),
-            ('Springfield', 'MO', '65801'),
-            # Montana
-            ('Billings', 'MT', '59101'),
-            ('Missoula', 'MT', '59801'),
-            ('Helena', 'MT', '59601'),
-            # Nebraska
-            ('Omaha', 'NE', '68101'),
-            ('Lincoln', 'NE', '68501'),
-            ('Grand Island', 'NE', '68801'),
-            # Nevada
-            ('Las Vegas', 'NV', '89101'),
-            ('Reno', 'NV', '89501'),
-            ('Carson City', 'NV', '89701'),
-            # New Hampshire
-            ('Manchester', 'NH', '03101'),
-            ('Concord', 'NH', '03301'),
-            ('Nashua', 'NH', '03060'),
-            # New Jersey
-            ('Newark', 'NJ', '07101'),
-            ('Jersey City', 'NJ', '07301'),
-            ('Atlantic City', 'NJ', '08401'),
-            # New Mexico
-            ('Albuquerque', 'NM', '87101'),
-            ('Santa Fe', 'NM', '87501'),
-            ('Las Cruces', 'NM', '88001'),
-            # North Carolina
-            ('Charlotte', 'NC', '28201'),
-            ('Raleigh', 'NC', '27601'),
-            ('Durham', 'NC', '27701'),
-            # North Dakota
-            ('Fargo', 'ND', '58102'),
-            ('Bismarck', 'ND', '58501'),
-            ('Grand Forks', 'ND', '58201'),
-            # Oklahoma
-            ('Oklahoma City', 'OK', '73101'),
-            ('Tulsa', 'OK', '74101'),
-            ('Norman', 'OK', '73069'),
-            # Oregon
-            ('Portland', 'OR', '97201'),
-            ('Salem', 'OR', '97301'),
-            ('Eugene', 'OR', '97401'),
-            # Rhode Island
-            ('Providence', 'RI', '02901'),
-            ('Warwick', 'RI', '02886'),
-            ('Newport', 'RI', '02840'),
-            # South Carolina
-            ('Columbia', 'SC', '29201'),
-            ('Charleston', 'SC', '29401'),
-            ('Myrtle Beach', 'SC', '29577'),
-            # South Dakota
-            ('Sioux Falls', 'SD', '57101'),
-            ('Rapid City', 'SD', '57701'),
-            ('Aberdeen', 'SD', '57401'),
-            # Tennessee
-            ('Nashville', 'TN', '37201'),
-            ('Memphis', 'TN', '38101'),
-            ('Knoxville', 'TN', '37901'),
-            # Utah
-            ('Salt Lake City', 'UT', '84101'),
-            ('Provo', 'UT', '84601'),
-            ('Ogden', 'UT', '84401'),
-            # Vermont
-            ('Burlington', 'VT', '05401'),
-            ('Montpelier', 'VT', '05601'),
-            ('Rutland', 'VT', '05701'),
-            # Virginia
-            ('Richmond', 'VA', '23218'),
-            ('Virginia Beach', 'VA', '23451'),
-            ('Norfolk', 'VA', '23501'),
-            # Washington
-            ('Seattle', 'WA', '98101'),
-            ('Spokane', 'WA', '99201'),
-            ('Tacoma', 'WA', '98401'),
-            # West Virginia
-            ('Charleston', 'WV', '25301'),
-            ('Huntington', 'WV', '25701'),
-            ('Morgantown', 'WV', '26501'),
-            # Wisconsin
-            ('Milwaukee', 'WI', '53201'),
-            ('Madison', 'WI', '53701'),
-            ('Green Bay', 'WI', '54301'),
-            # Wyoming
-            ('Cheyenne', 'WY', '82001'),
-            ('Casper', 'WY', '82601'),
-            ('Laramie', 'WY', '82070'),
-            ('Laramie', 'WY', '82071')
-        ]
-        
-        # Insert sample data
-        cursor.executemany(
+DEFAULT_DB_PATH = os.path.join('config', 'data', 'locations.db')
+
+# Header names accepted for each column of an imported CSV
+CSV_COLUMNS = {
+    "city": ("city", "primary_city", "city_name"),
+    "state": ("state", "state_id", "state_code", "state_abbr"),
+    "zip_code": ("zip", "zip_code", "zipcode", "postal_code"),
+}
+
+# Sample data - major US cities with valid ZIP codes
+SAMPLE_DATA = [
+    # New York
+    ('New York', 'NY', '10001'),
+    ('New York', 'NY', '10002'),
+    ('Brooklyn', 'NY', '11201'),
+    # Los Angeles
+    ('Los Angeles', 'CA', '90001'),
+    ('Los Angeles', 'CA', '90012'),
+    ('Beverly Hills', 'CA', '90210'),
+    # Chicago
+    ('Chicago', 'IL', '60601'),
+    ('Chicago', 'IL', '60602'),
+    ('Evanston', 'IL', '60201'),
+    # Houston
+    ('Houston', 'TX', '77001'),
+    ('Houston', 'TX', '77002'),
+    ('Sugar Land', 'TX', '77478'),
+    # Phoenix
+    ('Phoenix', 'AZ', '85001'),
+    ('Phoenix', 'AZ', '85002'),
+    ('Scottsdale', 'AZ', '85251'),
+    # Alabama
+    ('Birmingham', 'AL', '35201'),
+    ('Montgomery', 'AL', '36104'),
+    ('Mobile', 'AL', '36601'),
+    # Alaska
+    ('Anchorage', 'AK', '99501'),
+    ('Fairbanks', 'AK', '99701'),
+    ('Juneau', 'AK', '99801'),
+    # Arkansas
+    ('Little Rock', 'AR', '72201'),
+    ('Fayetteville', 'AR', '72701'),
+    ('Fort Smith', 'AR', '72901'),
+    # California (add more since it's already started)
+    ('San Francisco', 'CA', '94101'),
+    ('San Diego', 'CA', '92101'),
+    ('Sacramento', 'CA', '95814'),
+    # Colorado
+    ('Denver', 'CO', '80201'),
+    ('Colorado Springs', 'CO', '80901'),
+    ('Boulder', 'CO', '80301'),
+    # Connecticut
+    ('Hartford', 'CT', '06101'),
+    ('New Haven', 'CT', '06510'),
+    ('Stamford', 'CT', '06901'),
+    # Delaware
+    ('Wilmington', 'DE', '19801'),
+    ('Dover', 'DE', '19901'),
+    ('Newark', 'DE', '19711'),
+    # Florida
+    ('Miami', 'FL', '33101'),
+    ('Orlando', 'FL', '32801'),
+    ('Tampa', 'FL', '33601'),
+    # Georgia
+    ('Atlanta', 'GA', '30301'),
+    ('Savannah', 'GA', '31401'),
+    ('Augusta', 'GA', '30901'),
+    # Hawaii
+    ('Honolulu', 'HI', '96801'),
+    ('Hilo', 'HI', '96720'),
+    ('Kailua', 'HI', '96734'),
+    # Idaho
+    ('Boise', 'ID', '83701'),
+    ('Idaho Falls', 'ID', '83401'),
+    ('Pocatello', 'ID', '83201'),
+    # Indiana
+    ('Indianapolis', 'IN', '46201'),
+    ('Fort Wayne', 'IN', '46801'),
+    ('Bloomington', 'IN', '47401'),
+    # Iowa
+    ('Des Moines', 'IA', '50301'),
+    ('Cedar Rapids', 'IA', '52401'),
+    ('Davenport', 'IA', '52801'),
+    # Kansas
+    ('Wichita', 'KS', '67201'),
+    ('Kansas City', 'KS', '66101'),
+    ('Topeka', 'KS', '66601'),
+    # Kentucky
+    ('Louisville', 'KY', '40201'),
+    ('Lexington', 'KY', '40501'),
+    ('Bowling Green', 'KY', '42101'),
+    # Louisiana
+    ('New Orleans', 'LA', '70112'),
+    ('Baton Rouge', 'LA', '70801'),
+    ('Shreveport', 'LA', '71101'),
+    # Maine
+    ('Portland', 'ME', '04101'),
+    ('Augusta', 'ME', '04330'),
+    ('Bangor', 'ME', '04401'),
+    # Maryland
+    ('Baltimore', 'MD', '21201'),
+    ('Annapolis', 'MD', '21401'),
+    ('Frederick', 'MD', '21701'),
+    # Massachusetts
+    ('Boston', 'MA', '02201'),
+    ('Cambridge', 'MA', '02138'),
+    ('Worcester', 'MA', '01601'),
+    # Michigan
+    ('Detroit', 'MI', '48201'),
+    ('Grand Rapids', 'MI', '49501'),
+    ('Ann Arbor', 'MI', '48104'),
+    # Minnesota
+    ('Minneapolis', 'MN', '55401'),
+    ('Saint Paul', 'MN', '55101'),
+    ('Rochester', 'MN', '55901'),
+    # Mississippi
+    ('Jackson', 'MS', '39201'),
+    ('Biloxi', 'MS', '39530'),
+    ('Hattiesburg', 'MS', '39401'),
+    # Missouri
+    ('Kansas City', 'MO', '64101'),
+    ('Saint Louis', 'MO', '63101'),
+    ('Springfield', 'MO', '65801'),
+    # Montana
+    ('Billings', 'MT', '59101'),
+    ('Missoula', 'MT', '59801'),
+    ('Helena', 'MT', '59601'),
+    # Nebraska
+    ('Omaha', 'NE', '68101'),
+    ('Lincoln', 'NE', '68501'),
+    ('Grand Island', 'NE', '68801'),
+    # Nevada
+    ('Las Vegas', 'NV', '89101'),
+    ('Reno', 'NV', '89501'),
+    ('Carson City', 'NV', '89701'),
+    # New Hampshire
+    ('Manchester', 'NH', '03101'),
+    ('Concord', 'NH', '03301'),
+    ('Nashua', 'NH', '03060'),
+    # New Jersey
+    ('Newark', 'NJ', '07101'),
+    ('Jersey City', 'NJ', '07301'),
+    ('Atlantic City', 'NJ', '08401'),
+    # New Mexico
+    ('Albuquerque', 'NM', '87101'),
+    ('Santa Fe', 'NM', '87501'),
+    ('Las Cruces', 'NM', '88001'),
+    # North Carolina
+    ('Charlotte', 'NC', '28201'),
+    ('Raleigh', 'NC', '27601'),
+    ('Durham', 'NC', '27701'),
+    # North Dakota
+    ('Fargo', 'ND', '58102'),
+    ('Bismarck', 'ND', '58501'),
+    ('Grand Forks', 'ND', '58201'),
+    # Oklahoma
+    ('Oklahoma City', 'OK', '73101'),
+    ('Tulsa', 'OK', '74101'),
+    ('Norman', 'OK', '73069'),
+    # Oregon
+    ('Portland', 'OR', '97201'),
+    ('Salem', 'OR', '97301'),
+    ('Eugene', 'OR', '97401'),
+    # Rhode Island
+    ('Providence', 'RI', '02901'),
+    ('Warwick', 'RI', '02886'),
+    ('Newport', 'RI', '02840'),
+    # South Carolina
+    ('Columbia', 'SC', '29201'),
+    ('Charleston', 'SC', '29401'),
+    ('Myrtle Beach', 'SC', '29577'),
+    # South Dakota
+    ('Sioux Falls', 'SD', '57101'),
+    ('Rapid City', 'SD', '57701'),
+    ('Aberdeen', 'SD', '57401'),
+    # Tennessee
+    ('Nashville', 'TN', '37201'),
+    ('Memphis', 'TN', '38101'),
+    ('Knoxville', 'TN', '37901'),
+    # Utah
+    ('Salt Lake City', 'UT', '84101'),
+    ('Provo', 'UT', '84601'),
+    ('Ogden', 'UT', '84401'),
+    # Vermont
+    ('Burlington', 'VT', '05401'),
+    ('Montpelier', 'VT', '05601'),
+    ('Rutland', 'VT', '05701'),
+    # Virginia
+    ('Richmond', 'VA', '23218'),
+    ('Virginia Beach', 'VA', '23451'),
+    ('Norfolk', 'VA', '23501'),
+    # Washington
+    ('Seattle', 'WA', '98101'),
+    ('Spokane', 'WA', '99201'),
+    ('Tacoma', 'WA', '98401'),
+    # West Virginia
+    ('Charleston', 'WV', '25301'),
+    ('Huntington', 'WV', '25701'),
+    ('Morgantown', 'WV', '26501'),
+    # Wisconsin
+    ('Milwaukee', 'WI', '53201'),
+    ('Madison', 'WI', '53701'),
+    ('Green Bay', 'WI', '54301'),
+    # Wyoming
+    ('Cheyenne', 'WY', '82001'),
+    ('Casper', 'WY', '82601'),
+    ('Laramie', 'WY', '82070'),
+    ('Laramie', 'WY', '82071')
+]
+
+def create_schema(conn):
+    """Create the locations tables, adding the sampling columns to older databases"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS locations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            city TEXT NOT NULL,
+            state TEXT NOT NULL,
+            zip_code TEXT NOT NULL,
+            row_num INTEGER,
+            state_row_num INTEGER,
+            UNIQUE(city, state, zip_code)
+        )
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(locations)")}
+    for column in ("row_num", "state_row_num"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE locations ADD COLUMN {column} INTEGER")
+
+    # One row per state: its locations have state_row_num 0..count-1
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS state_buckets (
+            state TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+def drop_indexes(conn):
+    # The old lookup index duplicated the UNIQUE constraint and did not help sampling
+    for name in ("idx_location_lookup", "idx_locations_row_num", "idx_locations_state_row"):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+def create_indexes(conn):
+    conn.execute("CREATE UNIQUE INDEX idx_locations_row_num ON locations(row_num)")
+    conn.execute("CREATE UNIQUE INDEX idx_locations_state_row ON locations(state, state_row_num)")
+
+def read_csv_rows(path, columns=None):
+    """Stream (city, state, zip_code) tuples from a CSV file with a header row"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        positions = []
+        for column, candidates in CSV_COLUMNS.items():
+            wanted = [columns[column].lower()] if columns and columns.get(column) else candidates
+            match = next((header.index(name) for name in wanted if name in header), None)
+            if match is None:
+                sys.exit(f"{path}: no {column} column, expected one of {', '.join(wanted)}")
+            positions.append(match)
+
+        city_at, state_at, zip_at = positions
+        for row in reader:
+            if len(row) <= max(positions):
+                continue
+            city, state, zip_code = row[city_at].strip(), row[state_at].strip().upper(), row[zip_at].strip()
+            if city and state and zip_code:
+                # Spreadsheets drop leading zeros from New England ZIP codes
+                yield city, state, zip_code.zfill(5) if zip_code.isdigit() else zip_code
+
+def insert_rows(conn, rows, chunk_size=10000):
+    """executemany in chunks so the whole dataset never sits in memory"""
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        conn.executemany(
             "INSERT OR IGNORE INTO locations (city, state, zip_code) VALUES (?, ?, ?)",
-            sample_data
+            chunk
         )
-        
-        # Create an index for faster random selection
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_location_lookup 
-            ON locations(city, state, zip_code)
-        """)
-        
-        # Commit the changes
-        conn.commit()
-        
-        # Verify the data
-        cursor.execute("SELECT COUNT(*) FROM locations")
-        count = cursor.fetchone()[0]
-        print(f"Database created successfully with {count} locations")
+
+def number_rows(conn):
+    """Precompute dense row numbers overall and per state, and the state bucket sizes"""
+    state_counts = {}
+    numbers = []
+    for row_num, (location_id, state) in enumerate(
+        conn.execute("SELECT id, state FROM locations ORDER BY id").fetchall()
+    ):
+        state_row_num = state_counts.get(state, 0)
+        state_counts[state] = state_row_num + 1
+        numbers.append((row_num, state_row_num, location_id))
+
+    conn.executemany("UPDATE locations SET row_num = ?, state_row_num = ? WHERE id = ?", numbers)
+    conn.execute("DELETE FROM state_buckets")
+    conn.executemany("INSERT INTO state_buckets (state, count) VALUES (?, ?)", state_counts.items())
+    return len(numbers)
+
+def create_location_database(db_path=DEFAULT_DB_PATH, rows=None, replace=False, chunk_size=10000):
+    """
+    Load locations into the SQLite database in one transaction.
+    rows is an iterable of (city, state, zip_code), the built-in sample data by default.
+    """
+    # Ensure the directory exists
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("BEGIN")
+        try:
+            create_schema(conn)
+            # Build indexes once after the load instead of updating them per row
+            drop_indexes(conn)
+            if replace:
+                conn.execute("DELETE FROM locations")
+            insert_rows(conn, SAMPLE_DATA if rows is None else rows, chunk_size)
+            count = number_rows(conn)
+            create_indexes(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    print(f"Database created successfully with {count} locations "
+          f"({time.perf_counter() - started:.2f}s)")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or bulk-import the location database")
+    parser.add_argument("--csv", help="CSV with city, state and ZIP columns to import "
+                                      "(default: built-in sample of major cities)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Database path")
+    parser.add_argument("--replace", action="store_true", help="Delete existing locations first")
+    parser.add_argument("--city-column", help="Header of the city column")
+    parser.add_argument("--state-column", help="Header of the state column")
+    parser.add_argument("--zip-column", help="Header of the ZIP code column")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per executemany batch")
+    args = parser.parse_args()
+
+    rows = None
+    if args.csv:
+        rows = read_csv_rows(args.csv, {
+            "city": args.city_column, "state": args.state_column, "zip_code": args.zip_column
+        })
+    create_location_database(args.db, rows, args.replace, args.chunk_size)
 
 if __name__ == "__main__":
-    create_location_database()
\ No newline at end of file
+    main()
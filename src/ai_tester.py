@@ -1,8 +1,13 @@
-from transformers import pipeline
 from playwright.sync_api import sync_playwright
+import os
 import time
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+from .element_scoring import as_element, create_scorer
+from .utils.element_helpers import locate_snapshot_item, snapshot_elements
+from .utils.memory import MemoryMonitor, RecyclePolicy
+from .utils.network import HarRouter, ResourceBlocker
+from .utils.waits import wait_for_dom_settle
 
 class AIWebTester:
     """
@@ -10,25 +15,86 @@ class AIWebTester:
     with Transformers for intelligent web interaction.
     """
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, batch_size: int = 32,
+                 launch_browser: bool = True, page=None, config: Optional[Dict] = None,
+                 blocker: Optional[ResourceBlocker] = None, har: Optional[HarRouter] = None):
         self._setup_logging()
         self.logger = logging.getLogger(__name__)
         self.logger.info("Initializing AIWebTester")
         
-        # Initialize AI model - using text classification for interaction decisions
-        self.nlp = pipeline("text-classification", 
-                          model="distilbert-base-uncased-finetuned-sst-2-english")
+        self.config = config or {}
         
-        # Setup Playwright
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=headless)
-        self.page = self.browser.new_page()
+        # Element scorer - backend and model come from config ("scorer_backend", "ai_model").
+        # Any model is loaded on first use so scripted runs never pay for transformers/torch.
+        self.scorer = create_scorer(self.config, batch_size)
+        
+        # Request blocking ("block_profile" in config), pass a worker blocker to share its counters
+        self.blocker = blocker or ResourceBlocker.from_config(self.config)
+        # Record/replay of test case traffic ("network_mode"), applied to contexts made for a recording
+        self.har = har or HarRouter.from_config(self.config)
+        self.recording: Optional[str] = None
+        
+        # Setup Playwright, skipped when only the classifier is needed (e.g. CrawlEngine)
+        # or when the caller hands in a page it owns (e.g. TestRunner.run_suite workers)
+        self.playwright = self.browser = None
+        self.page = page
+        # CDP endpoint of a long-lived browser this tester connected to instead of launching one
+        self.browser_endpoint = None
+        # Browser server this tester holds a lease on, released by close()
+        self.browser_server = None
+        if launch_browser and page is None:
+            # Resolved first, starting the browser server must not run inside this driver
+            self.browser_endpoint = self._browser_endpoint(headless)
+            self.playwright = sync_playwright().start()
+            try:
+                if self.browser_endpoint:
+                    self.logger.info(f"Connecting to browser at {self.browser_endpoint}")
+                    self.browser = self.playwright.chromium.connect_over_cdp(self.browser_endpoint)
+                else:
+                    self.browser = self.playwright.chromium.launch(headless=headless)
+                self.use_context(self.browser.new_context())
+            except Exception:
+                self.playwright.stop()
+                self.playwright = self.browser = None
+                self._release_browser_server()
+                raise
+        elif page is not None:
+            self.blocker.attach(page.context)
         
         # Initialize state
         self.visited_urls = set()
         self.current_depth = 0
         self.max_depth = 3
         
+        # Long explorations replace the page and context now and then to keep memory bounded
+        self.memory = MemoryMonitor()
+        self.recycle_policy = RecyclePolicy.from_config(self.config)
+        self.navigations = 0
+        self._page_navigations = 0
+        
+    def _browser_endpoint(self, headless: bool) -> Optional[str]:
+        """
+        Endpoint from "browser_endpoint" / E2E_BROWSER_ENDPOINT. "auto", or
+        "browser_server": true in the config, uses the local browser server
+        (scripts/browser_server.py), starting it if it is not running.
+        """
+        endpoint = self.config.get("browser_endpoint") or os.environ.get("E2E_BROWSER_ENDPOINT")
+        if endpoint == "auto" or (not endpoint and self.config.get("browser_server", False)):
+            from .utils.browser_server import BrowserServer
+            server = BrowserServer.from_config(self.config)
+            server.headless = headless
+            endpoint = server.acquire()
+            self.browser_server = server
+        return endpoint
+    
+    def _release_browser_server(self):
+        if self.browser_server:
+            try:
+                self.browser_server.release()
+            except Exception as e:
+                self.logger.error(f"Error releasing browser server: {e}")
+            self.browser_server = None
+    
     def _setup_logging(self):
         """Configure logging for the tester"""
         logging.basicConfig(
@@ -45,26 +111,25 @@ class AIWebTester:
         Use AI to determine if an element should be interacted with.
         Returns True if the element is likely interactive.
         """
+        return self.analyze_elements([(element_text, element_type)])[0]
+    
+    def analyze_elements(self, elements: List[Union[Dict, Tuple[str, str]]]) -> List[bool]:
+        """
+        Decide many elements at once.
+        Elements are snapshot items or (element_text, element_type) pairs.
+        The scorer settles what it can from tag, role, href and state and sends
+        the rest to the model in padded batches. Decisions are returned in input order.
+        """
+        if not elements:
+            return []
+        
         try:
-            # Create a context string that describes the element
-            context = f"This {element_type} element says '{element_text}'"
-            
-            # Classify the element - returns positive for interactive elements
-            result = self.nlp(context)[0]
-            
-            # Map sentiment to interactivity (positive sentiment = interactive)
-            score = result['score'] if result['label'] == 'POSITIVE' else 1 - result['score']
-            
-            # Consider elements like buttons and inputs as more likely to be interactive
-            base_score = 0.5
-            if element_type in ['button', 'input', 'select', 'a']:
-                base_score = 0.7
-                
-            return score > base_score
+            decisions = self.scorer.score_batch([as_element(e) for e in elements])
+            return [bool(decision) for decision in decisions]
             
         except Exception as e:
-            self.logger.error(f"Error analyzing element: {e}")
-            return False
+            self.logger.error(f"Error analyzing elements: {e}")
+            return [False] * len(elements)
     
     def explore_page(self, url: str):
         """
@@ -76,53 +141,121 @@ class AIWebTester:
         try:
             self.logger.info(f"Exploring: {url}")
             self.visited_urls.add(url)
+            self._before_navigation()
             self.page.goto(url)
             self.page.wait_for_load_state('networkidle')
             
-            elements = self.page.query_selector_all('button, a, input, select')
+            # One round trip returns tag, text, href and visibility for every candidate
+            candidates = [item for item in snapshot_elements(self.page) if item['visible']]
+            
+            decisions = self.analyze_elements(candidates)
             
-            for element in elements:
-                self._process_element(element, url)
+            for item, interact in zip(candidates, decisions):
+                if interact:
+                    self._process_element(item, url)
                 
         except Exception as e:
             self.logger.error(f"Error exploring page {url}: {e}")
     
-    def _process_element(self, element, base_url: str):
+    def _process_element(self, item: Dict, base_url: str):
         """
-        Process and interact with a single element on the page.
+        Interact with a single snapshot item that was classified as interactive.
         """
         try:
-            element_text = element.inner_text()
-            element_type = element.evaluate('el => el.tagName.toLowerCase()')
-            
-            if self.analyze_element(element_text, element_type):
-                self.logger.info(f"Interacting with {element_type}: {element_text}")
-                self._interact_with_element(element, element_type, base_url)
+            self.logger.info(f"Interacting with {item['tag']}: {item['text']}")
+            self._interact_with_element(item, base_url)
                 
         except Exception as e:
             self.logger.error(f"Error processing element: {e}")
     
-    def _interact_with_element(self, element, element_type: str, base_url: str):
+    def _interact_with_element(self, item: Dict, base_url: str):
         """
         Perform the appropriate interaction based on element type.
         """
+        element_type = item['tag']
         try:
-            if element_type == 'button':
-                element.click()
-            elif element_type == 'input':
-                element.fill('test input')
+            if element_type in ('button', 'input'):
+                locator = locate_snapshot_item(self.page, item)
+                if locator.count() == 0:
+                    # The page changed since the snapshot was taken
+                    self.logger.debug(f"Skipping stale {element_type}: {item['text']}")
+                    return
+                if element_type == 'button':
+                    locator.click()
+                else:
+                    locator.fill('test input')
             elif element_type == 'a':
-                href = element.get_attribute('href')
+                href = item['href']
                 if href and href.startswith(base_url):
                     self.current_depth += 1
                     self.explore_page(href)
                     self.current_depth -= 1
             
-            time.sleep(1)  # Wait for any reactions
+            self._wait_for_reaction()
             
         except Exception as e:
             self.logger.error(f"Error interacting with {element_type}: {e}")
     
+    def _wait_for_reaction(self):
+        """Give the page time to react to an interaction"""
+        if self.config.get("wait_strategy", "fixed") == "smart":
+            wait_for_dom_settle(
+                self.page,
+                self.config.get("dom_quiet_ms", 200),
+                self.config.get("settle_timeout", 3000)
+            )
+        else:
+            time.sleep(1)
+    
+    def _before_navigation(self):
+        """Count a navigation, sample memory when due and recycle the page if needed"""
+        sample = None
+        if self._page_navigations and self.recycle_policy.wants_sample(self.navigations):
+            sample = self.memory.sample(self.page, f"navigation {self.navigations}")
+        if self.recycle_policy.due(self._page_navigations, sample):
+            self.recycle_page()
+        self.navigations += 1
+        self._page_navigations += 1
+    
+    def recycle_page(self):
+        """
+        Replace the page with one in a fresh context, keeping cookies and local storage.
+        Closing the old context frees everything the browser and the Playwright
+        driver held for it (DOM, JS heap, handles).
+        """
+        self.logger.info(f"Recycling page after {self._page_navigations} navigations")
+        self.new_context(storage_state=self.page.context.storage_state())
+        self.memory.count_recycle()
+        self._page_navigations = 0
+    
+    def new_context(self, storage_state: Optional[Union[str, Dict]] = None):
+        """
+        Replace the current page with one in a fresh browser context.
+        Args:
+            storage_state: Optional Playwright storage state (path or dict) to start from
+        """
+        browser = self.page.context.browser if self.page else self.browser
+        old_page = self.page
+        self.use_context(browser.new_context(storage_state=storage_state))
+        if old_page:
+            old_page.context.close()
+        return self.page
+    
+    def use_context(self, context):
+        """Switch to a new page in the given browser context, with request blocking applied"""
+        self.blocker.attach(context)
+        if self.recording:
+            self.har.attach(context, self.recording)
+            self.blocker.bring_to_front(context)
+        self.page = context.new_page()
+        return self.page
+    
+    def use_block_profile(self, name: Optional[str]):
+        """Switch the request blocking profile, None goes back to the configured one"""
+        self.blocker.use_profile(name)
+        if self.page:
+            self.blocker.attach(self.page.context)
+    
     def get_current_url(self) -> str:
         """
         Get the current page URL.
@@ -140,7 +273,11 @@ class AIWebTester:
         Clean up resources.
         """
         try:
-            self.browser.close()
-            self.playwright.stop()
+            if self.browser:
+                self.browser.close()
+            if self.playwright:
+                self.playwright.stop()
         except Exception as e:
             self.logger.error(f"Error closing browser: {e}")
+        finally:
+            self._release_browser_server()
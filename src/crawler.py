@@ -0,0 +1,233 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urldefrag, urlsplit
+from playwright.async_api import async_playwright
+from .utils.element_helpers import locate_snapshot_item, snapshot_elements_async
+from .utils.memory import MemoryMonitor, RecyclePolicy
+from .utils.network import ResourceBlocker
+
+# Takes snapshot items and returns one decision per item
+Classifier = Callable[[List[Dict]], List[bool]]
+
+class CrawlEngine:
+    """
+    Concurrent breadth-first crawler.
+    A shared URL frontier is consumed by a bounded pool of workers, each
+    owning its own browser context and page in one Chromium process.
+    Every URL carries its own depth, so workers never share depth state.
+    """
+
+    def __init__(self, config: Dict, workers: int = 4, headless: bool = False,
+                 classify: Optional[Classifier] = None, interaction_delay: int = 250):
+        """
+        Args:
+            config: Configuration from load_config (max_depth, allowed_domains, exclude_paths,
+                block_profile, recycle_every, recycle_memory_mb, memory_sample_every)
+            workers: Number of pages crawled at the same time
+            headless: Run browser in headless mode
+            classify: Batched element classifier, e.g. AIWebTester.analyze_elements.
+                When omitted every same-site link is followed and nothing else is touched.
+            interaction_delay: Milliseconds to let the page react after a click or fill
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+        self.headless = headless
+        self.classify = classify
+        self.interaction_delay = interaction_delay
+
+        self.max_depth = config.get("max_depth", 3)
+        self.allowed_domains = [d.lower() for d in config.get("allowed_domains", []) if d]
+        self.exclude_paths = [p for p in config.get("exclude_paths", []) if p]
+        self.navigation_timeout = config.get("navigation_timeout", 30000)
+        self.blocker = ResourceBlocker.from_config(config)
+        # Each worker replaces its page and context every so often to keep memory bounded
+        self.recycle_policy = RecyclePolicy.from_config(config)
+        self.memory = MemoryMonitor()
+
+        # url -> depth at which it was first discovered
+        self.depths: Dict[str, int] = {}
+        self.visited_urls = set()
+        self.failed_urls = set()
+        self._seed_hosts = set()
+
+    def run(self, *seeds: str) -> Dict[str, int]:
+        """Crawl from the given seed URLs and block until the frontier is drained"""
+        return asyncio.run(self.crawl(*seeds))
+
+    async def crawl(self, *seeds: str) -> Dict[str, int]:
+        """
+        Crawl from the given seed URLs.
+        Returns a mapping of every visited URL to its depth.
+        """
+        frontier: asyncio.Queue = asyncio.Queue()
+        for seed in seeds:
+            self._seed_hosts.add((urlsplit(seed).hostname or "").lower())
+        for seed in seeds:
+            self._enqueue(frontier, seed, 0)
+
+        # Model calls are CPU bound and not thread safe, keep them on one thread
+        executor = ThreadPoolExecutor(max_workers=1)
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=self.headless)
+            try:
+                await self._run_workers(browser, frontier, executor)
+            finally:
+                await browser.close()
+                executor.shutdown(wait=False)
+
+        self.logger.info(
+            f"Crawl finished: {len(self.visited_urls)} pages visited, "
+            f"{len(self.failed_urls)} failed"
+        )
+        return {url: self.depths[url] for url in self.visited_urls}
+
+    async def _run_workers(self, browser, frontier: asyncio.Queue, executor):
+        """
+        Run the worker pool until the frontier is drained.
+        Workers only return by raising; a crawl whose workers all stopped
+        raises the first error instead of waiting on the frontier forever.
+        """
+        tasks = [
+            asyncio.create_task(self._worker(browser, frontier, executor, worker_id))
+            for worker_id in range(self.workers)
+        ]
+        join = asyncio.create_task(frontier.join())
+        try:
+            pending = set(tasks)
+            while not join.done():
+                done, pending = await asyncio.wait({join, *pending}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(join)
+                for task in done - {join}:
+                    self.logger.error(f"Crawl worker stopped: {task.exception()!r}")
+                if not pending and not join.done():
+                    errors = [task.exception() for task in tasks]
+                    raise RuntimeError(f"All crawl workers stopped, {frontier.qsize()} URLs left") from errors[0]
+        finally:
+            join.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(join, *tasks, return_exceptions=True)
+
+    def is_allowed(self, url: str) -> bool:
+        """Check a URL against allowed_domains and exclude_paths"""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+
+        host = (parts.hostname or "").lower()
+        domains = self.allowed_domains or self._seed_hosts
+        if not any(host == d or host.endswith("." + d) for d in domains):
+            return False
+
+        return not any(parts.path.startswith(path) for path in self.exclude_paths)
+
+    def _enqueue(self, frontier: asyncio.Queue, url: str, depth: int):
+        """Add a URL to the frontier unless it was seen, is too deep or not allowed"""
+        url = urldefrag(url)[0]
+        if url in self.depths or depth >= self.max_depth or not self.is_allowed(url):
+            return
+        self.depths[url] = depth
+        frontier.put_nowait((url, depth))
+
+    async def _new_page(self, browser):
+        context = await browser.new_context()
+        try:
+            await self.blocker.attach_async(context)
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+        page.set_default_navigation_timeout(self.navigation_timeout)
+        return context, page
+
+    async def _worker(self, browser, frontier: asyncio.Queue, executor, worker_id: int):
+        """
+        Pull URLs from the frontier until cancelled.
+        The page is (re)created before the next URL, so a context that cannot
+        be made (e.g. a crashed browser) fails that URL instead of the worker.
+        """
+        context = page = None
+        navigations = 0
+        try:
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    try:
+                        if page is None:
+                            context, page = await self._new_page(browser)
+                            navigations = 0
+                        await self._crawl_page(page, frontier, executor, url, depth)
+                    except Exception as e:
+                        self.failed_urls.add(url)
+                        self.logger.error(f"[worker {worker_id}] Error exploring page {url}: {e}")
+                finally:
+                    frontier.task_done()
+
+                if page is None:
+                    continue
+                navigations += 1
+                try:
+                    if await self._recycle_due(page, navigations, worker_id):
+                        # Closing the context frees its DOM, JS heap and driver-side handles
+                        old_context, context, page = context, None, None
+                        self.memory.count_recycle()
+                        await old_context.close()
+                except Exception as e:
+                    self.logger.error(f"[worker {worker_id}] Error recycling page, starting a fresh one: {e}")
+                    context = page = None
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    self.logger.debug(f"[worker {worker_id}] Error closing context: {e}")
+
+    async def _recycle_due(self, page, navigations: int, worker_id: int) -> bool:
+        sample = None
+        if self.recycle_policy.wants_sample(navigations):
+            sample = await self.memory.sample_async(page, f"worker {worker_id}")
+        if not self.recycle_policy.due(navigations, sample):
+            return False
+        self.logger.debug(f"[worker {worker_id}] Recycling page after {navigations} navigations")
+        return True
+
+    async def _crawl_page(self, page, frontier: asyncio.Queue, executor, url: str, depth: int):
+        """Visit one page, enqueue its links and interact with the chosen elements"""
+        self.logger.info(f"Exploring (depth {depth}): {url}")
+        await page.goto(url)
+        await page.wait_for_load_state('networkidle')
+        self.visited_urls.add(url)
+
+        items = [item for item in await snapshot_elements_async(page) if item['visible']]
+        if self.classify:
+            loop = asyncio.get_running_loop()
+            decisions = await loop.run_in_executor(executor, self.classify, items)
+        else:
+            decisions = [item['tag'] == 'a' for item in items]
+        chosen = [item for item, interact in zip(items, decisions) if interact]
+
+        # Queue links before interacting, clicks may navigate the page away
+        for item in chosen:
+            if item['tag'] == 'a' and item['href']:
+                self._enqueue(frontier, item['href'], depth + 1)
+
+        for item in chosen:
+            if item['tag'] in ('button', 'input'):
+                await self._interact(page, item)
+
+    async def _interact(self, page, item: Dict):
+        """Click a button or fill an input from the page snapshot"""
+        try:
+            locator = locate_snapshot_item(page, item)
+            if await locator.count() == 0:
+                return
+            self.logger.info(f"Interacting with {item['tag']}: {item['text']}")
+            if item['tag'] == 'button':
+                await locator.click()
+            else:
+                await locator.fill('test input')
+            await page.wait_for_timeout(self.interaction_delay)
+        except Exception as e:
+            self.logger.error(f"Error interacting with {item['tag']}: {e}")
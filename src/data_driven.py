@@ -0,0 +1,243 @@
+import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+from .ai_tester import AIWebTester
+from .plan import TestPlan
+from .test_runner import TestRunner
+from .utils.shared_browser import SharedBrowser
+
+logger = logging.getLogger(__name__)
+
+VariableSource = Union[str, Iterable[Dict[str, str]]]
+
+def iter_variables(source: VariableSource) -> Iterator[Dict[str, str]]:
+    """
+    Stream variable sets from a CSV file (header row = variable names),
+    a JSONL file (one object per line) or any iterable/generator of dicts.
+    Nothing is read ahead, so sources of any size use constant memory.
+    """
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    if source.endswith(".csv"):
+        with open(source, newline="") as f:
+            yield from csv.DictReader(f)
+    elif source.endswith(".jsonl"):
+        with open(source) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported variable source: {source} (expected .csv or .jsonl)")
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+class Checkpoint:
+    """
+    Append-only log of finished rows, one JSON line per row.
+    Reopening the same file resumes where a previous run stopped.
+    """
+
+    def __init__(self, path: str, retry_failed: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.finished: Set[int] = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a partial last line
+                        continue
+                    if entry["status"] == "success" or not retry_failed:
+                        self.finished.add(entry["row"])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a")
+        if self._file.tell() and not _ends_with_newline(path):
+            # Terminate a torn last line so the next entry starts cleanly
+            self._file.write("\n")
+
+    def is_finished(self, row: int) -> bool:
+        return row in self.finished
+
+    def mark(self, row: int, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.finished.add(row)
+            self._file.write(json.dumps({"row": row, "status": status, "error": error}) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class RateLimiter:
+    """Spaces calls to acquire() at most rate per second across all threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class DataDrivenRunner:
+    """
+    Runs one compiled test case once per variable set.
+    Variable sets are streamed from the source, run by a pool of workers that
+    each keep a warm browser context, optionally rate limited, and every
+    finished row is checkpointed so an interrupted run can resume.
+    """
+
+    def __init__(self, runner: TestRunner, test_case_path: str, source: VariableSource,
+                 workers: int = 1, rate_limit: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None, retry_failed: bool = False):
+        """
+        Args:
+            runner: Runner providing config, report and (for one worker) the browser
+            test_case_path: Test case compiled once and run for every row
+            source: CSV/JSONL path or iterable of variable dicts. Resuming needs the
+                source to yield the same rows in the same order (e.g. a seeded generator).
+            workers: Rows run at the same time, each worker in its own browser context
+            rate_limit: Maximum rows started per second across all workers
+            checkpoint_path: JSONL file recording finished rows, enables resuming
+            retry_failed: On resume, run rows again that failed last time
+        """
+        self.runner = runner
+        self.plan: TestPlan = runner.load_plan(test_case_path)
+        self.source = source
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.checkpoint = Checkpoint(checkpoint_path, retry_failed) if checkpoint_path else None
+        self.counts = {"success": 0, "failure": 0, "skipped": 0}
+        # Why parallel workers stopped early, e.g. they could not reach the browser
+        self.worker_errors: List[str] = []
+        self._lock = threading.Lock()
+
+    def run(self) -> Dict[str, int]:
+        """Run every row and return success/failure/skipped counts"""
+        started = time.time()
+        try:
+            if self.workers == 1:
+                for row, variables in self._pending_rows():
+                    self._run_row(self.runner, row, variables)
+            else:
+                self._run_parallel()
+        finally:
+            if self.checkpoint:
+                self.checkpoint.close()
+            self.runner.report.add_metrics(f"Data-driven: {self.plan.name}", dict(
+                self.counts, duration_seconds=round(time.time() - started, 2)
+            ))
+            self.runner.finish_report()
+
+        logger.info(f"Data-driven run of {self.plan.name} finished: {self.counts}")
+        return dict(self.counts)
+
+    def _pending_rows(self) -> Iterator:
+        """Yield (row index, variables), skipping rows already checkpointed"""
+        for row, variables in enumerate(iter_variables(self.source)):
+            if self.checkpoint and self.checkpoint.is_finished(row):
+                self.counts["skipped"] += 1
+                continue
+            yield row, variables
+
+    def _run_parallel(self):
+        """Feed rows through a bounded queue to worker threads"""
+        rows: queue.Queue = queue.Queue(maxsize=self.workers * 2)
+        with SharedBrowser(
+            headless=self.runner.config.get("headless", False),
+            endpoint=self.runner.tester.browser_endpoint
+        ) as shared:
+            threads = [
+                threading.Thread(target=self._worker, args=(shared, rows), name=f"data-worker-{i}")
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            try:
+                for item in self._pending_rows():
+                    # Stop feeding if every worker died, e.g. the browser crashed
+                    while True:
+                        try:
+                            rows.put(item, timeout=1)
+                            break
+                        except queue.Full:
+                            if not any(thread.is_alive() for thread in threads):
+                                raise RuntimeError(
+                                    f"All data-driven workers stopped: {'; '.join(self.worker_errors)}"
+                                )
+            finally:
+                # Dead workers no longer take from the queue, never block on a full one
+                for _ in threads:
+                    while any(thread.is_alive() for thread in threads):
+                        try:
+                            rows.put(None, timeout=1)
+                            break
+                        except queue.Full:
+                            continue
+                for thread in threads:
+                    thread.join()
+
+    def _worker(self, shared: SharedBrowser, rows: queue.Queue):
+        """Run rows in one warm context, replacing it only after a failure"""
+        playwright = browser = None
+        try:
+            playwright, browser = shared.connect()
+            tester = AIWebTester(
+                launch_browser=False, config=self.runner.config,
+                blocker=self.runner.tester.blocker.for_worker(), har=self.runner.tester.har
+            )
+            tester.use_context(browser.new_context(storage_state=self.runner.storage_state))
+            worker_runner = TestRunner(
+                config=self.runner.config, tester=tester,
+                report=self.runner.report, tracer=self.runner.tracer
+            )
+            worker_runner.storage_state = self.runner.storage_state
+            while True:
+                item = rows.get()
+                if item is None:
+                    return
+                if not self._run_row(worker_runner, *item):
+                    tester.new_context(storage_state=self.runner.storage_state)
+        except Exception as e:
+            logger.error(f"Data-driven worker stopped: {e}")
+            with self._lock:
+                self.worker_errors.append(str(e))
+        finally:
+            if browser is not None:
+                SharedBrowser.disconnect(playwright, browser)
+
+    def _run_row(self, runner: TestRunner, row: int, variables: Dict[str, str]) -> bool:
+        """Run the plan for one row, record and checkpoint the outcome"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        try:
+            # Each row is a test case of its own in the report
+            runner.run_plan(self.plan, variables, case_name=f"{self.plan.name} row {row}")
+            status, error = "success", None
+        except Exception as e:
+            status, error = "failure", str(e)
+            logger.error(f"Row {row} failed: {e}")
+
+        with self._lock:
+            self.counts[status] += 1
+        if self.checkpoint:
+            self.checkpoint.mark(row, status, error)
+        return status == "success"
@@ -0,0 +1,355 @@
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Union
+from .utils.classification_cache import ClassificationCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Relative classification_cache and onnx_model_dir paths are resolved against the project root, not the CWD
+DEFAULT_CACHE_PATH = os.path.join(_PROJECT_ROOT, ".cache", "classifications.db")
+DEFAULT_ONNX_DIR = os.path.join(_PROJECT_ROOT, "models", "element-classifier-onnx")
+
+# Tags that are interactive by definition
+INTERACTIVE_TAGS = {"button", "select", "textarea", "summary"}
+
+# Tags that never take interaction unless a role says otherwise
+STATIC_TAGS = {
+    "div", "span", "p", "li", "ul", "ol", "section", "article", "header",
+    "footer", "nav", "main", "aside", "label", "img", "table", "tr", "td",
+    "th", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "small"
+}
+
+# ARIA roles of widgets a user can operate
+INTERACTIVE_ROLES = {
+    "button", "link", "menuitem", "menuitemcheckbox", "menuitemradio", "tab",
+    "checkbox", "radio", "option", "combobox", "switch", "textbox", "searchbox",
+    "slider", "spinbutton", "treeitem"
+}
+
+def as_element(element) -> Dict:
+    """Accept a snapshot item dict or a (text, tag) pair"""
+    if isinstance(element, dict):
+        return element
+    text, tag = element
+    return {"text": text, "tag": tag}
+
+class ElementScorer:
+    """
+    Decides whether page elements should be interacted with.
+    Elements are snapshot items (see element_helpers.snapshot_elements);
+    only "text" and "tag" are required, "href", "type", "role" and
+    "disabled" are used when present.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.counters = {"elements": 0, "model_calls": 0}
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        """
+        Return one decision per element, in input order.
+        None means the scorer could not decide.
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Counters describing the work done so far"""
+        return dict(self.counters, backend=self.name)
+
+class HeuristicScorer(ElementScorer):
+    """Rule-based scorer using tag, role, href, type and disabled state"""
+
+    name = "heuristic"
+
+    def decide(self, element: Dict) -> Optional[bool]:
+        """Decide a single element, None if the rules are inconclusive"""
+        tag = (element.get("tag") or "").lower()
+        role = (element.get("role") or "").lower()
+
+        if element.get("disabled"):
+            return False
+        if tag in INTERACTIVE_TAGS:
+            return True
+        if tag == "input":
+            return (element.get("type") or "text").lower() != "hidden"
+        if role in INTERACTIVE_ROLES:
+            return True
+        if tag == "a":
+            href = (element.get("href") or "").strip()
+            if href and href != "#" and not href.lower().startswith("javascript:"):
+                return True
+            # Script-driven anchors need a closer look
+            return None
+        if tag in STATIC_TAGS:
+            return False
+        return None
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        self.counters["elements"] += len(elements)
+        return [self.decide(element) for element in elements]
+
+class TransformerScorer(ElementScorer):
+    """
+    Text classification model scorer.
+    The model (and the transformers import) is loaded on first use.
+    """
+
+    name = "transformer"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, batch_size: int = 32,
+                 threads: Optional[int] = None):
+        super().__init__()
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.threads = threads
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        """Text classification pipeline, imported and loaded on first access"""
+        if self._nlp is None:
+            from transformers import pipeline
+            if self.threads:
+                import torch
+                torch.set_num_threads(self.threads)
+            logger.info(f"Loading model {self.model_name}")
+            self._nlp = pipeline("text-classification", model=self.model_name)
+        return self._nlp
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        if not elements:
+            return []
+        self.counters["elements"] += len(elements)
+        self.counters["model_calls"] += len(elements)
+        contexts = [self.element_context(e["text"], e["tag"]) for e in elements]
+        results = self.nlp(contexts, batch_size=self.batch_size, truncation=True)
+        return [
+            self.is_interactive(result, element["tag"])
+            for result, element in zip(results, elements)
+        ]
+
+    @staticmethod
+    def element_context(element_text: str, element_type: str) -> str:
+        """Create a context string that describes the element"""
+        return f"This {element_type} element says '{element_text}'"
+
+    @staticmethod
+    def is_interactive(result: dict, element_type: str) -> bool:
+        """Turn a classifier result into an interaction decision"""
+        # Map sentiment to interactivity (positive sentiment = interactive)
+        score = result['score'] if result['label'] == 'POSITIVE' else 1 - result['score']
+
+        # Consider elements like buttons and inputs as more likely to be interactive
+        base_score = 0.5
+        if element_type in ['button', 'input', 'select', 'a']:
+            base_score = 0.7
+
+        return score > base_score
+
+class OnnxScorer(ElementScorer):
+    """
+    Runs an exported (typically int8-quantized) copy of the classifier through
+    ONNX Runtime on CPU. Decisions use the same threshold logic as
+    TransformerScorer. Export a model with scripts/export_onnx_model.py.
+    Requires the optional onnxruntime and tokenizers packages.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, batch_size: int = 32, threads: Optional[int] = None,
+                 model_file: str = "model_quantized.onnx", max_length: int = 128):
+        super().__init__()
+        self.model_dir = model_dir
+        self.model_file = model_file
+        self.batch_size = batch_size
+        self.threads = threads
+        self.max_length = max_length
+        # Quantization can flip borderline decisions, keep cache entries apart
+        self.model_name = f"{os.path.basename(os.path.normpath(model_dir))}/{model_file}"
+        self._session = None
+        self._tokenizer = None
+        self._labels: Dict[int, str] = {}
+
+    def _load(self):
+        """Import the runtime and load model, tokenizer and labels on first use"""
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The onnx inference backend needs onnxruntime and tokenizers: "
+                "pip install onnxruntime tokenizers"
+            ) from e
+
+        options = onnxruntime.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+            options.inter_op_num_threads = 1
+        logger.info(f"Loading ONNX model {self.model_name}")
+        self._session = onnxruntime.InferenceSession(
+            os.path.join(self.model_dir, self.model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+        self._tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, "tokenizer.json"))
+        self._tokenizer.enable_truncation(self.max_length)
+        self._tokenizer.enable_padding()
+
+        with open(os.path.join(self.model_dir, "config.json")) as f:
+            self._labels = {int(k): v for k, v in json.load(f)["id2label"].items()}
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        if not elements:
+            return []
+        if self._session is None:
+            self._load()
+
+        import numpy as np
+        self.counters["elements"] += len(elements)
+        self.counters["model_calls"] += len(elements)
+        input_names = {i.name for i in self._session.get_inputs()}
+
+        decisions: List[Optional[bool]] = []
+        for start in range(0, len(elements), self.batch_size):
+            batch = elements[start:start + self.batch_size]
+            encodings = self._tokenizer.encode_batch(
+                [TransformerScorer.element_context(e["text"], e["tag"]) for e in batch]
+            )
+            inputs = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            }
+            logits = self._session.run(None, {k: v for k, v in inputs.items() if k in input_names})[0]
+
+            # Softmax, then report the top label and its score like the pipeline does
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = exp / exp.sum(axis=1, keepdims=True)
+            for element, row in zip(batch, probs):
+                top = int(row.argmax())
+                result = {"label": self._labels[top], "score": float(row[top])}
+                decisions.append(TransformerScorer.is_interactive(result, element["tag"]))
+        return decisions
+
+class CachedScorer(ElementScorer):
+    """
+    Puts a ClassificationCache in front of another scorer.
+    Decisions are keyed by model name, element type and normalized text, so
+    the wrapped scorer must decide from tag and text alone (e.g. TransformerScorer).
+    Given a factory instead of a cache, the cache is opened on first use.
+    """
+
+    name = "cached"
+
+    def __init__(self, scorer: ElementScorer,
+                 cache: Union[ClassificationCache, Callable[[], ClassificationCache]]):
+        super().__init__()
+        self.scorer = scorer
+        self._cache = cache if isinstance(cache, ClassificationCache) else None
+        self._open_cache = cache
+        self.model_name = getattr(scorer, "model_name", scorer.name)
+
+    @property
+    def cache(self) -> ClassificationCache:
+        if self._cache is None:
+            self._cache = self._open_cache()
+        return self._cache
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        self.counters["elements"] += len(elements)
+        keys = [self.cache.key(self.model_name, e["tag"], e["text"]) for e in elements]
+        decisions = self.cache.get_many(keys)
+
+        # Classify each distinct missing key once
+        missing: Dict = {}
+        for key, element, decision in zip(keys, elements, decisions):
+            if decision is None and key not in missing:
+                missing[key] = element
+        if missing:
+            scored = self.scorer.score_batch(list(missing.values()))
+            fresh = {key: d for key, d in zip(missing, scored) if d is not None}
+            self.cache.put_many(fresh)
+            decisions = [fresh.get(key) if d is None else d for key, d in zip(keys, decisions)]
+        return decisions
+
+    def stats(self) -> Dict[str, int]:
+        stats = self.scorer.stats()
+        # An unopened cache has answered nothing
+        cache = self._cache
+        stats.update(cache_hits=cache.hits if cache else 0, cache_misses=cache.misses if cache else 0)
+        return stats
+
+class HybridScorer(ElementScorer):
+    """
+    Heuristic fast path with a model fallback.
+    Only elements the rules cannot decide are sent to the model.
+    """
+
+    name = "hybrid"
+
+    def __init__(self, fast: HeuristicScorer, model: ElementScorer):
+        super().__init__()
+        self.fast = fast
+        self.model = model
+        self.counters["model_calls_avoided"] = 0
+
+    def score_batch(self, elements: List[Dict]) -> List[Optional[bool]]:
+        decisions = self.fast.score_batch(elements)
+        ambiguous = [i for i, decision in enumerate(decisions) if decision is None]
+
+        self.counters["elements"] += len(elements)
+        self.counters["model_calls_avoided"] += len(elements) - len(ambiguous)
+        if ambiguous:
+            model_decisions = self.model.score_batch([elements[i] for i in ambiguous])
+            for i, decision in zip(ambiguous, model_decisions):
+                decisions[i] = decision
+        return decisions
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        model_stats = self.model.stats()
+        stats["model_calls"] = model_stats.get("model_calls", 0)
+        for key in ("cache_hits", "cache_misses"):
+            if key in model_stats:
+                stats[key] = model_stats[key]
+        return stats
+
+def create_scorer(config: Dict, batch_size: int = 32) -> ElementScorer:
+    """
+    Build the scorer selected by config["scorer_backend"]:
+    "hybrid" (default), "heuristic" or "transformer".
+    The model comes from config["ai_model"] and runs on config["inference_backend"]:
+    "torch" (default) or "onnx" (loaded from config["onnx_model_dir"]), using
+    config["inference_threads"] CPU threads when set. Model decisions are cached in
+    config["classification_cache"] (a SQLite path) unless it is set to "", opened
+    the first time the model is asked.
+    """
+    backend = config.get("scorer_backend", "hybrid")
+    if backend == "heuristic":
+        return HeuristicScorer()
+    if backend not in ("transformer", "hybrid"):
+        raise ValueError(f"Unknown scorer_backend: {backend}")
+
+    inference = config.get("inference_backend", "torch")
+    threads = config.get("inference_threads")
+    if inference == "onnx":
+        model_dir = os.path.join(_PROJECT_ROOT, config.get("onnx_model_dir", DEFAULT_ONNX_DIR))
+        model: ElementScorer = OnnxScorer(model_dir, batch_size, threads)
+    elif inference == "torch":
+        model = TransformerScorer(config.get("ai_model") or DEFAULT_MODEL, batch_size, threads)
+    else:
+        raise ValueError(f"Unknown inference_backend: {inference}")
+
+    cache_path = config.get("classification_cache", DEFAULT_CACHE_PATH)
+    if cache_path:
+        cache_path = os.path.join(_PROJECT_ROOT, cache_path)
+        cache_size = config.get("classification_cache_size", 10000)
+        model = CachedScorer(model, lambda: ClassificationCache(cache_path, cache_size))
+
+    if backend == "transformer":
+        return model
+    return HybridScorer(HeuristicScorer(), model)
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_PLACEHOLDER = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+class TestCaseValidationError(ValueError):
+    """Raised when a test case JSON does not match the expected schema"""
+
+    def __init__(self, source: str, errors: List[str]):
+        self.source = source
+        self.errors = errors
+        super().__init__(f"Invalid test case {source}:\n  " + "\n  ".join(errors))
+
+class Template:
+    """
+    A string with ${VARIABLE} placeholders, parsed once.
+    Placeholders without a matching variable are left untouched.
+    """
+
+    __slots__ = ("source", "variables", "_parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        # Alternating literal text and variable names: [text, name, text, name, ..., text]
+        self._parts: Tuple[str, ...] = tuple(_PLACEHOLDER.split(source))
+        self.variables: Tuple[str, ...] = self._parts[1::2]
+
+    def render(self, variables: Dict[str, str]) -> str:
+        if not self.variables:
+            return self.source
+        parts = list(self._parts)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = str(variables[name]) if name in variables else f"${{{name}}}"
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"Template({self.source!r})"
+
+# Steps are immutable, so one compiled plan can be shared by any number of runs
+
+@dataclass(frozen=True)
+class Step:
+    id: str
+    action: str
+    description: str
+    optional: bool = False
+    # Signal to wait for after the step, see waits.wait_for_condition
+    wait_for: Any = None
+    timeout: Optional[int] = None
+
+@dataclass(frozen=True)
+class NavigateStep(Step):
+    url: Template = None
+
+@dataclass(frozen=True)
+class ClickStep(Step):
+    selector: Template = None
+    # How long to wait for the element to become visible
+    element_timeout: int = 30000
+
+@dataclass(frozen=True)
+class TypeStep(Step):
+    selector: Template = None
+    value: Template = None
+    element_timeout: int = 30000
+    # "fill", "type" or "insert_text", with the key delay for "type"
+    input: str = "type"
+    delay: int = 100
+
+@dataclass(frozen=True)
+class WaitStep(Step):
+    # None when the step gave no time, the runner picks a default
+    time: Optional[int] = None
+    selector: Optional[Template] = None
+    state: str = "visible"
+
+@dataclass(frozen=True)
+class GetUrlStep(Step):
+    save_to_file: Optional[str] = None
+
+@dataclass(frozen=True)
+class TestPlan:
+    name: str
+    description: str
+    base_url: Optional[str]
+    steps: Tuple[Step, ...]
+    auth: Optional[Dict[str, Any]] = None
+    # Request blocking profile for this test case, None uses the configured one
+    block_profile: Optional[str] = None
+    source_hash: str = ""
+    # Variables referenced anywhere in the plan
+    variables: Tuple[str, ...] = field(default=())
+
+INPUT_STRATEGIES = ("fill", "type", "insert_text")
+# Named signals for "wait_for", see utils.waits.wait_for_condition; an object waits for its "selector"
+WAIT_CONDITIONS = ("dom_settle", "network_idle", "page_quiet", "url_change")
+
+# action -> required keys with their types
+_REQUIRED = {
+    "navigate": {"url": str},
+    "click": {"selector": str},
+    "type": {"selector": str, "value": str},
+    "wait": {},
+    "get_url": {},
+}
+
+# Optional keys with their types, valid for every action
+_COMMON_OPTIONAL = {
+    "description": str, "optional": bool, "wait_for": (str, dict), "timeout": int,
+}
+_ACTION_OPTIONAL = {
+    "type": {"input": str, "delay": int},
+    "wait": {"time": int, "selector": str, "state": str},
+    "get_url": {"save_to_file": str},
+}
+
+def _check_type(value, expected) -> bool:
+    # bool is an int subclass, do not let true/false pass as a number
+    if expected is int and isinstance(value, bool):
+        return False
+    return isinstance(value, expected)
+
+def validate_test_case(data: Any, source: str = "<test case>"):
+    """Check a loaded test case against the schema, raising TestCaseValidationError"""
+    errors = []
+    if not isinstance(data, dict):
+        raise TestCaseValidationError(source, ["top level must be an object"])
+    if not isinstance(data.get("name"), str):
+        errors.append("'name' must be a string")
+    if "auth" in data and not isinstance(data["auth"], dict):
+        errors.append("'auth' must be an object")
+    if "auth" in data and not isinstance(data.get("base_url"), str):
+        errors.append("'base_url' is required when 'auth' is set")
+    if "block_profile" in data and not isinstance(data["block_profile"], str):
+        errors.append("'block_profile' must be a string")
+    steps = data.get("steps")
+    if not isinstance(steps, list) or not steps:
+        errors.append("'steps' must be a non-empty list")
+        raise TestCaseValidationError(source, errors)
+
+    for index, step in enumerate(steps):
+        where = f"step {index}"
+        if not isinstance(step, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        if not isinstance(step.get("id"), str):
+            errors.append(f"{where}: 'id' must be a string")
+        else:
+            where = f"step {index} ({step['id']})"
+
+        action = step.get("action")
+        if action not in _REQUIRED:
+            errors.append(f"{where}: unknown action {action!r}")
+            continue
+
+        for key, expected in _REQUIRED[action].items():
+            if key not in step:
+                errors.append(f"{where}: '{key}' is required for {action}")
+            elif not _check_type(step[key], expected):
+                errors.append(f"{where}: '{key}' has the wrong type")
+        optional_keys = dict(_COMMON_OPTIONAL, **_ACTION_OPTIONAL.get(action, {}))
+        for key, expected in optional_keys.items():
+            if key in step and not _check_type(step[key], expected):
+                errors.append(f"{where}: '{key}' has the wrong type")
+        if action == "type" and step.get("input", "type") not in INPUT_STRATEGIES:
+            errors.append(f"{where}: 'input' must be one of {', '.join(INPUT_STRATEGIES)}")
+        wait_for = step.get("wait_for")
+        if isinstance(wait_for, str) and wait_for not in WAIT_CONDITIONS:
+            errors.append(
+                f"{where}: 'wait_for' must be one of {', '.join(WAIT_CONDITIONS)} or an object with a 'selector'"
+            )
+        elif isinstance(wait_for, dict) and not isinstance(wait_for.get("selector"), str):
+            errors.append(f"{where}: 'wait_for' object needs a 'selector' string")
+
+    if errors:
+        raise TestCaseValidationError(source, errors)
+
+def _freeze(value):
+    """Read-only view of a JSON object so compiled plans cannot be mutated"""
+    return MappingProxyType(dict(value)) if isinstance(value, dict) else value
+
+def compile_test_case(data: Dict, options: Dict[str, Any] = None,
+                      source: str = "<test case>", source_hash: str = "") -> TestPlan:
+    """
+    Validate a test case and compile it into a TestPlan.
+    options carries the config values resolved into the steps:
+    element_timeout, input_strategy and type_delay.
+    """
+    validate_test_case(data, source)
+    options = options or {}
+    element_timeout = options.get("element_timeout", 30000)
+
+    steps = []
+    for raw in data["steps"]:
+        action = raw["action"]
+        common = dict(
+            id=raw["id"],
+            action=action,
+            description=raw.get("description", action),
+            optional=raw.get("optional", False),
+            wait_for=_freeze(raw.get("wait_for")),
+            timeout=raw.get("timeout"),
+        )
+        if action == "navigate":
+            step = NavigateStep(url=Template(raw["url"]), **common)
+        elif action == "click":
+            step = ClickStep(
+                selector=Template(raw["selector"]),
+                element_timeout=5000 if common["optional"] else element_timeout,
+                **common
+            )
+        elif action == "type":
+            step = TypeStep(
+                selector=Template(raw["selector"]),
+                value=Template(raw["value"]),
+                element_timeout=element_timeout,
+                input=raw.get("input", options.get("input_strategy", "type")),
+                delay=raw.get("delay", options.get("type_delay", 100)),
+                **common
+            )
+        elif action == "wait":
+            step = WaitStep(
+                time=raw.get("time"),
+                selector=Template(raw["selector"]) if "selector" in raw else None,
+                state=raw.get("state", "visible"),
+                **common
+            )
+        else:
+            step = GetUrlStep(save_to_file=raw.get("save_to_file"), **common)
+        steps.append(step)
+
+    variables = []
+    for step in steps:
+        for value in vars(step).values():
+            if isinstance(value, Template):
+                variables.extend(v for v in value.variables if v not in variables)
+
+    return TestPlan(
+        name=data["name"],
+        description=data.get("description", data["name"]),
+        base_url=data.get("base_url"),
+        steps=tuple(steps),
+        auth=_freeze(data.get("auth")),
+        block_profile=data.get("block_profile"),
+        source_hash=source_hash,
+        variables=tuple(variables),
+    )
+
+# (sha256 of the file, resolved options) -> compiled plan, least recently used first
+_PLAN_CACHE: "OrderedDict[Tuple[str, Tuple], TestPlan]" = OrderedDict()
+_PLAN_CACHE_SIZE = 64
+_PLAN_CACHE_LOCK = threading.Lock()
+
+def load_plan(path: str, options: Dict[str, Any] = None) -> TestPlan:
+    """
+    Load, validate and compile a test case file.
+    Plans are cached by file content hash and options, so a changed file is
+    recompiled while repeated runs of the same file skip parsing entirely.
+    The cache keeps the _PLAN_CACHE_SIZE most recently used plans.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    key = (digest, tuple(sorted((options or {}).items())))
+
+    with _PLAN_CACHE_LOCK:
+        plan = _PLAN_CACHE.get(key)
+        if plan is not None:
+            _PLAN_CACHE.move_to_end(key)
+    if plan is None:
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise TestCaseValidationError(path, [f"invalid JSON: {e}"]) from e
+        plan = compile_test_case(data, options, source=path, source_hash=digest)
+        with _PLAN_CACHE_LOCK:
+            _PLAN_CACHE[key] = plan
+            if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+                _PLAN_CACHE.popitem(last=False)
+    return plan
@@ -1,21 +1,73 @@
 import json
 import logging
-from typing import Dict, List, Optional
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 import os
 from .ai_tester import AIWebTester
+from .plan import (
+    ClickStep, GetUrlStep, NavigateStep, Step, TestPlan, TypeStep, WaitStep, load_plan
+)
+from .utils.auth_cache import StorageStateCache
 from .utils.config import load_config
 from .utils.reporting import TestReport
+from .utils.screenshots import options_from_config
+from .utils.shared_browser import SharedBrowser
+from .utils.timing import Tracer
+from .utils.waits import wait_for_condition, wait_for_dom_settle, wait_for_page_quiet
 
 logging.basicConfig(level=logging.DEBUG)  # More detailed logging
 
 class TestRunner:
-    def __init__(self, config_path: str = "config/config.json"):
-        self.config = load_config(config_path)
+    def __init__(self, config_path: str = "config/config.json", config: Optional[Dict] = None,
+                 tester: Optional[AIWebTester] = None, report: Optional[TestReport] = None,
+                 tracer: Optional[Tracer] = None):
+        """
+        Args:
+            config_path: Path to the config file, ignored when config is given
+            config: Already loaded configuration
+            tester: Tester to drive, a new browser is launched when omitted
+            report: Report to record into, by default a new run directory under report_dir
+            tracer: Timing spans and counters, shared by suite workers
+        """
+        self.config = config if config is not None else load_config(config_path)
         self.logger = logging.getLogger(__name__)
-        self.report = TestReport()
-        self.tester = AIWebTester(headless=self.config.get("headless", False))
+        self.report = report or TestReport.for_run(
+            self.config.get("report_dir", "reports"),
+            screenshots=options_from_config(self.config)
+        )
+        # Report case the steps being run belong to
+        self._case_id: Optional[str] = None
+        self.tracer = tracer or Tracer(self.config.get("trace_max_events", 100000))
+        self.tester = tester or AIWebTester(
+            headless=self.config.get("headless", False),
+            config=self.config
+        )
+        self.auth_cache = StorageStateCache(
+            self.config.get("storage_state_dir", ".auth"),
+            self.config.get("storage_state_ttl", 3600)
+        )
+        # Storage state of the last login, new suite contexts start from it
+        self.storage_state: Optional[str] = None
+        # "smart" replaces fixed pauses with waits on page signals
+        self.smart_waits = self.config.get("wait_strategy", "fixed") == "smart"
+        # Config values compiled into test plans
+        self.plan_options = {
+            "element_timeout": self.config.get('element_timeout', 30000),
+            "input_strategy": self.config.get('input_strategy', 'type'),
+            "type_delay": self.config.get('type_delay', 100)
+        }
+        # Step type -> handler, resolved once instead of comparing action strings per step
+        self._handlers = {
+            NavigateStep: self._navigate,
+            ClickStep: self._click,
+            TypeStep: self._type,
+            WaitStep: self._wait_step,
+            GetUrlStep: self._get_url
+        }
         
     def load_test_case(self, test_case_path: str) -> Dict:
         """Load a test case from JSON file"""
@@ -26,6 +78,14 @@ class TestRunner:
             self.logger.error(f"Error loading test case: {e}")
             raise
 
+    def load_plan(self, test_case_path: str) -> TestPlan:
+        """Load a validated, compiled test plan (cached by file hash)"""
+        try:
+            return load_plan(test_case_path, self.plan_options)
+        except Exception as e:
+            self.logger.error(f"Error loading test case: {e}")
+            raise
+
     def run_test(self, test_case_path: str, variables: Dict[str, str] = None, close_after: bool = False):
         """
         Run a specific test case
@@ -35,18 +95,26 @@ class TestRunner:
             close_after: Whether to close the browser after this test
         """
         try:
-            test_case = self.load_test_case(test_case_path)
-            self.logger.info(f"Running test case: {test_case['name']}")
-            
-            for step in test_case['steps']:
-                self._execute_step(step, variables or {})
+            self._run_test_case(test_case_path, variables or {})
+        finally:
+            self.finish_report()
+            if close_after:
+                self.close()
+
+    def _run_test_case(self, test_case_path: str, variables: Dict[str, str]):
+        """Run the steps of a test case and record failures in the report"""
+        name = Path(test_case_path).stem
+        try:
+            plan = self.load_plan(test_case_path)
+            name = plan.name
+            self.run_plan(plan, variables)
                 
         except Exception as e:
             self.logger.error(f"Error running test: {e}")
             if self.config.get("screenshot_on_error"):
                 screenshot_path = self.report.save_screenshot(
                     self.tester.page, 
-                    f"error_{test_case['name']}"
+                    f"error_{name}"
                 )
                 self.report.add_result(
                     "Error",
@@ -55,10 +123,216 @@ class TestRunner:
                     screenshot_path
                 )
             raise
+
+    def run_plan(self, plan: TestPlan, variables: Dict[str, str], case_name: Optional[str] = None):
+        """
+        Execute a compiled test plan with one set of variables, recorded in the
+        report as one test case (named case_name, by default the plan name)
+        """
+        self.logger.info(f"Running test case: {plan.name}")
+        self._case_id = self.report.start_case(case_name or plan.name)
+        try:
+            self.tester.use_block_profile(plan.block_profile)
+            if self.tester.har.mode != "live":
+                # One context per recorded test case: replays start clean and
+                # recordings are written when the context closes
+                self.tester.recording = plan.name
+                self.tester.new_context(storage_state=self.storage_state)
+            self._run_steps(plan, variables)
+        except Exception as e:
+            self.report.end_case(self._case_id, "failure", str(e))
+            raise
+        else:
+            self.report.end_case(self._case_id, "success")
         finally:
-            self.report.generate_report()
-            if close_after:
-                self.close()
+            self._case_id = None
+            if self.tester.recording:
+                self.tester.recording = None
+                if self.tester.har.mode == "record":
+                    self.tester.new_context(storage_state=self.storage_state)
+
+    def _run_steps(self, plan: TestPlan, variables: Dict[str, str]):
+        if plan.auth and self._restore_session(plan, variables):
+            return
+        
+        for step in plan.steps:
+            self._execute_step(step, variables)
+        
+        if plan.auth:
+            self.storage_state = self.auth_cache.save(
+                self.tester.page.context,
+                plan.base_url,
+                variables.get(plan.auth.get('user_variable', 'USERNAME'), '')
+            )
+
+    def _restore_session(self, plan: TestPlan, variables: Dict[str, str]) -> bool:
+        """
+        Start a fresh context from a cached login instead of replaying the login steps.
+        The test case's "auth" block names the variable holding the user and,
+        optionally, a selector that is only present when logged out.
+        Returns True if the cached session was accepted.
+        """
+        auth = plan.auth
+        base_url = plan.base_url
+        user = variables.get(auth.get('user_variable', 'USERNAME'), '')
+        
+        storage_state = self.auth_cache.get(base_url, user)
+        if not storage_state:
+            return False
+        
+        self.logger.info(f"Reusing cached session for {plan.name}")
+        page = self.tester.new_context(storage_state=storage_state)
+        page.goto(base_url)
+        page.wait_for_load_state('networkidle')
+        
+        logged_out_selector = auth.get('logged_out_selector')
+        if logged_out_selector and page.locator(logged_out_selector).count() > 0:
+            self.logger.info("Cached session was rejected, logging in again")
+            self.auth_cache.invalidate(base_url, user)
+            self.tester.new_context()
+            return False
+        
+        self.storage_state = storage_state
+        self.report.add_result(
+            plan.description,
+            "success",
+            "Restored cached session",
+            case_id=self._case_id
+        )
+        return True
+
+    def run_suite(self, test_cases: List[Union[str, Tuple[str, Dict[str, str]]]],
+                  workers: int = 4, variables: Dict[str, str] = None) -> List[Dict]:
+        """
+        Run independent test cases in parallel
+        Each worker thread drives its own browser context inside one shared
+        Chromium process. Contexts start from the last login's storage state,
+        including logins done by earlier test cases of the suite. Every test
+        case records into its own TestReport shard and the shards are merged
+        into self.report in input order.
+        Args:
+            test_cases: Test case paths, or (path, variables) tuples
+            workers: Number of test cases run at the same time
+            variables: Variables for test cases given without their own
+        Returns:
+            One result dict (test_case, status, error, duration) per test case, in input order
+        """
+        jobs = queue.Queue()
+        for index, entry in enumerate(test_cases):
+            path, case_variables = (entry, variables) if isinstance(entry, str) else entry
+            jobs.put((index, path, case_variables or {}))
+        
+        outcomes: List[Optional[Dict]] = [None] * len(test_cases)
+        shards: List[Optional[TestReport]] = [None] * len(test_cases)
+        
+        try:
+            with SharedBrowser(
+                headless=self.config.get("headless", False), endpoint=self.tester.browser_endpoint
+            ) as shared:
+                threads = [
+                    threading.Thread(
+                        target=self._suite_worker,
+                        args=(shared, jobs, outcomes, shards),
+                        name=f"suite-worker-{i}"
+                    )
+                    for i in range(max(1, min(workers, len(test_cases))))
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            merged = [shard for shard in shards if shard]
+            self.report.merge(merged)
+            for shard in merged:
+                shard.discard()
+            self.finish_report()
+        
+        for index, outcome in enumerate(outcomes):
+            if outcome is None:
+                entry = test_cases[index]
+                outcomes[index] = {
+                    "test_case": entry if isinstance(entry, str) else entry[0],
+                    "status": "failure",
+                    "error": "Test case was not run",
+                    "duration": 0.0
+                }
+        
+        failed = sum(1 for outcome in outcomes if outcome["status"] != "success")
+        self.logger.info(f"Suite finished: {len(outcomes) - failed} passed, {failed} failed")
+        return outcomes
+
+    def _suite_worker(self, shared: SharedBrowser, jobs: queue.Queue,
+                      outcomes: List[Optional[Dict]], shards: List[Optional[TestReport]]):
+        """Take test cases from the queue and run each in a fresh browser context"""
+        try:
+            playwright, browser = shared.connect()
+        except Exception as e:
+            self.logger.error(f"Suite worker could not connect to the shared browser: {e}")
+            return
+        
+        try:
+            tester = AIWebTester(
+                launch_browser=False, config=self.config,
+                blocker=self.tester.blocker.for_worker(), har=self.tester.har
+            )
+            while True:
+                try:
+                    index, path, case_variables = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                
+                tester.use_context(browser.new_context(storage_state=self.storage_state))
+                shard = TestReport(
+                    self.report.output_dir,
+                    name=f"{self.report.name}-shard-{index}",
+                    screenshots=self.report.screenshot_options
+                )
+                runner = TestRunner(config=self.config, tester=tester, report=shard, tracer=self.tracer)
+                runner.storage_state = self.storage_state
+                started = time.time()
+                try:
+                    runner._run_test_case(path, case_variables)
+                    status, error = "success", None
+                except Exception as e:
+                    status, error = "failure", str(e)
+                finally:
+                    # A login test case may have swapped in a context of its own
+                    tester.page.context.close()
+                # Test cases started from now on reuse a login done by this one
+                if runner.storage_state:
+                    self.storage_state = runner.storage_state
+                
+                shards[index] = shard
+                outcomes[index] = {
+                    "test_case": path,
+                    "status": status,
+                    "error": error,
+                    "duration": time.time() - started
+                }
+        finally:
+            SharedBrowser.disconnect(playwright, browser)
+
+    def finish_report(self):
+        """
+        Generate the report and write the timing data next to it:
+        timings.json (totals, counters, spans) and trace.json (Chrome trace events)
+        """
+        network = self.tester.blocker.stats()
+        if network["profile"]:
+            self.report.add_metrics("Network", network)
+        if self.tester.har.mode != "live":
+            self.report.add_metrics("HAR", self.tester.har.stats())
+        summary = self.tracer.summary()
+        self.report.add_metrics("Timing", dict(
+            summary["counters"],
+            step_seconds=round(sum(
+                span["total_ms"] for span in summary["spans"] if span["name"].startswith("step:")
+            ) / 1000, 3)
+        ))
+        self.report.generate_report()
+        self.tracer.export_json(os.path.join(self.report.output_dir, "timings.json"))
+        self.tracer.export_chrome_trace(os.path.join(self.report.output_dir, "trace.json"))
 
     def close(self):
         """Explicitly close the browser"""
@@ -109,116 +383,222 @@ class TestRunner:
             self.logger.error(f"Error saving URL to file: {e}")
             raise
 
-    def _execute_step(self, step: Dict, variables: Dict[str, str]):
-        """Execute a single test step"""
+    def _execute_step(self, step: Step, variables: Dict[str, str]):
+        """Execute a single compiled test step, retrying failures"""
         max_retries = 3
         retry_count = 0
+        handler = self._handlers[type(step)]
+        started = time.perf_counter()
         
-        while retry_count < max_retries:
-            try:
-                action = step['action']
-                description = step.get('description', action)
-                is_optional = step.get('optional', False)
-                
-                # Replace variables in values
-                if 'value' in step:
-                    step['value'] = self._replace_variables(step['value'], variables)
-                
-                if action == 'navigate':
-                    self.logger.debug(f"Navigating to: {step['url']}")
-                    self.tester.page.goto(step['url'])
-                    self.tester.page.wait_for_load_state('networkidle')
-                    self.tester.page.wait_for_load_state('domcontentloaded')
+        with self.tracer.span(step.id, "step", action=step.action):
+            while retry_count < max_retries:
+                try:
+                    url_before = self.tester.page.url
+                    handler(step, variables)
                     
-                elif action == 'click':
-                    if 'selector' in step:
-                        step['selector'] = self._replace_variables(step['selector'], variables)
-                    self.logger.debug(f"Clicking element: {step['selector']}")
-                    try:
-                        timeout = 5000 if is_optional else self.config.get('element_timeout', 30000)
-                        element = self.tester.page.wait_for_selector(
-                            step['selector'], 
-                            state='visible',
-                            timeout=timeout
-                        )
-                        if element:
-                            element.scroll_into_view_if_needed()
-                            self.tester.page.wait_for_timeout(500)
-                            element.click()
-                    except Exception as e:
-                        if not is_optional:
-                            raise
-                        self.logger.info(f"Skipping optional step {step['id']}: {e}")
-                
-                elif action == 'type':
-                    self.logger.debug(f"Typing into element: {step['selector']}")
-                    # Wait for element to be visible and ready
-                    element = self.tester.page.wait_for_selector(
-                        step['selector'], 
-                        state='visible',
-                        timeout=self.config.get('element_timeout', 30000)
+                    if step.wait_for:
+                        self._wait_for_signal(step, url_before)
+                    
+                    # If we get here, the step was successful
+                    attempts = f" after {retry_count + 1} attempts" if retry_count else ""
+                    duration = time.perf_counter() - started
+                    screenshot = None
+                    if self.config.get("screenshot_each_step", False):
+                        with self.tracer.span("screenshot"):
+                            screenshot = self.report.save_screenshot(self.tester.page, step.id)
+                    self.report.add_result(
+                        step.description,
+                        "success",
+                        f"Completed {step.action}{attempts}",
+                        screenshot,
+                        case_id=self._case_id,
+                        duration=duration
                     )
+                    return  # Exit the retry loop on success
+                    
+                except Exception as e:
+                    retry_count += 1
+                    self.logger.warning(f"Step {step.id} failed (attempt {retry_count}/{max_retries}): {e}")
                     
-                    if element:
-                        # Make sure element is in view
+                    if retry_count >= max_retries:
+                        if not step.optional:
+                            self.logger.error(f"Step {step.id} failed after {max_retries} attempts")
+                            raise
+                        else:
+                            self.logger.info(f"Skipping optional step {step.id} after {max_retries} attempts")
+                            self.tracer.count("optional_skips")
+                            return
+                    
+                    # Wait before retrying
+                    self.tracer.count("retries")
+                    with self.tracer.span("retry_backoff"):
+                        self._settle(2000)
+
+    def _navigate(self, step: NavigateStep, variables: Dict[str, str]):
+        url = step.url.render(variables)
+        self.logger.debug(f"Navigating to: {url}")
+        with self.tracer.span("goto", url=url):
+            self.tester.page.goto(url)
+        with self.tracer.span("network_idle"):
+            self.tester.page.wait_for_load_state('networkidle')
+        self.tester.page.wait_for_load_state('domcontentloaded')
+
+    def _click(self, step: ClickStep, variables: Dict[str, str]):
+        selector = step.selector.render(variables)
+        self.logger.debug(f"Clicking element: {selector}")
+        try:
+            with self.tracer.span("wait_for_selector", selector=selector):
+                element = self.tester.page.wait_for_selector(
+                    selector, 
+                    state='visible',
+                    timeout=step.element_timeout
+                )
+            if element:
+                try:
+                    with self.tracer.span("scroll", selector=selector):
                         element.scroll_into_view_if_needed()
-                        
-                        # Clear the field using keyboard shortcuts
-                        element.click()  # Focus the element
-                        self.tester.page.keyboard.press("Control+A")  # Select all text
-                        self.tester.page.keyboard.press("Backspace")  # Delete selected text
-                        
-                        # Type the value with a delay
-                        element.type(step['value'], delay=100)
-                        
-                        # Wait a bit after typing
-                        self.tester.page.wait_for_timeout(500)
-                
-                elif action == 'wait':
-                    wait_time = step.get('time', 1000)
-                    self.logger.debug(f"Waiting for {wait_time}ms")
-                    self.tester.page.wait_for_timeout(wait_time)
-                
-                elif action == 'get_url':
-                    current_url = self.tester.get_current_url()
-                    self.logger.debug(f"Captured URL: {current_url}")
-                    if 'save_to_file' in step:
-                        self.save_url_to_file(current_url, step['save_to_file'], variables)
+                        if not self.smart_waits:
+                            self.tester.page.wait_for_timeout(500)
+                    with self.tracer.span("click", selector=selector):
+                        element.click()
+                finally:
+                    _dispose(element)
+                if self.smart_waits:
+                    self._settle(0)
+        except Exception as e:
+            if not step.optional:
+                raise
+            self.logger.info(f"Skipping optional step {step.id}: {e}")
+            self.tracer.count("optional_skips")
+
+    def _type(self, step: TypeStep, variables: Dict[str, str]):
+        selector = step.selector.render(variables)
+        self.logger.debug(f"Typing into element: {selector}")
+        # Wait for element to be visible and ready
+        with self.tracer.span("wait_for_selector", selector=selector):
+            element = self.tester.page.wait_for_selector(
+                selector, 
+                state='visible',
+                timeout=step.element_timeout
+            )
+        
+        if element:
+            try:
+                # Make sure element is in view
+                with self.tracer.span("scroll", selector=selector):
+                    element.scroll_into_view_if_needed()
                 
-                # If we get here, the step was successful
-                self.report.add_result(
-                    description,
-                    "success",
-                    f"Completed {action}"
+                with self.tracer.span("enter_text", selector=selector, input=step.input):
+                    self._enter_text(element, step, step.value.render(variables))
+            finally:
+                # Handles pin the element in the driver until released
+                _dispose(element)
+            
+            # Wait a bit after typing
+            self._settle(500)
+
+    def _get_url(self, step: GetUrlStep, variables: Dict[str, str]):
+        current_url = self.tester.get_current_url()
+        self.logger.debug(f"Captured URL: {current_url}")
+        if step.save_to_file:
+            self.save_url_to_file(current_url, step.save_to_file, variables)
+
+    def _enter_text(self, element, step: TypeStep, value: str):
+        """
+        Replace the content of a field using the step's input strategy
+        (per step "input", falling back to the input_strategy config):
+        - "fill": set the value in one call, fires input events (fastest)
+        - "type": real key events per character, step.delay ms apart,
+          for fields that react to keystrokes
+        - "insert_text": one input event for the whole value plus a change event
+        """
+        page = self.tester.page
+        
+        if step.input == 'fill':
+            element.fill(value)
+            return
+        
+        # Clear the field using keyboard shortcuts
+        element.click()  # Focus the element
+        page.keyboard.press("Control+A")  # Select all text
+        page.keyboard.press("Backspace")  # Delete selected text
+        
+        if step.input == 'type':
+            # Type the value with a delay
+            element.type(value, delay=step.delay)
+        else:
+            page.keyboard.insert_text(value)
+            element.dispatch_event('change')
+
+    def _settle(self, fixed_ms: int):
+        """
+        Pause after an interaction.
+        Fixed mode sleeps fixed_ms; smart mode waits until the DOM stops
+        changing, bounded by settle_timeout.
+        """
+        with self.tracer.span("settle", smart=self.smart_waits):
+            if self.smart_waits:
+                wait_for_dom_settle(
+                    self.tester.page,
+                    self.config.get("dom_quiet_ms", 200),
+                    self.config.get("settle_timeout", 3000)
                 )
-                return  # Exit the retry loop on success
-                
-            except Exception as e:
-                retry_count += 1
-                self.logger.warning(f"Step {step['id']} failed (attempt {retry_count}/{max_retries}): {e}")
-                
-                if retry_count >= max_retries:
-                    if not step.get('optional', False):
-                        self.logger.error(f"Step {step['id']} failed after {max_retries} attempts")
-                        raise
-                    else:
-                        self.logger.info(f"Skipping optional step {step['id']} after {max_retries} attempts")
-                        return
-                
-                # Wait before retrying
-                self.tester.page.wait_for_timeout(2000)
+            else:
+                self.tester.page.wait_for_timeout(fixed_ms)
 
-    def _replace_variables(self, value: str, variables: Dict[str, str]) -> str:
-        """Replace variables in string with their values"""
-        if not isinstance(value, str):
-            return value
-            
-        for var_name, var_value in variables.items():
-            placeholder = f"${{{var_name}}}"
-            if placeholder in value:
-                value = value.replace(placeholder, var_value)
-        return value 
+    def _wait_step(self, step: WaitStep, variables: Dict[str, str]):
+        """
+        Run a "wait" step.
+        In smart mode a step with a selector waits for that selector, and with
+        convert_wait_steps a plain timed wait becomes a wait for network quiet
+        and a settled DOM that ends early, with "time" as the upper bound.
+        """
+        wait_time = step.time if step.time is not None else 1000
+        page = self.tester.page
+        if self.smart_waits and step.selector:
+            selector = step.selector.render(variables)
+            self.logger.debug(f"Waiting for selector: {selector}")
+            with self.tracer.span("wait_for_selector", selector=selector):
+                element = page.wait_for_selector(
+                    selector,
+                    state=step.state,
+                    timeout=step.time if step.time is not None else self.plan_options["element_timeout"]
+                )
+            if element:
+                _dispose(element)
+        elif self.smart_waits and self.config.get("convert_wait_steps", False):
+            self.logger.debug(f"Waiting for page to go quiet (up to {wait_time}ms)")
+            wait_for_page_quiet(page, wait_time, self.config.get("dom_quiet_ms", 200))
+        else:
+            self.logger.debug(f"Waiting for {wait_time}ms")
+            page.wait_for_timeout(wait_time)
+
+    def _wait_for_signal(self, step: Step, url_before: str):
+        """
+        Wait for the condition named in a step's "wait_for" key, e.g.
+        "url_change", "network_idle", "dom_settle", "page_quiet" or
+        {"selector": "...", "state": "visible"}, bounded by the step's
+        "timeout" or settle_timeout.
+        """
+        timeout = step.timeout if step.timeout is not None else self.config.get("settle_timeout", 3000)
+        with self.tracer.span("wait_for", condition=step.wait_for):
+            reached = wait_for_condition(
+                self.tester.page,
+                step.wait_for,
+                timeout,
+                self.config.get("dom_quiet_ms", 200),
+                old_url=url_before
+            )
+        if not reached:
+            self.logger.debug(f"Step {step.id}: {step.wait_for} not reached within {timeout}ms")
 
     def __del__(self):
         """Ensure browser is closed when TestRunner is destroyed"""
-        self.close() 
\ No newline at end of file
+        self.close() 
+
+def _dispose(element):
+    """Release an element handle, the page may already have navigated away"""
+    try:
+        element.dispose()
+    except Exception:
+        pass
@@ -0,0 +1,56 @@
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class StorageStateCache:
+    """
+    On-disk cache of Playwright storage states (cookies and local storage)
+    captured after a login, keyed by base URL and user.
+    Entries older than ttl seconds are treated as expired.
+    """
+
+    def __init__(self, cache_dir: str = ".auth", ttl: int = 3600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    def path_for(self, base_url: str, user: str) -> Path:
+        """Path of the cache entry for a base URL and user"""
+        key = hashlib.sha256(f"{base_url.rstrip('/')}|{user}".encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, base_url: str, user: str) -> Optional[str]:
+        """Return the path of a fresh storage state, or None if missing or expired"""
+        path = self.path_for(base_url, user)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if age > self.ttl:
+            logger.info(f"Cached session for {user or 'anonymous'} at {base_url} expired")
+            return None
+        return str(path)
+
+    def save(self, context, base_url: str, user: str) -> str:
+        """Capture the storage state of a browser context and store it"""
+        # Session cookies are credentials, keep them private to the current user
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(self.cache_dir, 0o700)
+        path = self.path_for(base_url, user)
+        tmp_path = path.with_suffix(".tmp")
+        context.storage_state(path=str(tmp_path))
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+        logger.info(f"Cached session for {user or 'anonymous'} at {base_url}")
+        return str(path)
+
+    def invalidate(self, base_url: str, user: str):
+        """Remove a cache entry, e.g. after the site rejected it"""
+        try:
+            self.path_for(base_url, user).unlink()
+        except FileNotFoundError:
+            pass
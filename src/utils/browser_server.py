@@ -0,0 +1,284 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Optional
+from .memory import process_tree_rss_mb
+from .shared_browser import find_free_port
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Relative browser_server_state paths are resolved against the project root, not the CWD,
+# so every run shares one server wherever it was started from
+DEFAULT_STATE_PATH = os.path.join(_PROJECT_ROOT, ".cache", "browser_server.json")
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        # Exited but not yet reaped by its parent
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+def _is_server_process(state: Dict) -> bool:
+    """Whether state["pid"] is still the browser the state was written for"""
+    if not _process_alive(state["pid"]):
+        return False
+    try:
+        with open(f"/proc/{state['pid']}/cmdline", "rb") as f:
+            return state["profile_dir"].encode() in f.read()
+    except OSError:
+        # No /proc to check against, trust the endpoint
+        return _endpoint_alive(state["endpoint"])
+
+def _chromium_executable() -> str:
+    """
+    Path of Playwright's Chromium, looked up in a child process: the sync API
+    cannot start while the calling thread already runs Playwright
+    """
+    code = (
+        "from playwright.sync_api import sync_playwright\n"
+        "with sync_playwright() as playwright:\n"
+        "    print(playwright.chromium.executable_path)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+def _endpoint_alive(endpoint: str, timeout: float = 1.0) -> bool:
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+class BrowserServer:
+    """
+    A Chromium process that outlives the Python process that started it, so
+    main.py runs, example scripts and pytest sessions connect to a warm browser
+    over CDP instead of launching one each time; every client works in fresh
+    browser contexts of its own and replaces them by its RecyclePolicy. The
+    pid, endpoint, use count and the leases of connected clients are kept in
+    a state file. acquire() starts the server when needed and takes a lease,
+    release() returns it. After max_uses connections or above max_memory_mb
+    the process is restarted, but only once no other client holds a lease,
+    so a recycle never ends a parallel run's browser mid-test.
+    """
+
+    def __init__(self, state_path: str = DEFAULT_STATE_PATH, headless: bool = True,
+                 max_uses: int = 200, max_memory_mb: Optional[float] = 2048,
+                 executable: Optional[str] = None):
+        """executable: Browser binary, Playwright's Chromium by default"""
+        self.state_path = state_path
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.executable = executable
+        # Lease held by this instance between acquire() and release()
+        self.lease: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "BrowserServer":
+        return cls(
+            os.path.join(_PROJECT_ROOT, config.get("browser_server_state", DEFAULT_STATE_PATH)),
+            config.get("headless", True),
+            config.get("browser_server_max_uses", 200),
+            config.get("browser_server_max_memory_mb", 2048),
+            config.get("browser_server_executable")
+        )
+
+    @contextmanager
+    def _locked(self):
+        """Serialize state changes between processes"""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(f"{self.state_path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Optional[Dict]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_state(self, state: Dict):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def acquire(self) -> str:
+        """
+        Endpoint of a running server, started as needed; counts one use and
+        takes a lease (one per instance) until release()
+        """
+        with self._locked():
+            state = self._running_state()
+            if state:
+                reason = state.get("recycle") or self._recycle_reason(state)
+                leases = {lease: pid for lease, pid in state["leases"].items() if lease != self.lease}
+                if reason and leases:
+                    if not state.get("recycle"):
+                        logger.info(f"Browser server due for recycling ({reason}), "
+                                    f"waiting for {len(leases)} connected clients")
+                    state["recycle"] = reason
+                elif reason:
+                    logger.info(f"Recycling browser server: {reason}")
+                    self._stop(state)
+                    state = None
+            if not state:
+                state = self._start()
+            self.lease = self.lease or uuid.uuid4().hex[:12]
+            state["leases"][self.lease] = os.getpid()
+            state["uses"] += 1
+            self._write_state(state)
+            return state["endpoint"]
+
+    def release(self):
+        """Return this instance's lease; a server due for recycling stops with its last client"""
+        if not self.lease:
+            return
+        with self._locked():
+            state = self._running_state()
+            if state:
+                state["leases"].pop(self.lease, None)
+                if state.get("recycle") and not state["leases"]:
+                    logger.info(f"Recycling browser server: {state['recycle']}")
+                    self._stop(state)
+                else:
+                    self._write_state(state)
+        self.lease = None
+
+    def _recycle_reason(self, state: Dict) -> Optional[str]:
+        if self.max_uses and state["uses"] >= self.max_uses:
+            return f"{state['uses']} uses"
+        if self.max_memory_mb:
+            rss = process_tree_rss_mb(state["pid"])
+            if rss and rss > self.max_memory_mb:
+                return f"{rss:.0f} MB resident"
+        return None
+
+    def start(self) -> Dict:
+        """Start the server unless one is running, returns its state"""
+        with self._locked():
+            state = self._running_state() or self._start()
+            self._write_state(state)
+            return state
+
+    def _start(self) -> Dict:
+        port = find_free_port()
+        executable = self.executable or _chromium_executable()
+        profile_dir = tempfile.mkdtemp(prefix="browser-server-")
+        args = [
+            executable,
+            f"--remote-debugging-port={port}",
+            "--remote-debugging-address=127.0.0.1",
+            f"--user-data-dir={profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "about:blank"
+        ]
+        if self.headless:
+            args.insert(1, "--headless=new")
+        # Own session, so the browser survives the launching process and its terminal
+        process = subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True
+        )
+        endpoint = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while not _endpoint_alive(endpoint):
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                raise RuntimeError(f"Browser server did not start on {endpoint}")
+            time.sleep(0.1)
+        logger.info(f"Browser server started on {endpoint} (pid {process.pid})")
+        return {
+            "pid": process.pid,
+            "endpoint": endpoint,
+            "profile_dir": profile_dir,
+            "headless": self.headless,
+            "started": time.time(),
+            "uses": 0,
+            # lease id -> pid of the client holding it
+            "leases": {},
+            # Why the server is restarted once its last client is gone
+            "recycle": None
+        }
+
+    def _running_state(self) -> Optional[Dict]:
+        """Saved state if that server still answers, a dead server's leftovers are cleaned up"""
+        state = self._read_state()
+        if not state:
+            return None
+        if _endpoint_alive(state["endpoint"]):
+            # Clients that exited without release() hold no lease
+            state["leases"] = {
+                lease: pid for lease, pid in state.get("leases", {}).items() if _process_alive(pid)
+            }
+            return state
+        self._stop(state)
+        return None
+
+    def stop(self) -> bool:
+        """Stop the server, True if one was running"""
+        with self._locked():
+            state = self._read_state()
+            if not state:
+                return False
+            self._stop(state)
+            return True
+
+    def _stop(self, state: Dict):
+        # The pid may have been reused since the server died, only signal our own browser
+        if _is_server_process(state):
+            self._terminate(state["pid"])
+        if state.get("profile_dir"):
+            shutil.rmtree(state["profile_dir"], ignore_errors=True)
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _terminate(pid: int):
+        try:
+            os.killpg(pid, signal.SIGTERM)
+            deadline = time.monotonic() + 10
+            while _process_alive(pid) and time.monotonic() < deadline:
+                # Reap it if this process happens to be the parent
+                try:
+                    os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    pass
+                time.sleep(0.1)
+        except ProcessLookupError:
+            pass
+
+    def status(self) -> Optional[Dict]:
+        """State of the running server plus its memory, None if none is running"""
+        with self._locked():
+            state = self._running_state()
+        if state:
+            state = dict(state, rss_mb=process_tree_rss_mb(state["pid"]), uptime=time.time() - state["started"])
+        return state
@@ -0,0 +1,98 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (model name, element type, normalized text)
+CacheKey = Tuple[str, str, str]
+
+class ClassificationCache:
+    """
+    Element classification decisions, kept in an in-memory LRU and
+    persisted to SQLite so later crawls and runs can reuse them.
+    """
+
+    def __init__(self, db_path: str = os.path.join('.cache', 'classifications.db'),
+                 max_entries: int = 10000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[CacheKey, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classifications (
+                model TEXT NOT NULL,
+                element_type TEXT NOT NULL,
+                text TEXT NOT NULL,
+                decision INTEGER NOT NULL,
+                PRIMARY KEY (model, element_type, text)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace and case so cosmetic differences share an entry"""
+        return " ".join((text or "").split()).lower()[:512]
+
+    def key(self, model: str, element_type: str, text: str) -> CacheKey:
+        return (model, (element_type or "").lower(), self.normalize(text))
+
+    def get_many(self, keys: List[CacheKey]) -> List[Optional[bool]]:
+        """Look keys up in memory, then on disk. None marks a miss."""
+        with self._lock:
+            found: List[Optional[bool]] = [self._memory.get(key) for key in keys]
+            for key, decision in zip(keys, found):
+                if decision is not None:
+                    self._memory.move_to_end(key)
+
+            missing = [i for i, decision in enumerate(found) if decision is None]
+            for i in missing:
+                row = self._conn.execute(
+                    "SELECT decision FROM classifications "
+                    "WHERE model = ? AND element_type = ? AND text = ?",
+                    keys[i]
+                ).fetchone()
+                if row is not None:
+                    found[i] = bool(row[0])
+                    self._remember(keys[i], found[i])
+
+            misses = sum(1 for decision in found if decision is None)
+            self.misses += misses
+            self.hits += len(keys) - misses
+            return found
+
+    def put_many(self, entries: Dict[CacheKey, bool]):
+        """Store decisions in memory and on disk"""
+        if not entries:
+            return
+        with self._lock:
+            for key, decision in entries.items():
+                self._remember(key, decision)
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO classifications "
+                    "(model, element_type, text, decision) VALUES (?, ?, ?, ?)",
+                    [key + (int(decision),) for key, decision in entries.items()]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing classification cache: {e}")
+
+    def _remember(self, key: CacheKey, decision: bool):
+        self._memory[key] = decision
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -6,9 +6,46 @@ from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+def _parse_list(value: str) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+# Defaults used when neither the config file nor the environment sets a key
+DEFAULTS: Dict[str, Any] = {
+    "headless": False,
+    "screenshot_on_error": False,
+    "wait_time": 2,
+    "max_depth": 3,
+    "allowed_domains": [],
+    "exclude_paths": [],
+    "ai_model": "distilbert-base-uncased-finetuned-sst-2-english",
+    "element_timeout": 30000,
+    "navigation_timeout": 30000
+}
+
+# Config key -> (environment variable, parser)
+ENV_VARIABLES = {
+    "headless": ("TEST_HEADLESS", _parse_bool),
+    "screenshot_on_error": ("TEST_SCREENSHOT_ON_ERROR", _parse_bool),
+    "wait_time": ("TEST_WAIT_TIME", int),
+    "max_depth": ("TEST_MAX_DEPTH", int),
+    "allowed_domains": ("TEST_ALLOWED_DOMAINS", _parse_list),
+    "exclude_paths": ("TEST_EXCLUDE_PATHS", _parse_list),
+    "ai_model": ("TEST_AI_MODEL", str),
+    "element_timeout": ("TEST_ELEMENT_TIMEOUT", int),
+    "navigation_timeout": ("TEST_NAVIGATION_TIMEOUT", int),
+    "browser_endpoint": ("E2E_BROWSER_ENDPOINT", str)
+}
+
 def load_config(config_path: str = "config/config.json") -> Dict[str, Any]:
-    """Load configuration from config file and environment variables"""
-    config = _load_config_file(config_path)
+    """
+    Load configuration from defaults, the config file and environment variables.
+    Environment variables only override the file when they are set.
+    """
+    config = dict(DEFAULTS)
+    config.update(_load_config_file(config_path))
     config.update(_load_env_variables())
     return config
 
@@ -22,20 +59,15 @@ def _load_config_file(config_path: str) -> Dict[str, Any]:
         return {}
 
 def _load_env_variables() -> Dict[str, Any]:
-    """Load configuration from environment variables"""
+    """Load configuration from environment variables that are set"""
     load_dotenv()
     
-    return {
-        "headless": os.getenv("TEST_HEADLESS", "").lower() == "true",
-        "screenshot_on_error": os.getenv("TEST_SCREENSHOT_ON_ERROR", "").lower() == "true",
-        "wait_time": int(os.getenv("TEST_WAIT_TIME", "2")),
-        "max_depth": int(os.getenv("TEST_MAX_DEPTH", "3")),
-        "allowed_domains": os.getenv("TEST_ALLOWED_DOMAINS", "").split(","),
-        "exclude_paths": os.getenv("TEST_EXCLUDE_PATHS", "").split(","),
-        "ai_model": os.getenv("TEST_AI_MODEL", "facebook/bart-large-mnli"),
-        "element_timeout": int(os.getenv("TEST_ELEMENT_TIMEOUT", "30000")),
-        "navigation_timeout": int(os.getenv("TEST_NAVIGATION_TIMEOUT", "30000"))
-    }
+    values = {}
+    for key, (name, parse) in ENV_VARIABLES.items():
+        raw = os.getenv(name)
+        if raw:
+            values[key] = parse(raw)
+    return values
 
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate configuration values"""
@@ -3,6 +3,48 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Elements considered for interaction while exploring a page
+INTERACTIVE_SELECTOR = 'button, a, input, select'
+
+# Attribute stamped on every snapshotted element so it can be located again
+SNAPSHOT_ATTRIBUTE = 'data-e2e-idx'
+
+_SNAPSHOT_SCRIPT = """([selector, attr, includeAttributes]) => {
+    // Unique per snapshot so selectors from an older snapshot never match
+    const token = Date.now().toString(36) + Math.random().toString(36).slice(2, 6);
+    const isVisible = el => {
+        const style = window.getComputedStyle(el);
+        return style.display !== 'none' &&
+               style.visibility !== 'hidden' &&
+               style.opacity !== '0';
+    };
+    return Array.from(document.querySelectorAll(selector)).map((el, index) => {
+        el.setAttribute(attr, `${token}-${index}`);
+        const item = {
+            index: index,
+            selector: `[${attr}="${token}-${index}"]`,
+            tag: el.tagName.toLowerCase(),
+            text: el.innerText || '',
+            href: el.href || null,
+            type: el.type || null,
+            role: el.getAttribute('role'),
+            disabled: !!el.disabled,
+            visible: isVisible(el)
+        };
+        if (includeAttributes) {
+            const attrs = {};
+            for (const a of el.attributes) {
+                if (a.name !== attr) attrs[a.name] = a.value;
+            }
+            item.id = el.id;
+            item.className = el.className;
+            item.value = el.value;
+            item.attributes = attrs;
+        }
+        return item;
+    });
+}"""
+
 def get_element_attributes(element) -> Dict:
     """Extract all relevant attributes from a page element"""
     try:
@@ -38,6 +80,59 @@ def is_element_visible(element) -> bool:
         logger.error(f"Error checking element visibility: {e}")
         return False
 
+def snapshot_elements(page, selector: str = INTERACTIVE_SELECTOR,
+                      include_attributes: bool = False) -> List[Dict]:
+    """
+    Capture every element matching selector in a single page.evaluate call.
+    Each item carries tag, text, href, type, role, disabled and visibility,
+    plus a stable selector that can be passed to locate_snapshot_item.
+    """
+    try:
+        return page.evaluate(
+            _SNAPSHOT_SCRIPT, [selector, SNAPSHOT_ATTRIBUTE, include_attributes]
+        )
+    except Exception as e:
+        logger.error(f"Error taking element snapshot: {e}")
+        return []
+
+async def snapshot_elements_async(page, selector: str = INTERACTIVE_SELECTOR,
+                                  include_attributes: bool = False) -> List[Dict]:
+    """snapshot_elements for pages from the asyncio Playwright API"""
+    try:
+        return await page.evaluate(
+            _SNAPSHOT_SCRIPT, [selector, SNAPSHOT_ATTRIBUTE, include_attributes]
+        )
+    except Exception as e:
+        logger.error(f"Error taking element snapshot: {e}")
+        return []
+
+def locate_snapshot_item(page, item: Dict):
+    """
+    Return a Playwright locator for an item produced by snapshot_elements.
+    The locator matches nothing once the page has navigated or re-rendered.
+    """
+    return page.locator(item["selector"])
+
+def get_elements_attributes(page, selector: str = INTERACTIVE_SELECTOR) -> List[Dict]:
+    """Batched get_element_attributes for every element matching selector"""
+    return [
+        {
+            "tagName": item["tag"],
+            "id": item["id"],
+            "className": item["className"],
+            "type": item["type"],
+            "value": item["value"],
+            "innerText": item["text"],
+            "attributes": item["attributes"],
+            "selector": item["selector"]
+        }
+        for item in snapshot_elements(page, selector, include_attributes=True)
+    ]
+
+def are_elements_visible(page, selector: str = INTERACTIVE_SELECTOR) -> List[bool]:
+    """Batched is_element_visible for every element matching selector"""
+    return [item["visible"] for item in snapshot_elements(page, selector)]
+
 def get_form_inputs(form_element) -> List[Dict]:
     """Get all input elements from a form with their properties"""
     try:
@@ -0,0 +1,220 @@
+import glob
+import logging
+import math
+import os
+import re
+import threading
+from typing import Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Phone numbers (AAA) PPP-LLLL with area and prefix in 200-999 and line in 1000-9999
+PHONE_AREAS, PHONE_PREFIXES, PHONE_LINES = 800, 800, 9000
+PHONE_SPACE = PHONE_AREAS * PHONE_PREFIXES * PHONE_LINES
+# Multiplier coprime to PHONE_SPACE (= 2^13 * 3^2 * 5^7), which makes the
+# sequence -> phone mapping a bijection that scatters neighbouring sequences
+_PHONE_MULTIPLIER = 1_000_000_007
+_PHONE_OFFSET = 1_234_567_891
+
+UNIQUE_EMAIL_DOMAIN = "example.com"
+
+def to_base36(number: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    token = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        token = digits[remainder] + token
+        if not number:
+            return token
+
+def phone_parts(sequences: np.ndarray):
+    """Map sequence numbers to (area code, prefix, line) arrays, one phone per sequence"""
+    x = (sequences.astype(np.int64) * _PHONE_MULTIPLIER + _PHONE_OFFSET) % PHONE_SPACE
+    return (
+        200 + x // (PHONE_PREFIXES * PHONE_LINES),
+        200 + (x // PHONE_LINES) % PHONE_PREFIXES,
+        1000 + x % PHONE_LINES,
+    )
+
+def _splitmix64(keys: np.ndarray) -> np.ndarray:
+    z = keys.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over integer keys, vectorized with NumPy.
+    Filters of the same size can be merged with a bitwise OR.
+    """
+
+    def __init__(self, bits: int, hashes: int):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = np.zeros((bits + 7) // 8, dtype=np.uint8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        return cls(bits, max(1, round(bits / capacity * math.log(2))))
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        """Bit positions, one row per key (double hashing)"""
+        with np.errstate(over="ignore"):
+            h1 = _splitmix64(keys)
+            h2 = _splitmix64(h1) | np.uint64(1)
+            rounds = np.arange(self.hashes, dtype=np.uint64)
+            return (h1[:, None] + rounds[None, :] * h2[:, None]) % np.uint64(self.bits)
+
+    def add(self, keys: np.ndarray):
+        positions = self._positions(keys).ravel()
+        # Keys sharing a byte must not overwrite each other's bits, set one bit offset at a time
+        for bit in range(8):
+            selected = positions[(positions & np.uint64(7)) == bit] >> np.uint64(3)
+            self.array[selected] |= np.uint8(1 << bit)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """Boolean array, True where a key may have been added"""
+        positions = self._positions(keys)
+        bytes_ = self.array[positions >> np.uint64(3)]
+        return np.all(bytes_ & (1 << (positions & np.uint64(7))).astype(np.uint8), axis=1)
+
+    def merge(self, other: "BloomFilter"):
+        self.array |= other.array
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, array=self.array, bits=self.bits, hashes=self.hashes)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with np.load(path) as data:
+            bloom = cls(int(data["bits"]), int(data["hashes"]))
+            bloom.array = data["array"].copy()
+        return bloom
+
+class SequenceAllocator:
+    """
+    Hands out sequence numbers local * partitions + worker_id, so workers with
+    different ids never overlap and need no shared lock. Each worker keeps its
+    counter in its own file and reserves blocks ahead, so a crash only skips
+    numbers, it never reuses them.
+    """
+
+    def __init__(self, path: str, worker_id: int, partitions: int, block_size: int = 1000):
+        if not 0 <= worker_id < partitions:
+            raise ValueError(f"worker_id must be in 0..{partitions - 1}")
+        self.path = path
+        self.worker_id = worker_id
+        self.partitions = partitions
+        self.block_size = block_size
+        self.next = self._read()
+        self.limit = self.next
+
+    def _read(self) -> int:
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write(self, value: int):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(value))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def take(self, n: int) -> np.ndarray:
+        """Reserve n sequence numbers, persisting the reservation first"""
+        if self.next + n > self.limit:
+            self.limit = self.next + max(n, self.block_size)
+            self._write(self.limit)
+        local = np.arange(self.next, self.next + n, dtype=np.int64)
+        self.next += n
+        return local * self.partitions + self.worker_id
+
+class IdentityRegistry:
+    """
+    Issues lead identities (email token and phone) that never repeat, within
+    a run or across runs and parallel workers.
+
+    Every identity comes from a sequence number: the email carries it in base36
+    and the phone is a bijective scramble of it, so distinct sequences give
+    distinct emails and phones. Workers must use distinct worker_id values
+    (e.g. the worker index) and the same partitions. Issued sequences are also
+    recorded in a per-worker bloom filter of fixed size; the union of all
+    workers' filters is checked before issuing, which guards against counter
+    files being reset or partitions changing. State lives in state_dir,
+    by default config/data/identities next to locations.db.
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, worker_id: int = 0, partitions: int = 64,
+                 capacity: int = 5_000_000, error_rate: float = 0.001, block_size: int = 1000):
+        self.state_dir = state_dir or os.path.join('config', 'data', 'identities')
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self.allocator = SequenceAllocator(
+            os.path.join(self.state_dir, f"worker-{worker_id}.seq"), worker_id, partitions, block_size
+        )
+        self.bloom_path = os.path.join(self.state_dir, f"worker-{worker_id}.bloom")
+
+        self.issued = BloomFilter.for_capacity(capacity, error_rate)
+        self.seen = BloomFilter(self.issued.bits, self.issued.hashes)
+        for path in glob.glob(os.path.join(self.state_dir, "worker-*.bloom")):
+            try:
+                other = BloomFilter.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable identity filter {path}: {e}")
+                continue
+            if (other.bits, other.hashes) != (self.issued.bits, self.issued.hashes):
+                logger.warning(f"Ignoring identity filter {path} with a different size")
+                continue
+            self.seen.merge(other)
+            if path == self.bloom_path:
+                self.issued.merge(other)
+
+    def allocate(self, n: int) -> np.ndarray:
+        """n fresh sequence numbers, never issued before by any worker"""
+        with self._lock:
+            reserved = self.allocator.limit
+            fresh = []
+            remaining = n
+            chunk = n
+            while remaining:
+                sequences = self.allocator.take(chunk)
+                if sequences[-1] >= PHONE_SPACE:
+                    raise RuntimeError("Identity space exhausted for this worker")
+                sequences = sequences[~self.seen.contains(sequences)][:remaining]
+                fresh.append(sequences)
+                remaining -= len(sequences)
+                # Skipping already issued numbers (e.g. after a lost counter file), go faster
+                chunk = max(remaining, self.allocator.block_size * 10)
+            sequences = np.concatenate(fresh) if fresh else np.empty(0, dtype=np.int64)
+            self.issued.add(sequences)
+            self.seen.add(sequences)
+            # Persist the filter along with each counter block, not on every call
+            if self.allocator.limit != reserved:
+                self.issued.save(self.bloom_path)
+            return sequences
+
+    def save(self):
+        with self._lock:
+            self.issued.save(self.bloom_path)
+
+    def email(self, sequence: int, first_name: str, last_name: str) -> str:
+        return f"{email_part(first_name)}.{email_part(last_name)}.{to_base36(int(sequence))}@{UNIQUE_EMAIL_DOMAIN}"
+
+    @staticmethod
+    def phone(sequence: int) -> str:
+        area, prefix, line = (int(part[0]) for part in phone_parts(np.array([sequence])))
+        return f"({area}) {prefix}-{line}"
+
+def email_part(name: str) -> str:
+    """Lowercase letters of a name, for the local part of an email address"""
+    return re.sub(r"[^a-z]", "", name.lower()) or "lead"
@@ -1,12 +1,217 @@
 from faker import Faker
+import bisect
+import csv
+import itertools
 import sqlite3
 import os
 import random
+import sys
+import threading
+from array import array
+from json.encoder import encode_basestring
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+from .identity import UNIQUE_EMAIL_DOMAIN, IdentityRegistry, email_part, phone_parts, to_base36
+
+LEAD_FIELDS = ("FIRST_NAME", "LAST_NAME", "EMAIL", "PHONE", "STREET", "CITY", "STATE", "ZIP")
+
+class LocationTable:
+    """
+    All locations held in memory as parallel column lists, so a random pick is
+    a single randrange instead of an ORDER BY RANDOM() scan of the table.
+    Row indices are also bucketed by state for weighted sampling.
+    """
+
+    def __init__(self, rows):
+        self.cities = []
+        self.states = []
+        self.zip_codes = []
+        self.by_state: Dict[str, array] = {}
+        for index, (city, state, zip_code) in enumerate(rows):
+            # Few distinct cities and states, share one string object each
+            self.cities.append(sys.intern(city))
+            self.states.append(sys.intern(state))
+            self.zip_codes.append(zip_code)
+            self.by_state.setdefault(state, array("I")).append(index)
+        self._weights_cache: Dict[Tuple, Tuple[list, list]] = {}
+
+    @classmethod
+    def from_db(cls, db_path: str) -> "LocationTable":
+        """
+        Read all locations. Databases built by setup_location_db.py are read in
+        row_num order, so table indices equal the stored dense row numbers;
+        older databases without the column are read in id order.
+        """
+        with sqlite3.connect(db_path) as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(locations)")}
+            order = "row_num" if "row_num" in columns else "id"
+            rows = conn.execute(
+                f"SELECT city, state, zip_code FROM locations ORDER BY {order}"
+            ).fetchall()
+        if not rows:
+            raise ValueError(f"No locations in {db_path}")
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.zip_codes)
+
+    def row(self, index: int) -> Tuple[str, str, str]:
+        return self.cities[index], self.states[index], self.zip_codes[index]
+
+    def random_index(self, rng=random, state_weights: Optional[Dict[str, float]] = None) -> int:
+        """
+        Pick a row uniformly, or first a state by state_weights and then a row
+        within it. States missing from state_weights are never picked.
+        """
+        if not state_weights:
+            return rng.randrange(len(self.zip_codes))
+        states, cumulative = self._cumulative(state_weights)
+        state = states[bisect.bisect_right(cumulative, rng.random() * cumulative[-1])]
+        bucket = self.by_state[state]
+        return bucket[rng.randrange(len(bucket))]
+
+    def random_indices(self, rng: np.random.Generator, n: int,
+                       state_weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Vectorized random_index: n row indices drawn with a NumPy generator"""
+        if not state_weights:
+            return rng.integers(0, len(self.zip_codes), n)
+        states, cumulative = self._cumulative(state_weights)
+        cumulative = np.asarray(cumulative, dtype=np.float64)
+        picks = np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side="right")
+        indices = np.empty(n, dtype=np.int64)
+        for k, state in enumerate(states):
+            mask = picks == k
+            bucket = np.frombuffer(self.by_state[state], dtype=np.uint32)
+            indices[mask] = bucket[rng.integers(0, len(bucket), int(mask.sum()))]
+        return indices
+
+    def _cumulative(self, state_weights: Dict[str, float]) -> Tuple[list, list]:
+        """Cumulative weights of the weighted states present in the table, built once"""
+        key = tuple(sorted(state_weights.items()))
+        cached = self._weights_cache.get(key)
+        if cached is None:
+            states = [s for s, w in key if w > 0 and s in self.by_state]
+            if not states:
+                raise ValueError("state_weights matches no state in the location table")
+            cumulative = list(itertools.accumulate(state_weights[s] for s in states))
+            cached = self._weights_cache[key] = (states, cumulative)
+        return cached
+
+# (db path, file mtime) -> table, so each process reads the database once
+_TABLES: Dict[Tuple[str, float], LocationTable] = {}
+_TABLES_LOCK = threading.Lock()
+
+def load_location_table(db_path: str) -> LocationTable:
+    """Load the location table once per database file, reloading if it changed"""
+    key = (os.path.abspath(db_path), os.path.getmtime(db_path))
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is None:
+            table = _TABLES[key] = LocationTable.from_db(db_path)
+        return table
+
+class LeadBatch:
+    """
+    Columnar batch of leads: one small NumPy index array per field pointing into
+    shared value pools, so a million leads take tens of megabytes. Rows are only
+    turned into strings while iterating or writing.
+    """
+
+    def __init__(self, seed: int, pools: Dict[str, Tuple[str, ...]],
+                 columns: Dict[str, np.ndarray], locations: LocationTable):
+        self.seed = seed
+        self.pools = pools
+        self.columns = columns
+        self.locations = locations
+
+    def __len__(self):
+        return len(self.columns["location"])
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for row in self.iter_tuples():
+            yield dict(zip(LEAD_FIELDS, row))
+
+    def iter_tuples(self, chunk_size: int = 65536) -> Iterator[Tuple[str, ...]]:
+        """Rows as tuples in LEAD_FIELDS order"""
+        for columns in self.iter_columns(chunk_size):
+            yield from zip(*columns)
+
+    def iter_columns(self, chunk_size: int = 65536) -> Iterator[Tuple[list, ...]]:
+        """
+        Format the batch chunk by chunk, one list of strings per field in
+        LEAD_FIELDS order. Works column at a time with map() over pool lookups,
+        which is several times faster than formatting row by row.
+        """
+        pools, c = self.pools, self.columns
+        cities, states, zip_codes = self.locations.cities, self.locations.states, self.locations.zip_codes
+
+        for start in range(0, len(self), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            first = c["first_name"][chunk].tolist()
+            last = c["last_name"][chunk].tolist()
+            location = c["location"][chunk].tolist()
+            if "sequence" in c:
+                # Unique identities: "<first>.<last>.<base36 sequence>@domain"
+                email_suffixes = [f".{to_base36(seq)}@{UNIQUE_EMAIL_DOMAIN}" for seq in c["sequence"][chunk].tolist()]
+            else:
+                email_suffixes = list(map(pools["email_suffix"].__getitem__, c["email_suffix"][chunk].tolist()))
+            yield (
+                list(map(pools["first_name"].__getitem__, first)),
+                list(map(pools["last_name"].__getitem__, last)),
+                list(map(
+                    "{}.{}{}".format,
+                    map(pools["email_first"].__getitem__, first),
+                    map(pools["email_last"].__getitem__, last),
+                    email_suffixes
+                )),
+                list(map(
+                    "({}) {}-{}".format,
+                    c["area_code"][chunk].tolist(),
+                    c["prefix"][chunk].tolist(),
+                    c["line"][chunk].tolist()
+                )),
+                list(map(
+                    "{} {}".format,
+                    c["building_number"][chunk].tolist(),
+                    map(pools["street_name"].__getitem__, c["street_name"][chunk].tolist())
+                )),
+                list(map(cities.__getitem__, location)),
+                list(map(states.__getitem__, location)),
+                list(map(zip_codes.__getitem__, location)),
+            )
+
+    def to_csv(self, path: str):
+        """Write the batch as CSV with a LEAD_FIELDS header row"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(LEAD_FIELDS)
+            for columns in self.iter_columns():
+                writer.writerows(zip(*columns))
+
+    def to_jsonl(self, path: str):
+        """Write the batch as one JSON object per line"""
+        line = "{{" + ", ".join(f'"{field}": {{}}' for field in LEAD_FIELDS) + "}}\n"
+        with open(path, "w") as f:
+            for columns in self.iter_columns():
+                quoted = [map(encode_basestring, column) for column in columns]
+                f.writelines(map(line.format, *quoted))
 
 class LeadDataGenerator:
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None,
+                 state_weights: Optional[Dict[str, float]] = None,
+                 identities: Optional[IdentityRegistry] = None):
+        """
+        Args:
+            db_path: Location database, defaults to config/data/locations.db
+            state_weights: Optional relative weight per state code, e.g.
+                {"CA": 3, "NY": 2, "TX": 1}; only these states are generated
+            identities: Registry issuing emails and phones that never repeat,
+                use one per parallel worker with distinct worker ids
+        """
         self.fake = Faker('en_US')
-        self.db_path = os.path.join('config', 'data', 'locations.db')
+        self.db_path = db_path or os.path.join('config', 'data', 'locations.db')
+        self.state_weights = state_weights
+        self.identities = identities
         
         # Verify database exists
         if not os.path.exists(self.db_path):
@@ -14,17 +219,10 @@ class LeadDataGenerator:
                 f"Database not found at {self.db_path}. "
                 "Please run scripts/setup_location_db.py first."
             )
+        self.locations = load_location_table(self.db_path)
     
     def _get_random_location(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT city, state, zip_code 
-                FROM locations 
-                ORDER BY RANDOM() 
-                LIMIT 1
-            """)
-            return cursor.fetchone()
+        return self.locations.row(self.locations.random_index(random, self.state_weights))
     
     def generate_lead_data(self):
         """Generate a complete set of lead data."""
@@ -36,17 +234,77 @@ class LeadDataGenerator:
         street_name = self.fake.street_name()
         street = f"{street_number} {street_name}"
     
+        first_name = self.fake.first_name()
+        last_name = self.fake.last_name()
+        if self.identities:
+            sequence = int(self.identities.allocate(1)[0])
+            email = self.identities.email(sequence, first_name, last_name)
+            phone = self.identities.phone(sequence)
+        else:
+            email = self.fake.email()
+            phone = self.generate_phone()
+    
         return {
-            "FIRST_NAME": self.fake.first_name(),
-            "LAST_NAME": self.fake.last_name(),
-            "EMAIL": self.fake.email(),
-            "PHONE": self.generate_phone(),
-            "STREET": f"{self.fake.building_number()} {self.fake.street_name()}",
+            "FIRST_NAME": first_name,
+            "LAST_NAME": last_name,
+            "EMAIL": email,
+            "PHONE": phone,
+            "STREET": street,
             "CITY": city,
             "STATE": state,
             "ZIP": zip_code
     }
 
+    def generate_batch(self, n: int, seed: Optional[int] = None, pool_size: int = 1000) -> LeadBatch:
+        """
+        Generate n leads at once as a columnar LeadBatch.
+        The same n and seed always yield the same leads; without a seed one is drawn
+        and kept on batch.seed so a failing run can be reproduced.
+        Names and street names come from pools of pool_size Faker values.
+        With identities set, emails and phones are freshly issued on every call.
+        """
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        fake = Faker('en_US')
+        fake.seed_instance(seed)
+        rng = np.random.default_rng(seed)
+
+        first_names = tuple(fake.first_name() for _ in range(pool_size))
+        last_names = tuple(fake.last_name() for _ in range(pool_size))
+        pools = {
+            "first_name": first_names,
+            "last_name": last_names,
+            "email_first": tuple(email_part(name) for name in first_names),
+            "email_last": tuple(email_part(name) for name in last_names),
+            "street_name": tuple(fake.street_name() for _ in range(pool_size)),
+            # "<number>@<domain>", e.g. "564@example.org"
+            "email_suffix": tuple(
+                f"{number}@{domain}"
+                for domain in sorted({fake.safe_domain_name() for _ in range(20)})
+                for number in range(1, 1000)
+            ),
+        }
+        index_type = np.uint16 if pool_size <= 65536 else np.uint32
+        columns = {
+            "first_name": rng.integers(0, pool_size, n, dtype=index_type),
+            "last_name": rng.integers(0, pool_size, n, dtype=index_type),
+            "email_suffix": rng.integers(0, len(pools["email_suffix"]), n, dtype=np.uint16),
+            # Same ranges as generate_phone
+            "area_code": rng.integers(200, 1000, n, dtype=np.uint16),
+            "prefix": rng.integers(200, 1000, n, dtype=np.uint16),
+            "line": rng.integers(1000, 10000, n, dtype=np.uint16),
+            "building_number": rng.integers(1, 10000, n, dtype=np.uint16),
+            "street_name": rng.integers(0, pool_size, n, dtype=index_type),
+            "location": self.locations.random_indices(rng, n, self.state_weights).astype(np.uint32),
+        }
+        if self.identities:
+            sequences = self.identities.allocate(n)
+            columns["sequence"] = sequences
+            for name, part in zip(("area_code", "prefix", "line"), phone_parts(sequences)):
+                columns[name] = part.astype(np.uint16)
+            del columns["email_suffix"]
+        return LeadBatch(seed, pools, columns, self.locations)
+
     def generate_phone(self):
         """Generate a US phone number in the format (XXX) XXX-XXXX."""
         area_code = random.randint(200, 999)  # Valid area codes
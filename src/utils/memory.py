@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Chrome Performance.getMetrics names -> sample keys
+_BROWSER_METRICS = {
+    "JSHeapUsedSize": "js_heap_used_mb",
+    "JSHeapTotalSize": "js_heap_total_mb",
+    "Nodes": "dom_nodes",
+    "Documents": "documents",
+    "JSEventListeners": "event_listeners",
+}
+_BYTE_METRICS = {"JSHeapUsedSize", "JSHeapTotalSize"}
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of one process (Linux), None if it is gone"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return 0.0
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process and all its descendants, None where /proc is unavailable"""
+    parents: Dict[int, int] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, fields after it are fixed
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    if pid not in parents:
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, ()))
+    return sum(filter(None, (process_rss_mb(member) for member in tree)))
+
+class RecyclePolicy:
+    """
+    When to replace a page and its browser context during a long crawl: every
+    `every` navigations, or when the page's JS heap passes memory_mb. Memory is
+    sampled every sample_every navigations. 0 or None disables a limit.
+    """
+
+    def __init__(self, every: int = 200, memory_mb: Optional[float] = 512, sample_every: int = 10):
+        self.every = every
+        self.memory_mb = memory_mb
+        self.sample_every = sample_every
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RecyclePolicy":
+        return cls(
+            config.get("recycle_every", 200),
+            config.get("recycle_memory_mb", 512),
+            config.get("memory_sample_every", 10)
+        )
+
+    def wants_sample(self, navigations: int) -> bool:
+        return bool(self.sample_every) and navigations % self.sample_every == 0
+
+    def due(self, navigations: int, sample: Optional[Dict] = None) -> bool:
+        """navigations: since the page was created; sample: taken after the last one, if any"""
+        if self.every and navigations >= self.every:
+            return True
+        heap = (sample or {}).get("js_heap_used_mb")
+        return bool(self.memory_mb and heap and heap > self.memory_mb)
+
+class MemoryMonitor:
+    """
+    Samples memory over time: this process's RSS, the RSS of its process tree
+    (which includes a browser it launched) and, given a page, the browser's own
+    counters from CDP Performance.getMetrics (JS heap, DOM nodes, documents,
+    listeners). The last max_samples samples are kept, peaks are kept for all.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.samples = deque(maxlen=max_samples)
+        self.peaks: Dict[str, float] = {}
+        self.counts = {"samples": 0, "recycles": 0}
+        self._started = time.monotonic()
+        # page -> CDP session, dropped with the page
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _process_sample(self, label: str) -> Dict:
+        pid = os.getpid()
+        return {
+            "time": round(time.monotonic() - self._started, 3),
+            "label": label,
+            "python_rss_mb": process_rss_mb(pid),
+            "process_tree_rss_mb": process_tree_rss_mb(pid),
+        }
+
+    def sample(self, page=None, label: str = "") -> Dict:
+        """Record one sample, with browser metrics when a page is given"""
+        sample = self._process_sample(label)
+        if page is not None:
+            try:
+                session = self._sessions.get(page)
+                if session is None:
+                    session = page.context.new_cdp_session(page)
+                    session.send("Performance.enable")
+                    self._sessions[page] = session
+                sample.update(_browser_metrics(session.send("Performance.getMetrics")))
+            except Exception as e:
+                # Not Chromium, or the page is closing
+                logger.debug(f"Browser metrics unavailable: {e}")
+        return self._record(sample)
+
+    async def sample_async(self, page=None, label: str = "") -> Dict:
+        """sample() for pages from the asyncio Playwright API"""
+        sample = self._process_sample(label)
+        if page is not None:
+            try:
+                session = self._sessions.get(page)
+                if session is None:
+                    session = await page.context.new_cdp_session(page)
+                    await session.send("Performance.enable")
+                    self._sessions[page] = session
+                sample.update(_browser_metrics(await session.send("Performance.getMetrics")))
+            except Exception as e:
+                logger.debug(f"Browser metrics unavailable: {e}")
+        return self._record(sample)
+
+    def _record(self, sample: Dict) -> Dict:
+        with self._lock:
+            self.samples.append(sample)
+            self.counts["samples"] += 1
+            for key, value in sample.items():
+                if isinstance(value, (int, float)) and key != "time":
+                    self.peaks[key] = max(self.peaks.get(key, value), value)
+        return sample
+
+    def count_recycle(self):
+        with self._lock:
+            self.counts["recycles"] += 1
+
+    def summary(self) -> Dict:
+        """Counts and peak values, e.g. for report metrics"""
+        with self._lock:
+            return dict(self.counts, **{f"peak_{key}": round(value, 1) for key, value in self.peaks.items()})
+
+    def export_json(self, path: str):
+        """Write the summary and the kept samples as JSON"""
+        data = self.summary()
+        with self._lock:
+            data["samples"] = list(self.samples)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Error writing memory samples: {e}")
+
+def _browser_metrics(response: Dict) -> Dict:
+    values = {}
+    for metric in response.get("metrics", []):
+        key = _BROWSER_METRICS.get(metric["name"])
+        if key:
+            value = metric["value"]
+            values[key] = round(value / (1024 * 1024), 1) if metric["name"] in _BYTE_METRICS else int(value)
+    return values
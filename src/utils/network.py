@@ -0,0 +1,219 @@
+import fnmatch
+import logging
+import os
+import re
+import threading
+import weakref
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Profiles available without any config, "block_profiles" in the config adds or overrides
+DEFAULT_PROFILES = {
+    "none": {},
+    # Everything a page renders but a test never asserts on, plus tracking beacons
+    "lean": {
+        "resource_types": ["image", "media", "font"],
+        "url_patterns": [
+            "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+            "*googlesyndication.com/*", "*facebook.net/*", "*hotjar.com/*", "*segment.io/*"
+        ]
+    },
+    "minimal": {
+        "resource_types": ["image", "media", "font", "stylesheet", "texttrack", "manifest"],
+        "url_patterns": [
+            "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+            "*googlesyndication.com/*", "*facebook.net/*", "*hotjar.com/*", "*segment.io/*"
+        ]
+    }
+}
+
+# Typical transfer size per resource type, blocked requests never report their size
+DEFAULT_BYTE_ESTIMATES = {
+    "image": 30_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 20_000,
+    "script": 30_000,
+    "other": 5_000
+}
+
+def _compile_patterns(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """One regex for a list of glob patterns ("*tracker.com/*")"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+class ResourceBlocker:
+    """
+    Aborts requests by resource type or URL pattern on the browser contexts it
+    is attached to, following a named profile, e.g.
+    {"resource_types": ["image", "font"], "url_patterns": ["*analytics.com/*"],
+     "allow_patterns": ["*/captcha/*"]}
+    Requests it lets through fall back to other routes (e.g. a HAR replay).
+    The profile can be switched at any time, e.g. per test case. Counters are
+    shared with blockers made by for_worker(), so parallel workers add up.
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, Dict]] = None, profile: Optional[str] = None,
+                 byte_estimates: Optional[Dict[str, int]] = None):
+        self.profiles = dict(DEFAULT_PROFILES, **(profiles or {}))
+        self.byte_estimates = dict(DEFAULT_BYTE_ESTIMATES, **(byte_estimates or {}))
+        self.counts = {"allowed": 0, "blocked": 0, "bytes_saved_estimate": 0}
+        self.blocked_by_type: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._attached = weakref.WeakSet()
+        self.default_profile = profile
+        self.use_profile(profile)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ResourceBlocker":
+        return cls(
+            config.get("block_profiles"),
+            config.get("block_profile"),
+            config.get("block_byte_estimates")
+        )
+
+    def for_worker(self) -> "ResourceBlocker":
+        """A blocker with the same profiles for another worker's contexts, adding to the same counters"""
+        blocker = ResourceBlocker.__new__(ResourceBlocker)
+        blocker.__dict__.update(self.__dict__)
+        blocker._attached = weakref.WeakSet()
+        blocker.use_profile(self.profile)
+        return blocker
+
+    def use_profile(self, name: Optional[str]):
+        """Switch to a named profile, None goes back to the configured default"""
+        name = name or self.default_profile
+        if name and name not in self.profiles:
+            raise ValueError(f"Unknown block profile {name!r}, expected one of {', '.join(self.profiles)}")
+        rules = (self.profiles[name] or {}) if name else {}
+        self.profile = name
+        self.resource_types = frozenset(rules.get("resource_types", ()))
+        self.block_pattern = _compile_patterns(rules.get("url_patterns", ()))
+        self.allow_pattern = _compile_patterns(rules.get("allow_patterns", ()))
+
+    @property
+    def active(self) -> bool:
+        return bool(self.resource_types or self.block_pattern)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if self.allow_pattern and self.allow_pattern.match(url):
+            return False
+        return resource_type in self.resource_types or bool(self.block_pattern and self.block_pattern.match(url))
+
+    def attach(self, context):
+        """
+        Route the requests of a browser context through the blocker.
+        Contexts are only routed while a profile blocks something, every routed
+        request costs a round trip to Python.
+        """
+        if self.active and context not in self._attached:
+            context.route("**/*", self._handle)
+            self._attached.add(context)
+
+    async def attach_async(self, context):
+        """attach() for contexts of the async API, e.g. CrawlEngine workers"""
+        if self.active and context not in self._attached:
+            await context.route("**/*", self._handle_async)
+            self._attached.add(context)
+
+    def bring_to_front(self, context):
+        """Re-register the route so it runs before routes added since, e.g. a HAR replay"""
+        if context in self._attached:
+            context.unroute("**/*", self._handle)
+            context.route("**/*", self._handle)
+
+    def _handle(self, route):
+        if self._check(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _handle_async(self, route):
+        if self._check(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def _check(self, request) -> bool:
+        """Decide on a request and count it"""
+        resource_type = request.resource_type
+        blocked = self.should_block(resource_type, request.url)
+        with self._lock:
+            if not blocked:
+                self.counts["allowed"] += 1
+                return False
+            self.counts["blocked"] += 1
+            self.counts["bytes_saved_estimate"] += self.byte_estimates.get(
+                resource_type, self.byte_estimates["other"]
+            )
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counts, profile=self.profile)
+            stats.update((f"blocked_{kind}", count) for kind, count in self.blocked_by_type.items())
+            return stats
+
+NETWORK_MODES = ("live", "record", "replay")
+
+class HarRouter:
+    """
+    Records the traffic of each test case into <har_dir>/<test case>.har.zip, or
+    serves it back from there so a test case runs without the network.
+    Replay misses are counted and either aborted (not_found "abort") or sent
+    to the live site (not_found "live"). Recordings are written when the
+    browser context closes.
+    """
+
+    def __init__(self, mode: str = "live", har_dir: str = "config/har", not_found: str = "abort"):
+        if mode not in NETWORK_MODES:
+            raise ValueError(f"network_mode must be one of {', '.join(NETWORK_MODES)}")
+        if not_found not in ("abort", "live"):
+            raise ValueError("har_not_found must be 'abort' or 'live'")
+        self.mode = mode
+        self.har_dir = har_dir
+        self.not_found = not_found
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "HarRouter":
+        return cls(
+            config.get("network_mode", "live"),
+            config.get("har_dir", os.path.join("config", "har")),
+            config.get("har_not_found", "abort")
+        )
+
+    def path_for(self, name: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "test_case"
+        return os.path.join(self.har_dir, f"{slug}.har.zip")
+
+    def attach(self, context, name: str):
+        """Record or replay the named test case's traffic on a browser context"""
+        path = self.path_for(name)
+        if self.mode == "record":
+            os.makedirs(self.har_dir, exist_ok=True)
+            context.route_from_har(path, update=True, update_content="attach", update_mode="minimal")
+        elif self.mode == "replay":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No recording for {name} at {path}, run it with network_mode 'record' first")
+            # Requests the recording has no entry for fall through to this route
+            context.route("**/*", self._miss)
+            context.route_from_har(path, not_found="fallback")
+
+    def _miss(self, route):
+        with self._lock:
+            self.misses += 1
+        logger.debug(f"Not in recording: {route.request.method} {route.request.url}")
+        if self.not_found == "live":
+            route.continue_()
+        else:
+            route.abort("internetdisconnected")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"mode": self.mode, "misses": self.misses, "not_found": self.not_found}
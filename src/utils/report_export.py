@@ -0,0 +1,80 @@
+import json
+from typing import Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+def _case_steps(report) -> Iterator[Tuple[Dict, List[Dict]]]:
+    """
+    Yield (case record, its step records) as cases finish. Steps of cases that
+    run in parallel interleave in the log, so they are held per open case only.
+    """
+    pending: Dict[str, List[Dict]] = {}
+    for result in report.iter_results():
+        case_id = result.get("case_id")
+        if result.get("type") == "case":
+            yield result, pending.pop(case_id, [])
+        elif case_id:
+            pending.setdefault(case_id, []).append(result)
+
+def write_junit_xml(report, path: str):
+    """Write the report's test cases as a JUnit XML test suite, steps go to system-out"""
+    tests = sum(report.case_counts.values())
+    failures = tests - report.case_counts.get("success", 0)
+    suite = quoteattr(report.suite)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(
+            f'<testsuites name={suite} tests="{tests}" failures="{failures}" '
+            f'time="{report.wall_seconds:.3f}">\n'
+            f'  <testsuite name={suite} tests="{tests}" failures="{failures}" errors="0" '
+            f'skipped="0" timestamp="{report.start_time.isoformat(timespec="seconds")}" '
+            f'time="{report.case_seconds:.3f}">\n'
+        )
+        for case, steps in _case_steps(report):
+            f.write(
+                f'    <testcase classname={suite} name={quoteattr(case["case"])} '
+                f'time="{case.get("duration") or 0:.3f}">\n'
+            )
+            if case["status"] != "success":
+                message = case.get("error") or case["status"]
+                f.write(f'      <failure message={quoteattr(message)}>{escape(message)}</failure>\n')
+            if steps:
+                lines = "\n".join(
+                    f"[{step['status']}] {step['step']}"
+                    + (f" ({step['duration']:.3f}s)" if step.get("duration") is not None else "")
+                    + (f": {step['details']}" if step.get("details") else "")
+                    for step in steps
+                )
+                f.write(f"      <system-out>{escape(lines)}</system-out>\n")
+            f.write("    </testcase>\n")
+        f.write("  </testsuite>\n</testsuites>\n")
+
+def write_json_summary(report, path: str):
+    """Write suite totals, timing and one entry per test case as JSON"""
+    summary = {
+        "suite": report.suite,
+        "start_time": report.start_time.isoformat(),
+        "end_time": report.end_time.isoformat() if report.end_time else None,
+        "wall_seconds": round(report.wall_seconds, 3),
+        "case_seconds": round(report.case_seconds, 3),
+        "cases": dict(report.case_counts),
+        "steps": dict(report.counts),
+        "metrics": report.metrics,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        # Totals first, then stream the case list into the same object: drop the
+        # closing "\n}" of the totals and continue with one line per case
+        f.write(json.dumps(summary, indent=2, default=str)[:-2] + ',\n  "test_cases": [')
+        for index, (case, steps) in enumerate(_case_steps(report)):
+            entry = {
+                "name": case["case"],
+                "status": case["status"],
+                "error": case.get("error"),
+                "started": case.get("started"),
+                "duration": case.get("duration"),
+                "steps": [
+                    {"name": step["step"], "status": step["status"], "duration": step.get("duration")}
+                    for step in steps
+                ],
+            }
+            f.write(("," if index else "") + "\n    " + json.dumps(entry))
+        f.write("\n  ]\n}\n")
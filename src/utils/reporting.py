@@ -1,18 +1,100 @@
+import glob
+import html
+import itertools
 import json
 import os
+import re
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import logging
+from .screenshots import ScreenshotWriter, thumbnail_path
 
 logger = logging.getLogger(__name__)
 
+_PAGE_STYLE = """
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .success { color: green; }
+                .failure { color: red; }
+                .result { margin: 10px 0; padding: 10px; border: 1px solid #ddd; }
+                .case { margin: 10px 0; padding: 10px; background: #f4f4f4; }
+                .screenshot { max-width: 800px; }
+                .thumbnail { border: 1px solid #ddd; }
+                .pages a { margin-right: 8px; }
+            </style>"""
+
 class TestReport:
-    def __init__(self, output_dir: str = "reports"):
+    """
+    Test results, streamed to an append-only JSONL log (<output_dir>/<name>.jsonl)
+    as they are added. Only counts, timing totals and metrics are kept in memory,
+    so long runs use constant memory and a crash loses nothing already logged.
+
+    Results form a suite (the report) of test cases, each with its steps:
+    start_case() returns a case id, steps are added with that id and
+    end_case() records the case outcome and duration. Steps added without a
+    case id are allowed, e.g. for crawls.
+
+    generate_report() renders HTML pages from the log, page_size results per
+    page, and writes the JUnit XML and JSON summary exports next to them.
+    """
+
+    def __init__(self, output_dir: str = "reports", name: str = "results",
+                 append: bool = False, page_size: int = 500, suite: Optional[str] = None,
+                 screenshots: Optional[Dict] = None):
+        """
+        Args:
+            output_dir: Directory for the log, HTML pages, exports and screenshots
+            name: Log file name without extension
+            append: Continue an existing log (e.g. after a crash) instead of starting over
+            page_size: Results per HTML page
+            suite: Suite name used by the exports, defaults to the directory name
+            screenshots: ScreenshotWriter options (format, quality, thumbnails), see options_from_config
+        """
         self.output_dir = output_dir
-        self.results: List[Dict] = []
+        self.name = name
+        self.page_size = page_size
+        self.suite = suite or os.path.basename(os.path.normpath(output_dir))
+        self.metrics: Dict[str, Dict] = {}
+        # Step and case counts by status
+        self.counts: Dict[str, int] = {}
+        self.case_counts: Dict[str, int] = {}
+        # Summed durations of finished cases, more than the wall time when cases run in parallel
+        self.case_seconds = 0.0
         self.start_time = datetime.now()
+        self.end_time: Optional[datetime] = None
+        self._open_cases: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.screenshot_options = screenshots or {}
+        # Started with the first screenshot
+        self._screenshots: Optional[ScreenshotWriter] = None
         self._ensure_output_dir()
-    
+
+        self.log_path = os.path.join(output_dir, f"{name}.jsonl")
+        if append and os.path.exists(self.log_path) and not self._load_run_info():
+            for result in self.iter_results():
+                self._count(result)
+        self._log = open(self.log_path, "a" if append else "w")
+
+    @classmethod
+    def for_run(cls, root_dir: str = "reports", **kwargs) -> "TestReport":
+        """
+        A report in a new directory of its own, <root_dir>/<timestamp>_<id>, so
+        runs never overwrite each other. <root_dir>/latest points at the newest run.
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        report = cls(os.path.join(root_dir, run_id), **kwargs)
+        latest = os.path.join(root_dir, "latest")
+        try:
+            if os.path.islink(latest):
+                os.remove(latest)
+            if not os.path.exists(latest):
+                os.symlink(run_id, latest)
+        except OSError as e:
+            logger.debug(f"Could not link latest report: {e}")
+        return report
+
     def _ensure_output_dir(self):
         """Ensure the output directory exists"""
         try:
@@ -20,88 +102,314 @@ class TestReport:
             os.makedirs(os.path.join(self.output_dir, "screenshots"), exist_ok=True)
         except Exception as e:
             logger.error(f"Error creating output directories: {e}")
-    
-    def add_result(self, step: str, status: str, details: str = "", screenshot: str = None):
-        """Add a test result"""
-        self.results.append({
+
+    def _count(self, result: Dict):
+        if result.get("type") == "case":
+            self.case_counts[result["status"]] = self.case_counts.get(result["status"], 0) + 1
+            self.case_seconds += result.get("duration") or 0.0
+        else:
+            self.counts[result["status"]] = self.counts.get(result["status"], 0) + 1
+
+    def _write(self, result: Dict):
+        line = json.dumps(result) + "\n"
+        with self._lock:
+            self._log.write(line)
+            self._log.flush()
+            self._count(result)
+
+    def add_result(self, step: str, status: str, details: str = "", screenshot: str = None,
+                   case_id: Optional[str] = None, duration: Optional[float] = None):
+        """Add a step result, written to the log right away"""
+        self._write({
+            "type": "step",
             "timestamp": datetime.now().isoformat(),
+            "case_id": case_id,
             "step": step,
             "status": status,
             "details": details,
-            "screenshot": screenshot
+            "screenshot": screenshot,
+            "duration": duration
         })
-    
+
+    def start_case(self, name: str) -> str:
+        """Open a test case and return its id for add_result and end_case"""
+        case_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._open_cases[case_id] = {"name": name, "started": datetime.now()}
+        return case_id
+
+    def end_case(self, case_id: str, status: str, error: Optional[str] = None):
+        """Record the outcome of a test case opened with start_case"""
+        with self._lock:
+            case = self._open_cases.pop(case_id)
+        self._write({
+            "type": "case",
+            "timestamp": datetime.now().isoformat(),
+            "case_id": case_id,
+            "case": case["name"],
+            "status": status,
+            "error": error,
+            "started": case["started"].isoformat(),
+            "duration": (datetime.now() - case["started"]).total_seconds()
+        })
+
+    def iter_results(self) -> Iterator[Dict]:
+        """Stream step and case records back from the log"""
+        with self._lock:
+            if hasattr(self, "_log") and not self._log.closed:
+                self._log.flush()
+        with open(self.log_path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partial last line
+                    continue
+
+    @property
+    def results(self) -> List[Dict]:
+        """All records as a list; loads the whole log, prefer iter_results"""
+        return list(self.iter_results())
+
+    @property
+    def result_count(self) -> int:
+        return sum(self.counts.values()) + sum(self.case_counts.values())
+
+    @property
+    def wall_seconds(self) -> float:
+        return ((self.end_time or datetime.now()) - self.start_time).total_seconds()
+
+    def add_metrics(self, name: str, values: Dict):
+        """Attach a named group of counters, e.g. classification cache hits"""
+        self.metrics.setdefault(name, {}).update(values)
+
+    def merge(self, shards: List["TestReport"]):
+        """
+        Append the records of report shards, e.g. from parallel workers.
+        Counts and case time add up, the run spans from the earliest shard
+        start to the latest shard end.
+        """
+        for shard in shards:
+            with self._lock:
+                for line in _complete_lines(shard):
+                    self._log.write(line)
+                self._log.flush()
+                for status, count in shard.counts.items():
+                    self.counts[status] = self.counts.get(status, 0) + count
+                for status, count in shard.case_counts.items():
+                    self.case_counts[status] = self.case_counts.get(status, 0) + count
+                self.case_seconds += shard.case_seconds
+                self.start_time = min(self.start_time, shard.start_time)
+                if shard.end_time:
+                    self.end_time = max(self.end_time or shard.end_time, shard.end_time)
+            for name, values in shard.metrics.items():
+                group = self.metrics.setdefault(name, {})
+                for key, value in values.items():
+                    if isinstance(value, (int, float)) and isinstance(group.get(key, 0), (int, float)):
+                        group[key] = group.get(key, 0) + value
+                    else:
+                        group[key] = value
+
+    def close(self):
+        """Close the log and finish writing screenshots, results can still be read back"""
+        if self._screenshots:
+            self._screenshots.close()
+        with self._lock:
+            self._log.close()
+
+    def discard(self):
+        """Close and delete the log, e.g. of a shard that was merged"""
+        self.close()
+        try:
+            os.remove(self.log_path)
+        except OSError as e:
+            logger.error(f"Error removing report log: {e}")
+
     def save_screenshot(self, page, name: str) -> str:
-        """Save a screenshot and return its path"""
+        """
+        Capture a screenshot and return its path relative to output_dir.
+        The file is written in the background, generate_report() waits for it.
+        """
         try:
-            filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            path = os.path.join(self.output_dir, "screenshots", filename)
-            page.screenshot(path=path)
-            return path
+            with self._lock:
+                if self._screenshots is None:
+                    self._screenshots = ScreenshotWriter(
+                        os.path.join(self.output_dir, "screenshots"), **self.screenshot_options
+                    )
+            return f"screenshots/{self._screenshots.capture(page, name)}"
         except Exception as e:
             logger.error(f"Error saving screenshot: {e}")
             return ""
-    
-    def generate_report(self):
-        """Generate HTML test report"""
-        end_time = datetime.now()
-        duration = (end_time - self.start_time).total_seconds()
-        
-        success_count = sum(1 for r in self.results if r["status"] == "success")
-        failure_count = sum(1 for r in self.results if r["status"] == "failure")
-        
-        html = self._generate_html_report(
-            success_count, failure_count, duration
-        )
-        
+
+    def _run_info_path(self) -> str:
+        return os.path.join(self.output_dir, f"{self.name}.run.json")
+
+    def _save_run_info(self):
+        """
+        Persist what the log does not hold, so the report can be reopened and
+        merged, plus the counts so reopening can skip parsing an unchanged log
+        """
+        with self._lock:
+            self._log.flush()
+            info = {
+                "suite": self.suite,
+                "start_time": self.start_time.isoformat(),
+                "end_time": self.end_time.isoformat() if self.end_time else None,
+                "metrics": self.metrics,
+                "counts": self.counts,
+                "case_counts": self.case_counts,
+                "case_seconds": self.case_seconds,
+                "log_bytes": os.path.getsize(self.log_path)
+            }
+        with open(self._run_info_path(), "w") as f:
+            json.dump(info, f, indent=2, default=str)
+
+    def _load_run_info(self) -> bool:
+        """Restore saved run info, True if its counts still match the log"""
+        try:
+            with open(self._run_info_path()) as f:
+                info = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        self.suite = info.get("suite", self.suite)
+        self.start_time = datetime.fromisoformat(info["start_time"])
+        if info.get("end_time"):
+            self.end_time = datetime.fromisoformat(info["end_time"])
+        self.metrics = info.get("metrics", {})
+        if info.get("log_bytes") != os.path.getsize(self.log_path):
+            return False
+        self.counts = info["counts"]
+        self.case_counts = info["case_counts"]
+        self.case_seconds = info["case_seconds"]
+        return True
+
+    def generate_report(self, end_time: Optional[datetime] = None):
+        """
+        Render the HTML report from the log, one file per page, and write
+        junit.xml and summary.json next to it
+        Args:
+            end_time: Fixed end of the run, e.g. for merged reports; defaults to now
+        """
+        from .report_export import write_json_summary, write_junit_xml
+
+        if end_time or not self._open_cases:
+            self.end_time = end_time or datetime.now()
+        if self._screenshots:
+            self._screenshots.flush()
+            self.add_metrics("Screenshots", self._screenshots.stats())
+        pages = max(1, -(-self.result_count // self.page_size))
+
         try:
-            report_path = os.path.join(self.output_dir, "report.html")
-            with open(report_path, "w") as f:
-                f.write(html)
-            logger.info(f"Report generated: {report_path}")
+            results = self.iter_results()
+            for page in range(1, pages + 1):
+                with open(self._page_path(page), "w") as f:
+                    self._write_html_page(f, page, pages, itertools.islice(results, self.page_size))
+            self._remove_stale_pages(pages)
+            write_junit_xml(self, os.path.join(self.output_dir, "junit.xml"))
+            write_json_summary(self, os.path.join(self.output_dir, "summary.json"))
+            self._save_run_info()
+            logger.info(f"Report generated: {self._page_path(1)}")
         except Exception as e:
             logger.error(f"Error generating report: {e}")
-    
-    def _generate_html_report(self, success_count: int, failure_count: int, duration: float) -> str:
-        """Generate HTML content for the report"""
-        html = f"""
+
+    def _page_path(self, page: int) -> str:
+        filename = "report.html" if page == 1 else f"report-{page}.html"
+        return os.path.join(self.output_dir, filename)
+
+    def _remove_stale_pages(self, pages: int):
+        """Delete pages left over from an earlier, longer report"""
+        for path in glob.glob(os.path.join(self.output_dir, "report-*.html")):
+            match = re.search(r"report-(\d+)\.html$", path)
+            if match and int(match.group(1)) > pages:
+                os.remove(path)
+
+    def _write_html_page(self, f, page: int, pages: int, results: Iterator[Dict]):
+        """Write one HTML page, streaming the results instead of building one string"""
+        f.write(f"""
         <!DOCTYPE html>
         <html>
         <head>
-            <title>Test Automation Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .success {{ color: green; }}
-                .failure {{ color: red; }}
-                .result {{ margin: 10px 0; padding: 10px; border: 1px solid #ddd; }}
-                .screenshot {{ max-width: 800px; }}
-            </style>
+            <title>Test Automation Report</title>{_PAGE_STYLE}
         </head>
         <body>
             <h1>Test Automation Report</h1>
             <div class="summary">
                 <p>Start Time: {self.start_time}</p>
-                <p>Duration: {duration:.2f} seconds</p>
-                <p>Success: <span class="success">{success_count}</span></p>
-                <p>Failures: <span class="failure">{failure_count}</span></p>
+                <p>Duration: {self.wall_seconds:.2f} seconds</p>
+                <p>Test Cases: <span class="success">{self.case_counts.get("success", 0)} passed</span>,
+                   <span class="failure">{self.case_counts.get("failure", 0)} failed</span></p>
+                <p>Success: <span class="success">{self.counts.get("success", 0)}</span></p>
+                <p>Failures: <span class="failure">{self.counts.get("failure", 0)}</span></p>
             </div>
+        """)
+
+        if page == 1:
+            for name, values in self.metrics.items():
+                f.write(f"<h2>{html.escape(name)}</h2><table>")
+                f.writelines(
+                    f"<tr><td>{html.escape(str(key))}</td><td>{html.escape(str(value))}</td></tr>"
+                    for key, value in values.items()
+                )
+                f.write("</table>")
+
+        navigation = self._navigation(page, pages)
+        f.write(f"""
             <h2>Test Steps</h2>
-        """
-        
-        for result in self.results:
-            html += f"""
+            {navigation}
+        """)
+
+        for result in results:
+            status = html.escape(result["status"])
+            duration = f" in {result['duration']:.2f}s" if result.get("duration") is not None else ""
+            if result.get("type") == "case":
+                error = f"<p>Error: {html.escape(result['error'])}</p>" if result.get("error") else ""
+                f.write(f"""
+            <div class="case">
+                <h3>Test case: {html.escape(result["case"])}</h3>
+                <p>Status: <span class="{status}">{status}</span>{duration}</p>
+                {error}
+            </div>""")
+                continue
+            f.write(f"""
             <div class="result">
-                <h3>{result["step"]}</h3>
-                <p>Status: <span class="{result["status"]}">{result["status"]}</span></p>
+                <h3>{html.escape(result["step"])}</h3>
+                <p>Status: <span class="{status}">{status}</span>{duration}</p>
                 <p>Time: {result["timestamp"]}</p>
-                <p>Details: {result["details"]}</p>
-            """
+                <p>Details: {html.escape(str(result["details"]))}</p>
+            """)
             if result["screenshot"]:
-                html += f'<img class="screenshot" src="{result["screenshot"]}" alt="Step Screenshot">'
-            html += "</div>"
-        
-        html += """
+                src = html.escape(result["screenshot"])
+                thumbnail = thumbnail_path(result["screenshot"])
+                if os.path.exists(os.path.join(self.output_dir, thumbnail)):
+                    f.write(f'<a href="{src}"><img class="thumbnail" src="{html.escape(thumbnail)}" '
+                            f'loading="lazy" alt="Step Screenshot"></a>')
+                else:
+                    f.write(f'<a href="{src}"><img class="screenshot" src="{src}" '
+                            f'loading="lazy" alt="Step Screenshot"></a>')
+            f.write("</div>")
+
+        f.write(f"""
+            {navigation}
         </body>
         </html>
-        """
-        return html
\ No newline at end of file
+        """)
+
+    def _navigation(self, page: int, pages: int) -> str:
+        if pages == 1:
+            return ""
+        links = (
+            f"<strong>{number}</strong>" if number == page
+            else f'<a href="{os.path.basename(self._page_path(number))}">{number}</a>'
+            for number in range(1, pages + 1)
+        )
+        return f'<div class="pages">Page: {" ".join(links)}</div>'
+
+def _complete_lines(report: TestReport) -> Iterator[str]:
+    """Lines of a report's log, skipping a torn last line"""
+    with report._lock:
+        if not report._log.closed:
+            report._log.flush()
+    with open(report.log_path) as f:
+        for line in f:
+            if line.endswith("\n"):
+                yield line
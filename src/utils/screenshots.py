@@ -0,0 +1,159 @@
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jpeg", "webp", "png")
+
+def options_from_config(config: Dict) -> Dict:
+    """ScreenshotWriter options from the screenshot_* config keys"""
+    return {
+        "image_format": config.get("screenshot_format", "jpeg"),
+        "quality": config.get("screenshot_quality", 70),
+        "full_page": config.get("screenshot_full_page", False),
+        "thumbnail_width": config.get("screenshot_thumbnail_width", 320),
+        "queue_size": config.get("screenshot_queue_size", 32)
+    }
+
+def thumbnail_path(path: str) -> str:
+    """Thumbnail of a screenshot path, in a thumbs directory next to it"""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, "thumbs", os.path.splitext(filename)[0] + ".jpg")
+
+class ScreenshotWriter:
+    """
+    Writes screenshots from a background thread.
+    The calling thread only grabs the encoded frame from the browser (viewport
+    JPEG by default, cheaper than a full-page PNG) and hashes it; converting to
+    WebP, thumbnails and disk writes happen on the writer thread, fed through a
+    bounded queue that blocks callers when the disk falls behind. Files are
+    named <content hash>.<ext>, so identical frames from any step, or from
+    another writer sharing the directory, are stored once. WebP and
+    thumbnails need Pillow and are skipped without it.
+    """
+
+    def __init__(self, directory: str, image_format: str = "jpeg", quality: int = 70,
+                 full_page: bool = False, thumbnail_width: int = 320, queue_size: int = 32):
+        if image_format not in FORMATS:
+            raise ValueError(f"screenshot_format must be one of {', '.join(FORMATS)}")
+        if image_format == "webp" and not _has_pillow():
+            logger.warning("WebP screenshots need Pillow (pip install Pillow), saving JPEG instead")
+            image_format = "jpeg"
+        self.directory = directory
+        self.image_format = image_format
+        self.quality = quality
+        self.full_page = full_page
+        self.thumbnail_width = thumbnail_width
+        self.counts = {"captured": 0, "duplicates": 0, "written": 0, "bytes": 0, "errors": 0}
+        self._known = set()
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        os.makedirs(os.path.join(directory, "thumbs"), exist_ok=True)
+        self._thread.start()
+
+    def capture(self, page, name: str) -> str:
+        """Grab the page and queue it, returns the file name inside the directory"""
+        if self.image_format == "png":
+            data = page.screenshot(type="png", full_page=self.full_page)
+        else:
+            # WebP is converted from a high quality JPEG on the writer thread
+            quality = self.quality if self.image_format == "jpeg" else 95
+            data = page.screenshot(type="jpeg", quality=quality, full_page=self.full_page)
+        return self.submit(data, name)
+
+    def submit(self, data: bytes, name: str) -> str:
+        """Queue an encoded frame, returns the shared file name of its content"""
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        extension = "jpg" if self.image_format == "jpeg" else self.image_format
+        filename = f"{digest}.{extension}"
+        with self._lock:
+            self.counts["captured"] += 1
+            if digest in self._known:
+                self.counts["duplicates"] += 1
+                logger.debug(f"Screenshot {name} is identical to {filename}")
+                return filename
+            self._known.add(digest)
+        self._queue.put((filename, data))
+        return filename
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                with self._lock:
+                    self.counts["errors"] += 1
+                logger.error(f"Error writing screenshot {item[0]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, filename: str, data: bytes):
+        path = os.path.join(self.directory, filename)
+        if os.path.exists(path):
+            # Written by another writer on the same directory, e.g. a suite shard
+            with self._lock:
+                self.counts["duplicates"] += 1
+            return
+        image = None
+        if self.image_format == "webp" or self.thumbnail_width:
+            image = _open_image(data)
+        if self.image_format == "webp":
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=self.quality, method=0)
+            data = buffer.getvalue()
+        _write_file(path, data)
+        if image is not None and self.thumbnail_width:
+            thumbnail = image.convert("RGB")
+            thumbnail.thumbnail((self.thumbnail_width, self.thumbnail_width * 4))
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, "JPEG", quality=60)
+            _write_file(thumbnail_path(path), buffer.getvalue())
+        with self._lock:
+            self.counts["written"] += 1
+            self.counts["bytes"] += len(data)
+
+    def flush(self):
+        """Wait until every queued screenshot is on disk"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+def _has_pillow() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _open_image(data: bytes):
+    """Decoded image, or None without Pillow"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+def _write_file(path: str, data: bytes):
+    # Unique per thread, writers sharing a directory may write the same file
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,116 @@
+import logging
+import socket
+import threading
+from typing import Optional
+from playwright.sync_api import sync_playwright
+
+logger = logging.getLogger(__name__)
+
+def find_free_port() -> int:
+    """Ask the OS for a free local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class SharedBrowser:
+    """
+    A single Chromium process that several threads can attach to.
+    Playwright's sync API is bound to the thread that started it, so the
+    browser is launched from a thread of its own (the calling thread may
+    already be running Playwright, e.g. the suite's AIWebTester) and each
+    worker thread starts its own Playwright driver and connects over CDP
+    to this browser, then works in its own isolated browser context.
+    """
+
+    def __init__(self, headless: bool = False, port: Optional[int] = None, endpoint: Optional[str] = None):
+        """
+        Args:
+            headless: Run the launched browser without a window
+            port: Remote debugging port, a free one by default
+            endpoint: CDP endpoint of an already running browser (e.g. the browser
+                server) to share instead of launching one
+        """
+        self.headless = headless
+        self.port = port
+        self.endpoint = endpoint
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._stop = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def start(self) -> "SharedBrowser":
+        """Launch Chromium with a remote debugging endpoint"""
+        if self.endpoint:
+            return self
+        self.port = self.port or find_free_port()
+        self._thread = threading.Thread(target=self._serve, name="shared-browser", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error:
+            self._thread.join()
+            self._thread = None
+            raise self._error
+        self.endpoint = f"http://127.0.0.1:{self.port}"
+        logger.info(f"Shared browser listening on {self.endpoint}")
+        return self
+
+    def _serve(self):
+        """Own the browser's Playwright driver until close()"""
+        try:
+            playwright = sync_playwright().start()
+        except Exception as e:
+            self._error = e
+            self._started.set()
+            return
+        try:
+            browser = playwright.chromium.launch(
+                headless=self.headless,
+                args=[f"--remote-debugging-port={self.port}"]
+            )
+        except Exception as e:
+            self._error = e
+            self._started.set()
+            playwright.stop()
+            return
+        self._started.set()
+        self._stop.wait()
+        try:
+            browser.close()
+        except Exception as e:
+            logger.error(f"Error closing shared browser: {e}")
+        finally:
+            playwright.stop()
+
+    def connect(self):
+        """
+        Connect the calling thread to the shared browser.
+        Returns (playwright, browser); call disconnect() from the same thread.
+        """
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.connect_over_cdp(self.endpoint)
+        except Exception:
+            playwright.stop()
+            raise
+        return playwright, browser
+
+    @staticmethod
+    def disconnect(playwright, browser):
+        """Close the contexts a thread created and stop its driver"""
+        try:
+            browser.close()
+        finally:
+            playwright.stop()
+
+    def close(self):
+        """Shut down the shared Chromium process"""
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Tracer:
+    """
+    Records timing spans (e.g. a step and its selector wait, scroll and click)
+    and counters (e.g. retries). Totals per span name and per selector are
+    always complete; individual spans are kept up to max_events for the trace
+    exports. Safe to share between threads, each thread is its own trace lane.
+    """
+
+    def __init__(self, max_events: int = 100000):
+        self.max_events = max_events
+        self.events: List[Dict] = []
+        self.dropped_events = 0
+        self.counters: Dict[str, int] = {}
+        # "category:name" or selector -> [count, total_us, max_us]
+        self.totals: Dict[str, List[float]] = {}
+        self.selector_totals: Dict[str, List[float]] = {}
+        self._origin = time.perf_counter_ns()
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args):
+        """Time the enclosed block; args (e.g. selector) go into the trace"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter_ns(), args)
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, args: Optional[Dict] = None):
+        duration_us = (end_ns - start_ns) / 1000
+        thread = threading.current_thread()
+        with self._lock:
+            _add_total(self.totals, f"{category}:{name}", duration_us)
+            if args and args.get("selector"):
+                _add_total(self.selector_totals, args["selector"], duration_us)
+            if len(self.events) < self.max_events:
+                self._threads.setdefault(thread.ident, thread.name)
+                self.events.append({
+                    "name": name,
+                    "cat": category,
+                    "ts": (start_ns - self._origin) / 1000,
+                    "dur": duration_us,
+                    "tid": thread.ident,
+                    "args": args or {}
+                })
+            else:
+                self.dropped_events += 1
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self, top: int = 20) -> Dict:
+        """Counters plus span totals, slowest first"""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "spans": _rank(self.totals),
+                "slowest_selectors": _rank(self.selector_totals)[:top],
+                "dropped_events": self.dropped_events
+            }
+
+    def export_json(self, path: str):
+        """Write the summary and the recorded spans as JSON"""
+        data = self.summary()
+        with self._lock:
+            data["events"] = list(self.events)
+        _write_json(path, data)
+
+    def export_chrome_trace(self, path: str):
+        """Write a Chrome trace-event file, open it in chrome://tracing or Perfetto"""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            events.extend(dict(event, ph="X", pid=pid) for event in self.events)
+            end = (time.perf_counter_ns() - self._origin) / 1000
+            events.extend(
+                {"name": name, "ph": "C", "ts": end, "pid": pid, "args": {name: value}}
+                for name, value in self.counters.items()
+            )
+        _write_json(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+def _add_total(totals: Dict[str, List[float]], key: str, duration_us: float):
+    entry = totals.setdefault(key, [0, 0.0, 0.0])
+    entry[0] += 1
+    entry[1] += duration_us
+    entry[2] = max(entry[2], duration_us)
+
+def _rank(totals: Dict[str, List[float]]) -> List[Dict]:
+    return [
+        {
+            "name": key,
+            "count": count,
+            "total_ms": round(total / 1000, 3),
+            "mean_ms": round(total / count / 1000, 3),
+            "max_ms": round(longest / 1000, 3)
+        }
+        for key, (count, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1])
+    ]
+
+def _write_json(path: str, data: Dict):
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, default=str)
+    except Exception as e:
+        logger.error(f"Error writing timing data: {e}")
@@ -0,0 +1,97 @@
+import logging
+import time
+from collections.abc import Mapping
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Resolves true once the DOM saw no mutation for quietMs, false at the deadline
+_DOM_SETTLE_SCRIPT = """([quietMs, timeoutMs]) => new Promise(resolve => {
+    let quietTimer = null;
+    let deadline = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    const done = settled => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(settled);
+    };
+    observer.observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    deadline = setTimeout(() => done(false), timeoutMs);
+})"""
+
+def wait_for_dom_settle(page, quiet_ms: int = 200, timeout: int = 3000) -> bool:
+    """
+    Wait until the DOM has not changed for quiet_ms, at most timeout ms.
+    Returns False if the page kept changing or navigated away meanwhile.
+    """
+    try:
+        return bool(page.evaluate(_DOM_SETTLE_SCRIPT, [quiet_ms, timeout]))
+    except Exception as e:
+        # A navigation destroys the execution context, fall back to the load event
+        logger.debug(f"DOM settle interrupted: {e}")
+        return wait_for_load(page, timeout)
+
+def wait_for_load(page, timeout: int = 3000) -> bool:
+    """Wait for the DOMContentLoaded event of the current document"""
+    try:
+        page.wait_for_load_state('domcontentloaded', timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_for_network_quiet(page, timeout: int = 3000) -> bool:
+    """Wait for no network connections for 500 ms, at most timeout ms"""
+    try:
+        page.wait_for_load_state('networkidle', timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_for_url_change(page, old_url: str, timeout: int = 3000) -> bool:
+    """Wait until the page URL differs from old_url, at most timeout ms"""
+    try:
+        page.wait_for_url(lambda url: url != old_url, timeout=timeout, wait_until='commit')
+        return True
+    except Exception:
+        return False
+
+def wait_for_page_quiet(page, timeout: int = 3000, quiet_ms: int = 200) -> bool:
+    """Wait for network quiet and then a settled DOM, both within timeout ms"""
+    deadline = time.monotonic() + timeout / 1000
+    network_quiet = wait_for_network_quiet(page, timeout)
+    remaining = max(0, int((deadline - time.monotonic()) * 1000))
+    return wait_for_dom_settle(page, quiet_ms, remaining) and network_quiet
+
+def wait_for_condition(page, condition: Union[str, Dict], timeout: int = 3000,
+                       quiet_ms: int = 200, old_url: Optional[str] = None) -> bool:
+    """
+    Wait for a named signal:
+    "dom_settle", "network_idle", "page_quiet", "url_change" (needs old_url)
+    or {"selector": ..., "state": ...} for a selector state.
+    """
+    if isinstance(condition, Mapping):
+        try:
+            page.wait_for_selector(
+                condition["selector"],
+                state=condition.get("state", "visible"),
+                timeout=timeout
+            )
+            return True
+        except Exception:
+            return False
+    if condition == "dom_settle":
+        return wait_for_dom_settle(page, quiet_ms, timeout)
+    if condition == "network_idle":
+        return wait_for_network_quiet(page, timeout)
+    if condition == "page_quiet":
+        return wait_for_page_quiet(page, timeout, quiet_ms)
+    if condition == "url_change":
+        return wait_for_url_change(page, old_url or page.url, timeout)
+    raise ValueError(f"Unknown wait condition: {condition}")
@@ -0,0 +1,125 @@
+import json
+import pytest
+import src.test_runner as test_runner
+import src.utils.reporting as reporting
+from src.ai_tester import AIWebTester
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+
+    def goto(self, url):
+        self.url = url
+        self.context.browser.visits.append(url)
+
+    def wait_for_load_state(self, state):
+        pass
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    def new_page(self):
+        return FakePage(self)
+
+    def route(self, pattern, handler):
+        pass
+
+    def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": [], "origins": []}, f)
+
+    def close(self):
+        pass
+
+class FakeBrowser:
+    """Records the URLs visited, the storage state of each new context and worker connections"""
+
+    def __init__(self):
+        self.visits = []
+        self.storage_states = []
+        self.connections = 0
+
+    def new_context(self, storage_state=None):
+        self.storage_states.append(storage_state)
+        return FakeContext(self)
+
+def shared_browser_class(browser, error=None):
+    """Stand-in for SharedBrowser whose workers all connect to browser, or fail with error"""
+    class FakeSharedBrowser:
+        def __init__(self, headless=False, endpoint=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def connect(self):
+            if error:
+                raise error
+            browser.connections += 1
+            return None, browser
+
+        @staticmethod
+        def disconnect(playwright, browser):
+            pass
+    return FakeSharedBrowser
+
+class AsyncFakePage:
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+class AsyncFakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return AsyncFakePage()
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        if self.browser.fail_close:
+            self.browser.fail_close -= 1
+            raise RuntimeError("context already closed")
+
+class AsyncFakeBrowser:
+    """Async API browser whose first fail_close context closes raise, or every new context if crashed"""
+
+    def __init__(self, fail_close=0, crashed=False):
+        self.fail_close = fail_close
+        self.crashed = crashed
+        self.contexts = 0
+
+    async def new_context(self):
+        if self.crashed:
+            raise RuntimeError("browser crashed")
+        self.contexts += 1
+        return AsyncFakeContext(self)
+
+@pytest.fixture
+def fake_browser():
+    return FakeBrowser()
+
+@pytest.fixture
+def make_shared_browser():
+    return shared_browser_class
+
+@pytest.fixture
+def make_async_browser():
+    return AsyncFakeBrowser
+
+@pytest.fixture
+def make_runner(tmp_path):
+    """TestRunner without a browser of its own, recording into tmp_path/report"""
+    def make():
+        config = {"storage_state_dir": str(tmp_path / "auth"), "screenshot_on_error": False}
+        return test_runner.TestRunner(
+            config=config, tester=AIWebTester(launch_browser=False, config=config),
+            report=reporting.TestReport(str(tmp_path / "report"))
+        )
+    return make
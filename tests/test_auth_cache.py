@@ -0,0 +1,29 @@
+import json
+import os
+import time
+from src.utils.auth_cache import StorageStateCache
+
+class FakeContext:
+    def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": [], "origins": []}, f)
+
+def test_storage_state_round_trip(tmp_path):
+    """Test that a saved session is returned for the same base_url and user only"""
+    cache = StorageStateCache(str(tmp_path), ttl=60)
+    assert cache.get("https://example.com", "alice") is None
+
+    path = cache.save(FakeContext(), "https://example.com/", "alice")
+    assert cache.get("https://example.com", "alice") == path
+    assert cache.get("https://example.com", "bob") is None
+
+    cache.invalidate("https://example.com", "alice")
+    assert cache.get("https://example.com", "alice") is None
+
+def test_storage_state_expires(tmp_path):
+    """Test that entries older than the TTL are ignored"""
+    cache = StorageStateCache(str(tmp_path), ttl=60)
+    path = cache.save(FakeContext(), "https://example.com", "alice")
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    assert cache.get("https://example.com", "alice") is None
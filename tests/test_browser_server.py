@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from playwright.sync_api import sync_playwright
+from src.ai_tester import AIWebTester
+from src.utils.browser_server import BrowserServer, _chromium_executable
+
+def test_stale_state_is_cleaned_up_and_recycling(tmp_path):
+    """Test that a dead server's state is dropped and use limits trigger recycling"""
+    state_path = tmp_path / "server.json"
+    profile_dir = tmp_path / "profile"
+    profile_dir.mkdir()
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    state = {"pid": dead.pid, "endpoint": "http://127.0.0.1:9", "profile_dir": str(profile_dir),
+             "headless": True, "started": 0, "uses": 3}
+    state_path.write_text(json.dumps(state))
+
+    server = BrowserServer(str(state_path), max_uses=3)
+    assert server.status() is None
+    assert not state_path.exists() and not profile_dir.exists()
+    assert server._recycle_reason(state) == "3 uses"
+    assert BrowserServer(str(state_path), max_uses=10, max_memory_mb=None)._recycle_reason(state) is None
+
+FAKE_BROWSER = '''
+import http.server, sys
+port = int(next(a for a in sys.argv if a.startswith("--remote-debugging-port=")).split("=")[1])
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == "/json/version" else 404)
+        self.end_headers()
+    def log_message(self, *args):
+        pass
+http.server.HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+'''
+
+def fake_browser(tmp_path):
+    executable = tmp_path / "fake-chromium"
+    executable.write_text(f"#!{sys.executable}\n{FAKE_BROWSER}")
+    executable.chmod(0o755)
+    return str(executable)
+
+def test_cold_start_next_to_a_running_playwright(tmp_path):
+    """Test that acquire() starts a server while the calling thread already runs Playwright"""
+    executable = fake_browser(tmp_path)
+    server = BrowserServer(str(tmp_path / "server.json"), executable=executable)
+
+    with sync_playwright():
+        endpoint = server.acquire()
+        assert endpoint.startswith("http://127.0.0.1:")
+        assert server.acquire() == endpoint
+        assert server.status()["uses"] == 2
+        assert _chromium_executable()
+    assert server.stop()
+    assert server.status() is None
+
+def test_tester_cold_start_stops_playwright_on_failure(tmp_path):
+    """Test that AIWebTester starts the server first and stops its driver when connecting fails"""
+    config = {
+        "browser_endpoint": "auto",
+        "browser_server_state": str(tmp_path / "server.json"),
+        "browser_server_executable": fake_browser(tmp_path)
+    }
+    # The fake browser answers /json/version with no CDP details, so connecting fails
+    with pytest.raises(Exception):
+        AIWebTester(headless=True, config=config)
+    server = BrowserServer.from_config(config)
+    assert server.status()["uses"] == 1
+    assert server.status()["leases"] == {}
+    assert server.stop()
+    # Nothing was left running on this thread
+    with sync_playwright():
+        pass
+
+def test_relative_state_path_is_anchored_at_the_project_root(tmp_path, monkeypatch):
+    """Test that runs started from any directory find the same server state"""
+    monkeypatch.chdir(tmp_path)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert BrowserServer.from_config({}).state_path == os.path.join(root, ".cache", "browser_server.json")
+    server = BrowserServer.from_config({"browser_server_state": ".cache/other.json"})
+    assert server.state_path == os.path.join(root, ".cache", "other.json")
+    server = BrowserServer.from_config({"browser_server_state": str(tmp_path / "server.json")})
+    assert server.state_path == str(tmp_path / "server.json")
+
+def test_recycling_waits_for_connected_clients(tmp_path):
+    """Test that a server past max_uses is only restarted once no other client holds a lease"""
+    state_path = str(tmp_path / "server.json")
+    executable = fake_browser(tmp_path)
+    first = BrowserServer(state_path, max_uses=1, executable=executable)
+    second = BrowserServer(state_path, max_uses=1, executable=executable)
+
+    endpoint = first.acquire()
+    assert second.acquire() == endpoint
+    status = second.status()
+    assert status["recycle"] == "1 uses" and len(status["leases"]) == 2
+
+    # Leases of clients that exited without releasing do not hold the server
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    state = json.loads(open(state_path).read())
+    state["leases"]["gone"] = dead.pid
+    with open(state_path, "w") as f:
+        json.dump(state, f)
+
+    first.release()
+    assert second.status()["pid"] == status["pid"]
+    second.release()
+    assert second.status() is None
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from src.crawler import CrawlEngine
+
+def make_engine(**config):
+    engine = CrawlEngine({"max_depth": 2, **config}, workers=2, headless=True)
+    engine._seed_hosts.add("example.com")
+    return engine
+
+def test_url_filtering():
+    """Test allowed_domains and exclude_paths filtering"""
+    engine = make_engine(allowed_domains=["example.com"], exclude_paths=["/admin"])
+    assert engine.is_allowed("https://example.com/docs")
+    assert engine.is_allowed("https://www.example.com/docs")
+    assert not engine.is_allowed("https://example.org/docs")
+    assert not engine.is_allowed("https://example.com/admin/users")
+    assert not engine.is_allowed("mailto:info@example.com")
+
+def test_frontier_tracks_depth_per_url():
+    """Test that the frontier dedupes URLs and honours max_depth"""
+    engine = make_engine()
+    frontier = asyncio.Queue()
+    engine._enqueue(frontier, "https://example.com/", 0)
+    engine._enqueue(frontier, "https://example.com/#top", 1)
+    engine._enqueue(frontier, "https://example.com/a", 1)
+    engine._enqueue(frontier, "https://example.com/b", 2)
+    assert engine.depths == {"https://example.com/": 0, "https://example.com/a": 1}
+    assert frontier.qsize() == 2
+
+def run_worker(engine, browser, urls):
+    """Drain a frontier of urls with one worker, returns the URLs it crawled"""
+    crawled = []
+
+    async def crawl_page(page, frontier, executor, url, depth):
+        crawled.append(url)
+
+    engine._crawl_page = crawl_page
+
+    async def run():
+        frontier = asyncio.Queue()
+        for url in urls:
+            frontier.put_nowait((url, 0))
+        worker = asyncio.create_task(engine._worker(browser, frontier, None, 0))
+        await asyncio.wait_for(frontier.join(), timeout=5)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(run())
+    return crawled
+
+def test_worker_survives_a_failed_recycle(make_async_browser):
+    """Test that a failing recycle is logged, replaced by a fresh page and the frontier still drains"""
+    engine = make_engine(recycle_every=1, memory_sample_every=0)
+    browser = make_async_browser(fail_close=1)
+    urls = ["https://example.com/a", "https://example.com/b"]
+    assert run_worker(engine, browser, urls) == urls
+    assert browser.contexts == 2
+
+def test_worker_drains_the_frontier_when_no_context_can_be_made(make_async_browser):
+    """Test that URLs fail, instead of the worker dying, when new_context itself raises"""
+    engine = make_engine()
+    urls = ["https://example.com/a", "https://example.com/b"]
+    assert run_worker(engine, make_async_browser(crashed=True), urls) == []
+    assert engine.failed_urls == set(urls)
+
+def test_crawl_fails_when_every_worker_stops():
+    """Test that the pool surfaces worker errors instead of waiting on the frontier forever"""
+    engine = make_engine()
+
+    async def broken_worker(browser, frontier, executor, worker_id):
+        raise RuntimeError("blocker could not attach")
+
+    engine._worker = broken_worker
+
+    async def run():
+        frontier = asyncio.Queue()
+        frontier.put_nowait(("https://example.com/", 0))
+        await asyncio.wait_for(engine._run_workers(None, frontier, None), timeout=5)
+
+    with pytest.raises(RuntimeError, match="All crawl workers stopped") as error:
+        asyncio.run(run())
+    assert "blocker could not attach" in str(error.value.__cause__)
+
+def test_worker_pool_returns_once_the_frontier_is_drained(make_async_browser):
+    """Test that the pool stops its workers after the last URL"""
+    engine = make_engine()
+    engine._crawl_page = lambda *args: asyncio.sleep(0)
+
+    async def run():
+        frontier = asyncio.Queue()
+        for url in ("https://example.com/a", "https://example.com/b", "https://example.com/c"):
+            frontier.put_nowait((url, 0))
+        await asyncio.wait_for(engine._run_workers(make_async_browser(), frontier, None), timeout=5)
+        return frontier
+
+    assert asyncio.run(run()).qsize() == 0
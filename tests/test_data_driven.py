@@ -0,0 +1,65 @@
+import json
+import pytest
+import src.data_driven as data_driven
+from src.data_driven import Checkpoint, iter_variables
+
+def test_iter_variables_streams_csv_and_jsonl(tmp_path):
+    """Test that CSV and JSONL sources yield one variable dict per row"""
+    csv_path = tmp_path / "leads.csv"
+    csv_path.write_text("FIRST_NAME,LAST_NAME\nAda,Lovelace\nAlan,Turing\n")
+    jsonl_path = tmp_path / "leads.jsonl"
+    jsonl_path.write_text('{"FIRST_NAME": "Ada"}\n\n{"FIRST_NAME": "Alan"}\n')
+
+    assert list(iter_variables(str(csv_path))) == [
+        {"FIRST_NAME": "Ada", "LAST_NAME": "Lovelace"},
+        {"FIRST_NAME": "Alan", "LAST_NAME": "Turing"},
+    ]
+    assert [row["FIRST_NAME"] for row in iter_variables(str(jsonl_path))] == ["Ada", "Alan"]
+
+def test_checkpoint_resumes_finished_rows(tmp_path):
+    """Test that a reopened checkpoint skips finished rows and survives a torn last line"""
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    checkpoint = Checkpoint(path)
+    checkpoint.mark(0, "success")
+    checkpoint.mark(1, "failure", "timeout")
+    checkpoint.close()
+    with open(path, "a") as f:
+        f.write('{"row": 2, "sta')
+
+    resumed = Checkpoint(path)
+    assert resumed.is_finished(0) and resumed.is_finished(1)
+    assert not resumed.is_finished(2)
+    resumed.close()
+
+    retry = Checkpoint(path, retry_failed=True)
+    assert retry.is_finished(0) and not retry.is_finished(1)
+    retry.close()
+
+def make_data_runner(tmp_path, runner, rows):
+    test_case = tmp_path / "case.json"
+    test_case.write_text(json.dumps({
+        "name": "Open",
+        "steps": [{"id": "open", "action": "navigate", "url": "https://example.com/${PAGE}"}]
+    }))
+    return data_driven.DataDrivenRunner(
+        runner, str(test_case), [{"PAGE": str(i)} for i in range(rows)], workers=2
+    )
+
+def test_parallel_rows_run_on_worker_threads(tmp_path, monkeypatch, fake_browser,
+                                             make_shared_browser, make_runner):
+    """Test that every row runs once across the worker pool"""
+    monkeypatch.setattr(data_driven, "SharedBrowser", make_shared_browser(fake_browser))
+    counts = make_data_runner(tmp_path, make_runner(), 5).run()
+    assert counts == {"success": 5, "failure": 0, "skipped": 0}
+    assert sorted(fake_browser.visits) == [f"https://example.com/{i}" for i in range(5)]
+    assert fake_browser.connections == 2
+
+def test_parallel_run_stops_when_no_worker_connects(tmp_path, monkeypatch, make_shared_browser, make_runner):
+    """Test that workers that cannot connect are reported instead of blocking the feeder"""
+    monkeypatch.setattr(
+        data_driven, "SharedBrowser", make_shared_browser(None, ConnectionError("browser is gone"))
+    )
+    runner = make_data_runner(tmp_path, make_runner(), 20)
+    with pytest.raises(RuntimeError, match="browser is gone"):
+        runner.run()
+    assert len(runner.worker_errors) == 2
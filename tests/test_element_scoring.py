@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import pytest
+from src.element_scoring import (
+    CachedScorer, ElementScorer, HeuristicScorer, HybridScorer, OnnxScorer, TransformerScorer,
+    create_scorer
+)
+from src.utils.classification_cache import ClassificationCache
+
+class FakeModelScorer(ElementScorer):
+    name = "fake"
+
+    def score_batch(self, elements):
+        self.counters["model_calls"] += len(elements)
+        return [True] * len(elements)
+
+@pytest.mark.parametrize("element,expected", [
+    ({"text": "Save", "tag": "button"}, True),
+    ({"text": "Save", "tag": "button", "disabled": True}, False),
+    ({"text": "", "tag": "input", "type": "hidden"}, False),
+    ({"text": "Home", "tag": "a", "href": "https://example.com/"}, True),
+    ({"text": "Menu", "tag": "div", "role": "button"}, True),
+    ({"text": "Click me", "tag": "p"}, False),
+    ({"text": "More", "tag": "a", "href": "javascript:void(0)"}, None),
+])
+def test_heuristic_decisions(element, expected):
+    """Test the rule-based fast path"""
+    assert HeuristicScorer().decide(element) is expected
+
+def test_hybrid_only_sends_ambiguous_elements_to_model():
+    """Test that the model only sees elements the rules cannot decide"""
+    model = FakeModelScorer()
+    scorer = HybridScorer(HeuristicScorer(), model)
+    decisions = scorer.score_batch([
+        {"text": "Save", "tag": "button"},
+        {"text": "More", "tag": "a", "href": "#"},
+        {"text": "Intro", "tag": "p"},
+    ])
+    assert decisions == [True, True, False]
+    assert model.counters["model_calls"] == 1
+    assert scorer.stats()["model_calls_avoided"] == 2
+
+def test_create_scorer_rejects_unknown_backend():
+    """Test backend selection from config"""
+    assert create_scorer({"scorer_backend": "heuristic"}).name == "heuristic"
+    with pytest.raises(ValueError):
+        create_scorer({"scorer_backend": "gpt"})
+
+def test_relative_onnx_model_dir_is_anchored_at_the_project_root(tmp_path, monkeypatch):
+    """Test that the ONNX model directory does not depend on the working directory"""
+    monkeypatch.chdir(tmp_path)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = {"scorer_backend": "transformer", "inference_backend": "onnx", "classification_cache": ""}
+    assert create_scorer(config).model_dir == os.path.join(root, "models", "element-classifier-onnx")
+    config["onnx_model_dir"] = "models/other"
+    assert create_scorer(config).model_dir == os.path.join(root, "models", "other")
+    config["onnx_model_dir"] = str(tmp_path)
+    assert create_scorer(config).model_dir == str(tmp_path)
+
+def test_cached_scorer_persists_decisions(tmp_path):
+    """Test that a second run answers repeated elements from the on-disk cache"""
+    db_path = str(tmp_path / "classifications.db")
+    elements = [{"text": " Sign  In ", "tag": "a"}, {"text": "sign in", "tag": "a"}]
+
+    first = CachedScorer(FakeModelScorer(), ClassificationCache(db_path))
+    assert first.score_batch(elements) == [True, True]
+    assert first.stats()["model_calls"] == 1
+
+    second = CachedScorer(FakeModelScorer(), ClassificationCache(db_path))
+    assert second.score_batch(elements) == [True, True]
+    assert second.stats()["model_calls"] == 0
+    assert second.stats()["cache_hits"] == 2
+
+def test_classification_cache_opens_on_first_model_call(tmp_path):
+    """Test that the cache file is only created once the model is asked"""
+    db_path = tmp_path / "classifications.db"
+    scorer = create_scorer({"classification_cache": str(db_path)})
+    assert scorer.score_batch([{"text": "Save", "tag": "button"}]) == [True]
+    assert scorer.stats()["cache_misses"] == 0
+    assert not db_path.exists()
+
+    model = HybridScorer(HeuristicScorer(), CachedScorer(
+        FakeModelScorer(), lambda: ClassificationCache(str(db_path))
+    ))
+    model.score_batch([{"text": "Save", "tag": "button"}])
+    assert not db_path.exists()
+    model.score_batch([{"text": "More", "tag": "a", "href": "#"}])
+    assert db_path.exists()
+    assert model.stats()["cache_misses"] == 1
+
+def write_tiny_onnx_model(model_dir):
+    """A bag-of-words classifier: logits are the summed 2-value embeddings of the unmasked tokens"""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("tokenizers")
+    from onnx import TensorProto, helper
+    from tokenizers import Tokenizer, models, pre_tokenizers
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "sure": 2, "yes": 3, "no": 4}
+    # NEGATIVE, POSITIVE logits per token
+    embeddings = [[0, 0]] * 2 + [[0, math.log(4)], [0, math.log(1.5)], [math.log(4), 0]]
+
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.save(str(model_dir / "tokenizer.json"))
+    (model_dir / "config.json").write_text(json.dumps({"id2label": {"0": "NEGATIVE", "1": "POSITIVE"}}))
+
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["embeddings", "input_ids"], ["token_logits"]),
+            helper.make_node("Cast", ["attention_mask"], ["mask"], to=TensorProto.FLOAT),
+            helper.make_node("Unsqueeze", ["mask", "last_axis"], ["mask_3d"]),
+            helper.make_node("Mul", ["token_logits", "mask_3d"], ["masked"]),
+            helper.make_node("ReduceSum", ["masked", "token_axis"], ["logits"], keepdims=0),
+        ],
+        "tiny-classifier",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "tokens"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "tokens"]),
+        ],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 2])],
+        initializer=[
+            helper.make_tensor("embeddings", TensorProto.FLOAT, [len(vocab), 2], sum(embeddings, [])),
+            helper.make_tensor("last_axis", TensorProto.INT64, [1], [2]),
+            helper.make_tensor("token_axis", TensorProto.INT64, [1], [1]),
+        ]
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(model_dir / "model_quantized.onnx"))
+
+def test_onnx_scorer_matches_transformer_decisions(tmp_path):
+    """Test that the ONNX backend maps labels, scores and thresholds like the torch pipeline"""
+    pytest.importorskip("onnxruntime")
+    write_tiny_onnx_model(tmp_path)
+    elements = [
+        {"text": "sure", "tag": "button"},  # POSITIVE 0.8, above the 0.7 button threshold
+        {"text": "yes", "tag": "button"},   # POSITIVE 0.6, below it
+        {"text": "yes", "tag": "div"},      # POSITIVE 0.6, above the 0.5 default
+        {"text": "no", "tag": "div"},       # NEGATIVE 0.8
+        {"text": "sure no", "tag": "a"},    # tie, POSITIVE 0.5 at best
+    ]
+    onnx_scorer = OnnxScorer(str(tmp_path), batch_size=2)
+    decisions = onnx_scorer.score_batch(elements)
+
+    # The same probabilities as pipeline output ({"label", "score"} of the top class)
+    pipeline_results = {
+        "sure": {"label": "POSITIVE", "score": 0.8},
+        "yes": {"label": "POSITIVE", "score": 0.6},
+        "no": {"label": "NEGATIVE", "score": 0.8},
+        "sure no": {"label": "NEGATIVE", "score": 0.5},
+    }
+    transformer = TransformerScorer()
+    transformer._nlp = lambda contexts, **options: [
+        pipeline_results[context.split("'")[1]] for context in contexts
+    ]
+    assert decisions == transformer.score_batch(elements) == [True, False, True, False, False]
+    assert onnx_scorer.stats()["model_calls"] == len(elements)
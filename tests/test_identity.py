@@ -0,0 +1,36 @@
+import numpy as np
+from src.utils.identity import PHONE_SPACE, BloomFilter, IdentityRegistry, phone_parts
+
+def test_phone_mapping_is_a_bijection():
+    """Test that distinct sequence numbers never share a phone number"""
+    sequences = np.unique(np.concatenate([np.arange(100000), np.arange(0, PHONE_SPACE, 99991)]))
+    area, prefix, line = phone_parts(sequences)
+    phones = area * 10 ** 7 + prefix * 10 ** 4 + line
+    assert len(np.unique(phones)) == len(sequences)
+    assert area.min() >= 200 and area.max() <= 999 and line.min() >= 1000
+
+def test_identities_unique_across_workers_and_runs(tmp_path):
+    """Test that workers and later runs never issue a sequence twice"""
+    state_dir = str(tmp_path)
+    first = [IdentityRegistry(state_dir, worker_id, partitions=4, capacity=10000) for worker_id in range(2)]
+    issued = np.concatenate([registry.allocate(1500) for registry in first])
+    for registry in first:
+        registry.save()
+
+    resumed = IdentityRegistry(state_dir, 0, partitions=4, capacity=10000)
+    issued = np.concatenate([issued, resumed.allocate(500)])
+    assert len(np.unique(issued)) == len(issued)
+
+    # A lost counter file falls back to the persisted filter
+    (tmp_path / "worker-1.seq").unlink()
+    restarted = IdentityRegistry(state_dir, 1, partitions=4, capacity=10000)
+    assert not np.isin(restarted.allocate(100), issued).any()
+
+def test_bloom_filter_round_trip(tmp_path):
+    """Test that saved filters keep their keys"""
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    bloom.add(np.arange(500))
+    bloom.save(str(tmp_path / "filter.bloom"))
+    loaded = BloomFilter.load(str(tmp_path / "filter.bloom"))
+    assert loaded.contains(np.arange(500)).all()
+    assert loaded.contains(np.arange(10000, 11000)).mean() < 0.05
@@ -0,0 +1,79 @@
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+import random
+import sqlite3
+from src.utils.lead_data_generator import LeadDataGenerator, load_location_table
+
+def make_db(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE locations (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "city TEXT NOT NULL, state TEXT NOT NULL, zip_code TEXT NOT NULL)"
+        )
+        conn.executemany(
+            "INSERT INTO locations (city, state, zip_code) VALUES (?, ?, ?)",
+            [("Austin", "TX", "73301"), ("Houston", "TX", "77001"), ("Boston", "MA", "02201")]
+        )
+
+def test_location_table_is_loaded_once(tmp_path):
+    """Test that generators share the in-memory table of the same database"""
+    db_path = str(tmp_path / "locations.db")
+    make_db(db_path)
+    table = load_location_table(db_path)
+    assert len(table) == 3
+    assert LeadDataGenerator(db_path).locations is table
+    assert LeadDataGenerator(db_path).generate_lead_data()["ZIP"] in table.zip_codes
+
+def test_state_weights_limit_and_bias_states(tmp_path):
+    """Test that only weighted states are picked, in proportion to their weights"""
+    db_path = str(tmp_path / "locations.db")
+    make_db(db_path)
+    table = load_location_table(db_path)
+    rng = random.Random(1)
+    states = [table.row(table.random_index(rng, {"TX": 1, "MA": 3}))[1] for _ in range(4000)]
+    assert 0.7 < states.count("MA") / len(states) < 0.8
+    assert {table.row(table.random_index(rng, {"TX": 1}))[1] for _ in range(100)} == {"TX"}
+
+def test_generate_batch_is_reproducible_and_exports(tmp_path):
+    """Test that a seeded batch repeats exactly and round-trips through CSV and JSONL"""
+    db_path = str(tmp_path / "locations.db")
+    make_db(db_path)
+    generator = LeadDataGenerator(db_path)
+    batch = generator.generate_batch(100, seed=7)
+    rows = list(batch)
+    assert len(batch) == 100 and batch.seed == 7
+    assert rows == list(generator.generate_batch(100, seed=7))
+    assert rows != list(generator.generate_batch(100, seed=8))
+    assert rows[0]["STREET"].split(" ", 1)[0].isdigit()
+
+    batch.to_csv(str(tmp_path / "leads.csv"))
+    batch.to_jsonl(str(tmp_path / "leads.jsonl"))
+    with open(tmp_path / "leads.csv", newline="") as f:
+        assert list(csv.DictReader(f)) == rows
+    with open(tmp_path / "leads.jsonl") as f:
+        assert [json.loads(line) for line in f] == rows
+
+def test_bulk_import_numbers_rows_and_migrates(tmp_path):
+    """Test that the importer loads a CSV, numbers rows per state and upgrades old databases"""
+    csv_path = tmp_path / "zips.csv"
+    csv_path.write_text("zip,primary_city,state_id\n2108,Boston,ma\n75201,Dallas,TX\n")
+    db_path = tmp_path / "locations.db"
+    make_db(str(db_path))
+    subprocess.run(
+        [sys.executable, "scripts/setup_location_db.py", "--csv", str(csv_path), "--db", str(db_path)],
+        cwd=Path(__file__).parent.parent, capture_output=True, check=True
+    )
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT city, state, zip_code, row_num, state_row_num FROM locations ORDER BY row_num"
+        ).fetchall()
+        buckets = dict(conn.execute("SELECT state, count FROM state_buckets"))
+    # Existing rows are kept and ZIP codes zero-padded
+    assert [row[:3] for row in rows[3:]] == [("Boston", "MA", "02108"), ("Dallas", "TX", "75201")]
+    assert [row[3:] for row in rows] == [(0, 0), (1, 1), (2, 0), (3, 1), (4, 2)]
+    assert buckets == {"TX": 3, "MA": 2}
+    assert len(load_location_table(str(db_path))) == 5
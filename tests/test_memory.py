@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+from src.utils.memory import MemoryMonitor, RecyclePolicy, process_rss_mb, process_tree_rss_mb
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def send(self, method):
+        self.calls.append(method)
+        return {"metrics": [
+            {"name": "JSHeapUsedSize", "value": 600 * 1024 * 1024},
+            {"name": "Nodes", "value": 1500},
+            {"name": "Timestamp", "value": 1.0},
+        ]}
+
+class FakeContext:
+    def __init__(self):
+        self.sessions = []
+
+    def new_cdp_session(self, page):
+        self.sessions.append(FakeSession())
+        return self.sessions[-1]
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+def test_process_tree_memory_includes_children():
+    """Test that a process tree's memory covers its child processes"""
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        own = process_rss_mb(os.getpid())
+        assert own > 0
+        assert process_tree_rss_mb(os.getpid()) > own
+    finally:
+        child.kill()
+        child.wait()
+    assert process_rss_mb(child.pid) is None
+
+def test_browser_metrics_drive_recycling(tmp_path):
+    """Test CDP metric sampling, peaks and the recycle thresholds"""
+    monitor = MemoryMonitor(max_samples=2)
+    page = FakePage()
+    for _ in range(3):
+        sample = monitor.sample(page, "crawl")
+    # One CDP session per page, enabled once
+    assert len(page.context.sessions) == 1
+    assert page.context.sessions[0].calls.count("Performance.enable") == 1
+    assert sample["js_heap_used_mb"] == 600.0 and sample["dom_nodes"] == 1500
+    assert sample["python_rss_mb"] > 0
+
+    summary = monitor.summary()
+    assert summary["samples"] == 3 and summary["peak_dom_nodes"] == 1500
+    path = os.path.join(tmp_path, "memory.json")
+    monitor.export_json(path)
+    with open(path) as f:
+        assert len(json.load(f)["samples"]) == 2
+
+    policy = RecyclePolicy(every=100, memory_mb=512, sample_every=10)
+    assert policy.wants_sample(20) and not policy.wants_sample(21)
+    assert policy.due(5, sample)
+    assert policy.due(100)
+    assert not policy.due(99, {"js_heap_used_mb": 100.0})
@@ -0,0 +1,96 @@
+import os
+import pytest
+from src.utils.network import HarRouter, ResourceBlocker
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+        self.method = "GET"
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+
+    def abort(self, error_code):
+        self.outcome = "abort"
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+    def continue_(self):
+        self.outcome = "continue"
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append(handler)
+
+    def route_from_har(self, path, **options):
+        self.routes.append(("har", path, options))
+
+def test_profile_rules_and_counters():
+    """Test resource type, URL and allow rules, and the shared counters"""
+    blocker = ResourceBlocker(
+        {"tests": {"resource_types": ["image"], "url_patterns": ["*tracker.io/*"],
+                   "allow_patterns": ["*/captcha/*"]}},
+        profile="tests",
+        byte_estimates={"image": 1000}
+    )
+    worker = blocker.for_worker()
+    routes = [
+        FakeRoute("image", "https://example.com/logo.png"),
+        FakeRoute("image", "https://example.com/captcha/1.png"),
+        FakeRoute("script", "https://cdn.tracker.io/t.js"),
+        FakeRoute("document", "https://example.com/"),
+    ]
+    blocker._handle(routes[0])
+    blocker._handle(routes[1])
+    worker._handle(routes[2])
+    worker._handle(routes[3])
+
+    assert [route.outcome for route in routes] == ["abort", "fallback", "abort", "fallback"]
+    stats = blocker.stats()
+    assert stats["blocked"] == 2 and stats["allowed"] == 2
+    assert stats["bytes_saved_estimate"] == 1000 + 30_000
+    assert stats["blocked_image"] == 1 and stats["blocked_script"] == 1
+
+def test_contexts_are_routed_only_while_blocking():
+    """Test that switching profiles attaches the route once, and only when needed"""
+    blocker = ResourceBlocker()
+    context = FakeContext()
+    blocker.attach(context)
+    assert context.routes == []
+
+    blocker.use_profile("lean")
+    blocker.attach(context)
+    blocker.attach(context)
+    assert len(context.routes) == 1
+
+    with pytest.raises(ValueError):
+        blocker.use_profile("missing")
+
+def test_har_replay_counts_misses(tmp_path):
+    """Test that replay routes misses through a counting fallback behind the recording"""
+    router = HarRouter("replay", str(tmp_path), not_found="live")
+    context = FakeContext()
+    with pytest.raises(FileNotFoundError):
+        router.attach(context, "Create Lead")
+
+    path = router.path_for("Create Lead")
+    assert os.path.basename(path) == "Create_Lead.har.zip"
+    open(path, "wb").close()
+    router.attach(context, "Create Lead")
+    miss_handler, har = context.routes
+    assert har == ("har", path, {"not_found": "fallback"})
+
+    route = FakeRoute("xhr", "https://example.com/api/unrecorded")
+    miss_handler(route)
+    assert route.outcome == "continue"
+    assert router.stats()["misses"] == 1
+
+    with pytest.raises(ValueError):
+        HarRouter("offline")
@@ -0,0 +1,80 @@
+import dataclasses
+import json
+import pytest
+import src.plan as plan_module
+from src.plan import Template, TypeStep, compile_test_case, load_plan
+
+TEST_CASES = [
+    "config/test_cases/create_lead.json",
+    "config/test_cases/create_lead_with_address_data.json",
+    "config/test_cases/login.json",
+    "config/test_cases/youtube_search.json",
+]
+
+@pytest.mark.parametrize("path", TEST_CASES)
+def test_bundled_test_cases_compile(path):
+    """Test that every shipped test case passes validation"""
+    plan = load_plan(path)
+    assert plan.steps
+
+def test_template_rendering():
+    """Test placeholder substitution, leaving unknown variables untouched"""
+    template = Template("${FIRST_NAME} ${LAST_NAME} <${EMAIL}>")
+    assert template.variables == ("FIRST_NAME", "LAST_NAME", "EMAIL")
+    assert template.render({"FIRST_NAME": "Ada", "LAST_NAME": "Lovelace"}) == "Ada Lovelace <${EMAIL}>"
+
+def test_plan_is_reusable_and_immutable():
+    """Test that rendering does not alter the compiled plan"""
+    plan = compile_test_case({
+        "name": "Type",
+        "steps": [{"id": "enter", "action": "type", "selector": "#name", "value": "${NAME}"}]
+    }, {"input_strategy": "fill"})
+    step = plan.steps[0]
+    assert isinstance(step, TypeStep) and step.input == "fill"
+    assert step.value.render({"NAME": "first"}) == "first"
+    assert step.value.render({"NAME": "second"}) == "second"
+    assert plan.variables == ("NAME",)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        step.input = "type"
+
+def test_validation_reports_every_error():
+    """Test that schema errors are collected with their step"""
+    with pytest.raises(plan_module.TestCaseValidationError) as error:
+        compile_test_case({
+            "name": "Broken",
+            "steps": [
+                {"id": "go", "action": "navigate"},
+                {"id": "hover", "action": "hover", "selector": "#x"},
+                {"id": "pause", "action": "wait", "time": "5s"},
+                {"id": "settle", "action": "wait", "wait_for": "dom_setle"},
+                {"id": "appear", "action": "wait", "wait_for": {"state": "visible"}},
+            ]
+        })
+    assert len(error.value.errors) == 5
+
+def test_plan_cache_follows_file_content(tmp_path):
+    """Test that plans are cached by content hash and recompiled on change"""
+    path = tmp_path / "case.json"
+    path.write_text(json.dumps({"name": "One", "steps": [{"id": "w", "action": "wait"}]}))
+    first = load_plan(str(path))
+    assert load_plan(str(path)) is first
+
+    path.write_text(json.dumps({"name": "Two", "steps": [{"id": "w", "action": "wait"}]}))
+    assert load_plan(str(path)).name == "Two"
+
+def test_plan_cache_is_bounded(tmp_path, monkeypatch):
+    """Test that the plan cache evicts the least recently used plan"""
+    monkeypatch.setattr(plan_module, "_PLAN_CACHE", plan_module.OrderedDict())
+    monkeypatch.setattr(plan_module, "_PLAN_CACHE_SIZE", 2)
+    paths = []
+    for name in ("One", "Two", "Three"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"name": name, "steps": [{"id": "w", "action": "wait"}]}))
+        paths.append(str(path))
+
+    first = load_plan(paths[0])
+    load_plan(paths[1])
+    assert load_plan(paths[0]) is first
+    load_plan(paths[2])
+    assert len(plan_module._PLAN_CACHE) == 2
+    assert load_plan(paths[0]) is first
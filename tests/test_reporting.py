@@ -0,0 +1,137 @@
+import json
+import os
+from xml.etree import ElementTree
+import sys
+import pytest
+import src.utils.reporting as reporting
+import src.utils.screenshots as screenshots
+from scripts.merge_reports import merge_reports
+
+def test_results_stream_to_log_and_paginate(tmp_path):
+    """Test that results are logged as they are added and rendered into pages"""
+    report = reporting.TestReport(str(tmp_path), page_size=2)
+    for i in range(5):
+        report.add_result(f"step <{i}>", "success" if i else "failure", "done")
+
+    assert (tmp_path / "results.jsonl").read_text().count("\n") == 5
+    assert report.counts == {"failure": 1, "success": 4}
+    report.generate_report()
+    assert sorted(p.name for p in tmp_path.glob("report*.html")) == [
+        "report-2.html", "report-3.html", "report.html"
+    ]
+    assert "step &lt;0&gt;" in (tmp_path / "report.html").read_text()
+    assert "step &lt;4&gt;" in (tmp_path / "report-3.html").read_text()
+
+def test_merge_shards_and_resume(tmp_path):
+    """Test that shards are appended in order and an existing log can be continued"""
+    report = reporting.TestReport(str(tmp_path))
+    shards = [reporting.TestReport(str(tmp_path), name=f"shard-{i}") for i in range(2)]
+    shards[1].add_result("b", "failure")
+    shards[0].add_result("a", "success")
+    shards[0].add_metrics("Crawl", {"pages": 2})
+    shards[1].add_metrics("Crawl", {"pages": 3})
+    report.merge(shards)
+    for shard in shards:
+        shard.discard()
+
+    assert [r["step"] for r in report.iter_results()] == ["a", "b"]
+    assert report.metrics == {"Crawl": {"pages": 5}}
+    assert not list(tmp_path.glob("shard-*.jsonl"))
+
+    report.close()
+    resumed = reporting.TestReport(str(tmp_path), append=True)
+    resumed.add_result("c", "success")
+    assert resumed.counts == {"success": 2, "failure": 1}
+    assert [r["step"] for r in resumed.results] == ["a", "b", "c"]
+
+def test_cases_export_to_junit_and_summary(tmp_path):
+    """Test that interleaved cases keep their own steps in the JUnit and JSON exports"""
+    report = reporting.TestReport(str(tmp_path), suite="smoke")
+    login = report.start_case("login")
+    lead = report.start_case("create lead")
+    report.add_result("open", "success", case_id=login, duration=0.5)
+    report.add_result("save", "failure", "timeout", case_id=lead, duration=1.0)
+    report.end_case(lead, "failure", "Save <button> not found")
+    report.end_case(login, "success")
+    report.generate_report()
+
+    suite = ElementTree.parse(tmp_path / "junit.xml").getroot()[0]
+    assert (suite.get("name"), suite.get("tests"), suite.get("failures")) == ("smoke", "2", "1")
+    cases = {case.get("name"): case for case in suite.iter("testcase")}
+    assert cases["create lead"].find("failure").get("message") == "Save <button> not found"
+    assert "[success] open" in cases["login"].find("system-out").text
+
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert summary["cases"] == {"failure": 1, "success": 1}
+    assert [(c["name"], len(c["steps"])) for c in summary["test_cases"]] == [("create lead", 1), ("login", 1)]
+
+def test_for_run_uses_separate_directories(tmp_path):
+    """Test that each run writes into a directory of its own"""
+    first = reporting.TestReport.for_run(str(tmp_path))
+    second = reporting.TestReport.for_run(str(tmp_path))
+    assert first.output_dir != second.output_dir
+    assert os.path.realpath(tmp_path / "latest") == os.path.realpath(second.output_dir)
+
+class FakePage:
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.calls = []
+
+    def screenshot(self, **options):
+        self.calls.append(options)
+        return self.frames.pop(0)
+
+def test_screenshots_are_written_in_background_and_deduped(tmp_path):
+    """Test unique, content-addressed screenshot files and their links in the report"""
+    report = reporting.TestReport(str(tmp_path), screenshots={"quality": 50})
+    page = FakePage(b"frame-a", b"frame-a", b"frame-b")
+    paths = [report.save_screenshot(page, "step 1") for _ in range(3)]
+    assert page.calls[0] == {"type": "jpeg", "quality": 50, "full_page": False}
+    assert paths[0] == paths[1] != paths[2]
+    assert paths[0].startswith("screenshots/") and paths[0].endswith(".jpg")
+    assert report.save_screenshot(FakePage(b"frame-a"), "step 2") == paths[0]
+
+    report.add_result("step 1", "success", screenshot=paths[0])
+    report.generate_report()
+    assert (tmp_path / paths[0]).read_bytes() == b"frame-a"
+    assert len(list((tmp_path / "screenshots").glob("*.jpg"))) == 2
+    assert report.metrics["Screenshots"]["duplicates"] == 2
+    assert f'href="{paths[0]}"' in (tmp_path / "report.html").read_text()
+    report.close()
+
+def test_webp_falls_back_to_jpeg_without_pillow(tmp_path, monkeypatch):
+    """Test that WebP turns into JPEG without thumbnails when Pillow cannot be imported"""
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    writer = screenshots.ScreenshotWriter(str(tmp_path), image_format="webp")
+    page = FakePage(b"frame-a")
+    filename = writer.capture(page, "step 1")
+    writer.flush()
+    writer.close()
+    assert page.calls[0] == {"type": "jpeg", "quality": 70, "full_page": False}
+    assert filename.endswith(".jpg")
+    assert (tmp_path / filename).read_bytes() == b"frame-a"
+    assert list((tmp_path / "thumbs").iterdir()) == []
+    assert writer.stats()["errors"] == 0
+
+def test_merge_reports_script_copies_screenshots_and_checks_paths(tmp_path):
+    """Test that merged reports keep working screenshot links and bad paths are rejected"""
+    shard_dirs = []
+    for frame in (b"frame-a", b"frame-b"):
+        shard = reporting.TestReport(str(tmp_path / f"shard-{len(shard_dirs)}"))
+        shard.add_result("step", "success", screenshot=shard.save_screenshot(FakePage(frame), "step"))
+        shard.generate_report()
+        shard.close()
+        shard_dirs.append(shard.output_dir)
+
+    output = tmp_path / "merged"
+    merged = merge_reports(shard_dirs, str(output))
+    merged.close()
+    screenshots = [r["screenshot"] for r in merged.iter_results()]
+    assert [(output / path).read_bytes() for path in screenshots] == [b"frame-a", b"frame-b"]
+
+    with pytest.raises(ValueError, match="must not be one of the shards"):
+        merge_reports(shard_dirs, shard_dirs[0])
+    with pytest.raises(ValueError, match="Not a report directory"):
+        merge_reports([str(tmp_path / "shard-typo")], str(output))
+    assert not (tmp_path / "shard-typo").exists()
+    assert sum(1 for _ in reporting.TestReport(shard_dirs[0], append=True).iter_results()) == 1
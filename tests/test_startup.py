@@ -0,0 +1,17 @@
+import subprocess
+import sys
+from pathlib import Path
+
+def test_replay_startup_skips_model_imports():
+    """Test that importing the runner does not pull in transformers or torch"""
+    code = (
+        "import sys\n"
+        "from src.test_runner import TestRunner\n"
+        "from src.ai_tester import AIWebTester\n"
+        "print(','.join(m for m in ('transformers', 'torch') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import pytest
+from playwright.sync_api import sync_playwright
+import src.test_runner as test_runner
+from src.utils.shared_browser import SharedBrowser
+
+def test_run_suite_spreads_test_cases_over_workers(tmp_path, monkeypatch, fake_browser,
+                                                   make_shared_browser, make_runner):
+    """Test that a suite runs every test case through the worker pool and merges the shards"""
+    monkeypatch.setattr(test_runner, "SharedBrowser", make_shared_browser(fake_browser))
+    cases = []
+    for i in range(3):
+        path = tmp_path / f"case_{i}.json"
+        path.write_text(json.dumps({
+            "name": f"Case {i}",
+            "steps": [{"id": "open", "action": "navigate", "url": f"https://example.com/{i}"}]
+        }))
+        cases.append(str(path))
+    runner = make_runner()
+
+    outcomes = runner.run_suite(cases, workers=2)
+
+    assert [outcome["status"] for outcome in outcomes] == ["success"] * 3
+    assert fake_browser.connections == 2
+    assert sorted(fake_browser.visits) == [f"https://example.com/{i}" for i in range(3)]
+    cases = [r["case"] for r in runner.report.iter_results() if r["type"] == "case"]
+    assert cases == ["Case 0", "Case 1", "Case 2"]
+
+def test_run_suite_passes_logins_on_to_later_test_cases(tmp_path, monkeypatch, fake_browser,
+                                                        make_shared_browser, make_runner):
+    """Test that a login done by a suite worker is used by the test cases after it"""
+    monkeypatch.setattr(test_runner, "SharedBrowser", make_shared_browser(fake_browser))
+    login = tmp_path / "login.json"
+    login.write_text(json.dumps({
+        "name": "Login", "base_url": "https://example.com", "auth": {"user_variable": "USERNAME"},
+        "steps": [{"id": "open", "action": "navigate", "url": "https://example.com/login"}]
+    }))
+    follow_up = tmp_path / "follow_up.json"
+    follow_up.write_text(json.dumps({
+        "name": "Follow up",
+        "steps": [{"id": "open", "action": "navigate", "url": "https://example.com/account"}]
+    }))
+    runner = make_runner()
+
+    outcomes = runner.run_suite([str(login), str(follow_up)], workers=1)
+
+    assert [outcome["status"] for outcome in outcomes] == ["success", "success"]
+    assert runner.storage_state and os.path.exists(runner.storage_state)
+    assert fake_browser.storage_states == [None, runner.storage_state]
+
+def test_shared_browser_starts_next_to_a_running_playwright():
+    """Test that the shared browser launches while the calling thread already runs Playwright"""
+    with sync_playwright() as playwright:
+        if not os.path.exists(playwright.chromium.executable_path):
+            # The launch thread still gets as far as looking for the browser
+            with pytest.raises(Exception, match="BrowserType.launch"):
+                SharedBrowser(headless=True).start()
+            return
+        with SharedBrowser(headless=True) as shared:
+            assert shared.endpoint.startswith("http://127.0.0.1:")
+            connected = []
+            def worker():
+                connection = shared.connect()
+                connected.append(connection[1].is_connected())
+                SharedBrowser.disconnect(*connection)
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert connected == [True]
@@ -0,0 +1,45 @@
+import json
+import os
+import threading
+from src.utils.timing import Tracer
+
+def test_span_totals_and_counters():
+    """Test that span totals and counters keep adding up once the event buffer is full"""
+    tracer = Tracer(max_events=3)
+    for _ in range(2):
+        with tracer.span("step_1", "step", action="click"):
+            with tracer.span("click", selector="#submit"):
+                pass
+    tracer.count("retries")
+    tracer.count("retries", 2)
+
+    summary = tracer.summary()
+    assert summary["counters"] == {"retries": 3}
+    spans = {span["name"]: span for span in summary["spans"]}
+    assert spans["step:step_1"]["count"] == 2
+    assert spans["phase:click"]["count"] == 2
+    assert summary["slowest_selectors"][0]["name"] == "#submit"
+    # Totals keep counting after the event buffer is full
+    assert len(tracer.events) == 3
+    assert summary["dropped_events"] == 1
+
+def test_chrome_trace_export(tmp_path):
+    """Test that the Chrome trace holds span, counter and thread name events"""
+    tracer = Tracer()
+    worker = threading.Thread(target=lambda: tracer.record("goto", "phase", 0, 0), name="worker-1")
+    worker.start()
+    worker.join()
+    with tracer.span("step_1", "step"):
+        pass
+    tracer.count("optional_skips")
+
+    path = os.path.join(tmp_path, "trace.json")
+    tracer.export_chrome_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+
+    phases = [event["ph"] for event in trace["traceEvents"]]
+    assert phases.count("X") == 2
+    assert phases.count("C") == 1
+    names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert "worker-1" in names